@@ -0,0 +1,174 @@
+import json
+import math
+from dijkstra import shortest_path_tree, build_path
+import airspace_npz
+
+
+class AirspaceGraph:
+    """
+    tool_airspace_design.py가 저장한 JSON(routes, vertiports)을 하나의 공역 그래프로 컴파일.
+    - 노드: 정수 id, 좌표 (x, y, z). 여러 경로에 같은 교차점이 float 문자열 키로 중복 저장되므로
+      수평 거리 tolerance 이내 + 고도 차 1.0 미만이면 같은 노드로 병합
+    - 링크: 경로 링크는 양방향
+    - 버티포트: 근처 경로 노드와 출발/도착 링크로만 연결 (다른 버티포트를 경유하지 않음)
+    - 버티포트 간 경로(waypoint 리스트)는 precompute_paths()로 미리 계산
+    """
+
+    def __init__(self, tolerance=1.0):
+        self.tolerance = tolerance
+        self.nodes = {}        # id -> [x, y, z]
+        self.node_names = {}   # id -> node_name
+        self.links = {}        # id -> [인접 id]
+        self.vertiports = {}   # name -> {"id", "x", "y", "z", "radius_outer", "radius_inner", "type"}
+        self.access = {}       # vertiport name -> [출발/도착 링크가 연결된 경로 노드 id]
+        self.paths = {}        # (출발 vertiport, 도착 vertiport) -> [(x, y, z), ...]
+        self._grid = {}        # (ix, iy) -> [id]  (병합용 격자, 셀 크기 = tolerance)
+
+    # ------------------------------------------------------------------
+    # 구성
+    # ------------------------------------------------------------------
+    def _cell(self, x, y):
+        return (math.floor(x / self.tolerance), math.floor(y / self.tolerance))
+
+    def add_node(self, x, y, z, name=None):
+        """(x, y, z) 노드 id 반환. tolerance 이내의 기존 노드가 있으면 그 id"""
+        cx, cy = self._cell(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for node_id in self._grid.get((cx + dx, cy + dy), ()):
+                    nx, ny, nz = self.nodes[node_id]
+                    if math.hypot(nx - x, ny - y) <= self.tolerance and abs(nz - z) < 1.0:
+                        return node_id
+        node_id = len(self.nodes)
+        self.nodes[node_id] = [x, y, z]
+        self.node_names[node_id] = name
+        self.links[node_id] = []
+        self._grid.setdefault((cx, cy), []).append(node_id)
+        return node_id
+
+    def add_link(self, a, b):
+        if a == b:
+            return
+        if b not in self.links[a]:
+            self.links[a].append(b)
+        if a not in self.links[b]:
+            self.links[b].append(a)
+
+    def add_route(self, route):
+        """designer JSON의 route 하나 ({"nodes": {"x,y": {"z", "node_name"}}, "links": [[[x1,y1],[x2,y2]], ...]})"""
+        ids = {}
+        for key, info in route["nodes"].items():
+            x_str, y_str = key.split(",")
+            x, y = float(x_str), float(y_str)
+            ids[(x, y)] = self.add_node(x, y, float(info["z"]), info.get("node_name"))
+        for p1, p2 in route["links"]:
+            a = ids.get((float(p1[0]), float(p1[1])))
+            b = ids.get((float(p2[0]), float(p2[1])))
+            if a is None or b is None:
+                continue  # nodes에 없는 링크 끝점은 무시
+            self.add_link(a, b)
+
+    def add_vertiport(self, vp, connect_radius=None):
+        """
+        vp: designer JSON의 vertiport dict.
+        connect_radius(기본: radius_outer의 2배) 이내의 경로 노드와 연결하고, 없으면 가장 가까운 노드와 연결.
+        """
+        name = vp["name"]
+        if connect_radius is None:
+            connect_radius = 2 * vp.get("radius_outer", 0)
+        x, y, z = float(vp["x"]), float(vp["y"]), float(vp.get("z", 0))
+        # 버티포트 노드는 병합 대상이 아니므로 격자에 넣지 않음
+        node_id = len(self.nodes)
+        self.nodes[node_id] = [x, y, z]
+        self.node_names[node_id] = name
+        self.vertiports[name] = dict(vp, id=node_id)
+
+        route_ids = list(self.links)
+        near = [n for n in route_ids
+                if math.hypot(self.nodes[n][0] - x, self.nodes[n][1] - y) <= connect_radius]
+        if not near and route_ids:
+            near = [min(route_ids, key=lambda n: math.hypot(self.nodes[n][0] - x, self.nodes[n][1] - y))]
+        # 버티포트 링크는 links에 넣지 않음 → 경로 탐색 시 다른 버티포트를 경유하지 않음
+        self.access[name] = near
+        return node_id
+
+    # ------------------------------------------------------------------
+    # 경로
+    # ------------------------------------------------------------------
+    def precompute_paths(self):
+        """모든 버티포트 쌍의 공중 경로 계산 (출발 버티포트마다 단일 출발 Dijkstra 1회)"""
+        self.paths.clear()
+        for origin, info in self.vertiports.items():
+            src = info["id"]
+            # 출발 버티포트에서만 경로 노드로 나가는 링크를 잠시 추가
+            self.links[src] = self.access[origin]
+            try:
+                dist, prev = shortest_path_tree(self.nodes, self.links, src)
+            finally:
+                del self.links[src]
+            for dest, dest_info in self.vertiports.items():
+                if dest == origin:
+                    continue
+                dx, dy = dest_info["x"], dest_info["y"]
+                best, best_cost = None, math.inf
+                for n in self.access[dest]:
+                    if n not in dist:
+                        continue
+                    cost = dist[n] + math.hypot(self.nodes[n][0] - dx, self.nodes[n][1] - dy)
+                    if cost < best_cost:
+                        best, best_cost = n, cost
+                if best is None:
+                    continue
+                node_path = build_path(prev, src, best) + [dest_info["id"]]
+                self.paths[(origin, dest)] = [tuple(self.nodes[n]) for n in node_path]
+        return self
+
+    def path(self, origin, dest):
+        """origin → dest 버티포트의 waypoint 리스트 [(x, y, z), ...], 경로가 없으면 None"""
+        return self.paths.get((origin, dest))
+
+    def bind(self, vertiports, names=None):
+        """
+        시뮬레이터 Vertiport들을 공역 버티포트와 연결.
+        names: 시뮬레이터 Vertiport 순서에 대응하는 공역 버티포트 이름 또는 JSON 내 번호(int).
+               None이면 Vertiport.name이 모두 공역에 있을 때 이름으로, 아니면 JSON 순서대로 연결
+        """
+        vertiports = list(vertiports)
+        order = list(self.vertiports)
+        if names is None:
+            if all(vp.name in self.vertiports for vp in vertiports):
+                names = [vp.name for vp in vertiports]
+            else:
+                names = order
+        names = list(names)
+        if len(names) < len(vertiports):
+            raise ValueError(f"공역 버티포트 {len(names)}개로 시뮬레이터 vertiport {len(vertiports)}개를 연결할 수 없음")
+        for vp, air_name in zip(vertiports, names):
+            if isinstance(air_name, int):
+                if not 0 <= air_name < len(order):
+                    raise ValueError(f"공역 버티포트 번호 범위 밖: {air_name}")
+                air_name = order[air_name]
+            elif air_name not in self.vertiports:
+                raise ValueError(f"공역에 없는 버티포트: {air_name}")
+            vp.airspace = self
+            vp.air_name = air_name
+        return self
+
+
+def load_airspace(filename, tolerance=1.0, connect_radius=None):
+    """designer JSON(또는 airspace_npz 바이너리 .npz) 파일을 읽어 경로까지 미리 계산된 AirspaceGraph 반환"""
+    if filename.lower().endswith(".npz"):
+        data = airspace_npz.AirspaceFile(filename).to_dict()
+    else:
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    return airspace_from_dict(data, tolerance=tolerance, connect_radius=connect_radius)
+
+
+def airspace_from_dict(data, tolerance=1.0, connect_radius=None):
+    graph = AirspaceGraph(tolerance=tolerance)
+    for route in data.get("routes", []):
+        graph.add_route(route)
+    for vp in data.get("vertiports", []):
+        graph.add_vertiport(vp, connect_radius=connect_radius)
+    return graph.precompute_paths()
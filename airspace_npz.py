@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import struct
+import time
+import zipfile
+
+import numpy as np
+
+from route_network import route_from_json, route_to_json
+
+FORMAT_VERSION = 1
+
+# 배열 목록 (모두 무압축으로 저장해 memory-map으로 읽는다)
+#   strings / string_offsets      : UTF-8 문자열 테이블 (k번째 = strings[off[k]:off[k+1]])
+#   route_name, route_node_count  : 경로별 이름(문자열 id), node_count
+#   route_node_start/link_start   : 경로 r의 노드/링크 = [start[r], start[r+1]) 구간 (길이 R+1)
+#   node_xy (N,2), node_z, node_name : 노드 좌표/고도/이름(문자열 id)
+#   link_nodes (L,2)              : 링크 양 끝 노드 index (전체 노드 배열 기준)
+#   vp_name, vp_type, vp_xyz (V,3), vp_radius (V,2: outer, inner)
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.values = []
+
+    def add(self, s):
+        k = self.index.get(s)
+        if k is None:
+            k = self.index[s] = len(self.values)
+            self.values.append(s)
+        return k
+
+    def arrays(self):
+        encoded = [s.encode("utf-8") for s in self.values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+# ----------------------------------------------------------------------
+# 저장
+# ----------------------------------------------------------------------
+def save_npz(filename, routes, vertiports=()):
+    """designer 메모리 구조(routes: (x, y) 키 노드 dict, vertiports: dict 리스트)를 .npz로 저장"""
+    strings = _StringTable()
+    n_nodes = sum(len(r["nodes"]) for r in routes)
+    n_links = sum(len(r["links"]) for r in routes)
+    node_xy = np.empty((n_nodes, 2), dtype=np.float64)
+    node_z = np.empty(n_nodes, dtype=np.float64)
+    node_name = np.empty(n_nodes, dtype=np.int32)
+    link_nodes = np.empty((n_links, 2), dtype=np.int32)
+    route_node_start = np.zeros(len(routes) + 1, dtype=np.int64)
+    route_link_start = np.zeros(len(routes) + 1, dtype=np.int64)
+
+    n = l = 0
+    for r_idx, route in enumerate(routes):
+        local = {}
+        for xy, nd in route["nodes"].items():
+            local[xy] = n
+            node_xy[n] = xy
+            node_z[n] = nd["z"]
+            node_name[n] = strings.add(nd["node_name"])
+            n += 1
+        for a, b in route["links"]:
+            link_nodes[l] = (local[a], local[b])
+            l += 1
+        route_node_start[r_idx + 1] = n
+        route_link_start[r_idx + 1] = l
+
+    vertiports = list(vertiports)
+    arrays = {
+        "format_version": np.array([FORMAT_VERSION], dtype=np.int32),
+        "route_name": np.array([strings.add(r["name"]) for r in routes], dtype=np.int32),
+        "route_node_count": np.array([r["node_count"] for r in routes], dtype=np.int64),
+        "route_node_start": route_node_start,
+        "route_link_start": route_link_start,
+        "node_xy": node_xy,
+        "node_z": node_z,
+        "node_name": node_name,
+        "link_nodes": link_nodes,
+        "vp_name": np.array([strings.add(vp["name"]) for vp in vertiports], dtype=np.int32),
+        "vp_type": np.array([strings.add(vp["type"]) for vp in vertiports], dtype=np.int32),
+        "vp_xyz": np.array([(vp["x"], vp["y"], vp["z"]) for vp in vertiports],
+                           dtype=np.float64).reshape(-1, 3),
+        "vp_radius": np.array([(vp["radius_outer"], vp["radius_inner"]) for vp in vertiports],
+                              dtype=np.float64).reshape(-1, 2),
+    }
+    text, offsets = strings.arrays()
+    arrays["strings"] = text
+    arrays["string_offsets"] = offsets
+    # np.savez는 파일 이름에 .npz를 붙이므로 파일 객체로 저장
+    with open(filename, "wb") as f:
+        np.savez(f, **arrays)
+
+
+# ----------------------------------------------------------------------
+# 읽기 (memory-map)
+# ----------------------------------------------------------------------
+def _mmap_member(filename, info):
+    """무압축 zip 항목(.npy)의 데이터 영역을 바로 memory-map"""
+    with open(filename, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_len, extra_len = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran else "C")
+
+
+def load_arrays(filename, mmap=True):
+    """.npz의 배열 dict. 무압축 항목은 memory-map (mmap=False이거나 압축된 항목은 메모리로 읽음)"""
+    arrays = {}
+    with zipfile.ZipFile(filename) as zf:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if mmap and info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _mmap_member(filename, info)
+            else:
+                with zf.open(info) as f:
+                    arrays[name] = np.lib.format.read_array(f)
+    return arrays
+
+
+class AirspaceFile:
+    """
+    .npz 공역 파일. 배열은 memory-map으로 열기만 하고, 경로/버티포트 dict는 요청할 때 해당 구간만 만든다.
+    좌표 배열(node_xy 등)은 dict로 풀지 않고 그대로 쓸 수 있다.
+    """
+
+    def __init__(self, filename, mmap=True):
+        self.filename = filename
+        self.arrays = load_arrays(filename, mmap=mmap)
+        version = int(self.arrays["format_version"][0])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 공역 파일 버전: {version}")
+        self._strings = self.arrays["strings"]
+        self._offsets = self.arrays["string_offsets"]
+
+    def string(self, k):
+        return bytes(self._strings[self._offsets[k]:self._offsets[k + 1]]).decode("utf-8")
+
+    @property
+    def route_count(self):
+        return len(self.arrays["route_name"])
+
+    @property
+    def vertiport_count(self):
+        return len(self.arrays["vp_name"])
+
+    def route(self, r_idx):
+        """경로 r_idx를 designer 메모리 구조로 ((x, y) 키 노드 dict, 좌표 튜플 링크 리스트)"""
+        a = self.arrays
+        n0, n1 = int(a["route_node_start"][r_idx]), int(a["route_node_start"][r_idx + 1])
+        l0, l1 = int(a["route_link_start"][r_idx]), int(a["route_link_start"][r_idx + 1])
+        keys = [tuple(xy) for xy in a["node_xy"][n0:n1].tolist()]
+        names = a["node_name"][n0:n1].tolist()
+        nodes = {xy: {"z": z, "node_name": self.string(k)}
+                 for xy, z, k in zip(keys, a["node_z"][n0:n1].tolist(), names)}
+        links = [(keys[i - n0], keys[j - n0]) for i, j in a["link_nodes"][l0:l1].tolist()]
+        return {"name": self.string(int(a["route_name"][r_idx])),
+                "node_count": int(a["route_node_count"][r_idx]),
+                "nodes": nodes, "links": links, "last_node": None}
+
+    def routes(self):
+        for r_idx in range(self.route_count):
+            yield self.route(r_idx)
+
+    def vertiport(self, v_idx):
+        a = self.arrays
+        x, y, z = a["vp_xyz"][v_idx].tolist()
+        outer, inner = a["vp_radius"][v_idx].tolist()
+        return {"name": self.string(int(a["vp_name"][v_idx])),
+                "type": self.string(int(a["vp_type"][v_idx])),
+                "x": x, "y": y, "z": z, "radius_outer": outer, "radius_inner": inner}
+
+    def vertiports(self):
+        for v_idx in range(self.vertiport_count):
+            yield self.vertiport(v_idx)
+
+    def to_dict(self):
+        """designer JSON과 같은 구조 (airspace.airspace_from_dict 등에 그대로 전달 가능)"""
+        return {"routes": [route_to_json(r) for r in self.routes()],
+                "vertiports": list(self.vertiports())}
+
+
+# ----------------------------------------------------------------------
+# JSON <-> npz 변환
+# ----------------------------------------------------------------------
+def json_to_npz(json_path, npz_path):
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    routes = [route_from_json(r) for r in data.get("routes", [])]
+    save_npz(npz_path, routes, data.get("vertiports", []))
+
+
+def npz_to_json(npz_path, json_path):
+    data = AirspaceFile(npz_path).to_dict()
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="designer JSON <-> 바이너리(.npz) 공역 파일 변환")
+    parser.add_argument("input", help=".json 또는 .npz")
+    parser.add_argument("output", help=".npz 또는 .json")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.input.lower().endswith(".npz"):
+        npz_to_json(args.input, args.output)
+    else:
+        json_to_npz(args.input, args.output)
+    size_in, size_out = os.path.getsize(args.input), os.path.getsize(args.output)
+    print(f"{args.input} ({size_in:,} B) → {args.output} ({size_out:,} B), {time.perf_counter() - t0:.2f} 초")
+
+
+if __name__ == "__main__":
+    main()
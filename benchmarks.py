@@ -0,0 +1,319 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+from vertiport import Vertiport
+from uam_plane import UAMPlane
+from simulation_engine import SimulationEngine
+from ground_procedure import GroundProcedure
+from deadlock import DeadlockDetector
+from dijkstra import dijkstra
+from vertiport_2f6g import ground_nodes, ground_links
+
+# 벤치마크 묶음: 각 항목은 (벤치마크 이름, 파라미터 dict)
+# engine_update는 vertiport당 비행체 5대(gate 6개) 이하로 맞춘다. gate보다 많으면 대부분 gate/교착 대기로
+# 건너뛰어져 idle 비행체만 측정하게 된다.
+# procedure 항목은 시동 종료/지상 조업/시동 타이머로 대기하는 비행체가 많아 진행 중 수가 적은 것이 정상
+# (교착이 아니라 타이머 휠이 깨울 때까지 건너뛰는 비용을 측정).
+SUITES = {
+    "quick": [
+        ("engine_update", {"vertiports": 4, "aircraft": 16, "mode": "object", "ticks": 2000}),
+        ("engine_update", {"vertiports": 4, "aircraft": 16, "mode": "vectorized", "ticks": 2000}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "object", "ticks": 50}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "vectorized", "ticks": 50}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "object", "ticks": 400,
+                           "procedure": True}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "vectorized", "ticks": 400,
+                           "procedure": True}),
+        ("dijkstra", {"layout": "ground", "queries": 2000}),
+        ("dijkstra", {"layout": "grid", "size": 10, "queries": 500}),
+        ("dijkstra", {"layout": "grid", "size": 50, "queries": 50}),
+        ("request_gate", {"aircraft": 16, "rounds": 2000}),
+        ("request_gate", {"aircraft": 2000, "rounds": 20}),
+        ("find_all_intersections", {"routes": 10, "links": 20, "queries": 500}),
+        ("find_all_intersections", {"routes": 100, "links": 20, "queries": 50}),
+    ],
+    "full": [
+        ("engine_update", {"vertiports": 4, "aircraft": 16, "mode": "object", "ticks": 5000}),
+        ("engine_update", {"vertiports": 4, "aircraft": 16, "mode": "vectorized", "ticks": 5000}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "object", "ticks": 200}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "vectorized", "ticks": 200}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "object", "ticks": 2000,
+                           "procedure": True}),
+        ("engine_update", {"vertiports": 400, "aircraft": 2000, "mode": "vectorized", "ticks": 2000,
+                           "procedure": True}),
+        ("engine_update", {"vertiports": 10000, "aircraft": 50000, "mode": "object", "ticks": 10}),
+        ("engine_update", {"vertiports": 10000, "aircraft": 50000, "mode": "vectorized", "ticks": 10}),
+        ("dijkstra", {"layout": "ground", "queries": 10000}),
+        ("dijkstra", {"layout": "grid", "size": 10, "queries": 2000}),
+        ("dijkstra", {"layout": "grid", "size": 50, "queries": 200}),
+        ("dijkstra", {"layout": "grid", "size": 200, "queries": 20}),
+        ("request_gate", {"aircraft": 16, "rounds": 10000}),
+        ("request_gate", {"aircraft": 2000, "rounds": 100}),
+        ("request_gate", {"aircraft": 50000, "rounds": 5}),
+        ("find_all_intersections", {"routes": 10, "links": 20, "queries": 2000}),
+        ("find_all_intersections", {"routes": 100, "links": 20, "queries": 200}),
+        ("find_all_intersections", {"routes": 500, "links": 50, "queries": 20}),
+    ],
+}
+
+
+# ----------------------------------------------------------------------
+# 시나리오 / 입력 생성
+# ----------------------------------------------------------------------
+def build_scenario(n_vertiports, n_aircraft, seed=0, departure_window=60.0, deadlock="reroute"):
+    """
+    격자 배치 vertiport n_vertiports개 + 비행체 n_aircraft개.
+    비행체는 vertiport에 순서대로 배정하고, 이웃 vertiport 3곳을 돈 뒤 복귀한다.
+    출발 시각은 departure_window 초 안에 고르게 흩어 측정 구간에 지상 이동이 섞이도록 한다.
+    deadlock: 지상 교착 해소 정책 (DeadlockDetector, None이면 사용 안 함)
+    """
+    rng = random.Random(seed)
+    cols = math.ceil(math.sqrt(n_vertiports))
+    vertiports = []
+    for k in range(n_vertiports):
+        row, col = divmod(k, cols)
+        vertiports.append(Vertiport(f"Vertiport {k}", position=(col * 30 + 5, row * 30 + 5),
+                                    offset=(col * 30, row * 30)))
+    planes = []
+    for i in range(n_aircraft):
+        k = i % n_vertiports
+        origin = vertiports[k]
+        plan = [vertiports[(k + j) % n_vertiports] for j in (1, 2, 3) if n_vertiports > 1] + [origin]
+        planes.append(UAMPlane(name=f"UAM-{i+1}", origin_vp=origin, dest_vp=plan[0],
+                               departure_time=rng.uniform(0, departure_window), flight_plan=plan))
+    if deadlock is not None:
+        DeadlockDetector(policy=deadlock).attach(vertiports)
+    return planes, vertiports
+
+
+def grid_layout(size):
+    """size × size 격자 그래프 (4방향 링크, 간격 1)"""
+    nodes = {(x, y): [x, y] for x in range(size) for y in range(size)}
+    links = {}
+    for (x, y) in nodes:
+        links[(x, y)] = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                         if (x + dx, y + dy) in nodes]
+    return nodes, links
+
+
+def random_routes(n_routes, n_links, seed=0, extent=100000.0, z=1000.0):
+    """designer 형식(routes 전역과 같은 구조)의 무작위 꺾은선 경로 n_routes개"""
+    rng = random.Random(seed)
+    routes = []
+    for r in range(n_routes):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        nodes, links = {(x, y): {"z": z, "node_name": f"R{r}-Node1"}}, []
+        step = extent / n_links
+        for k in range(n_links):
+            nx = min(max(x + rng.uniform(-step, step), 0.0), extent)
+            ny = min(max(y + rng.uniform(-step, step), 0.0), extent)
+            nodes[(nx, ny)] = {"z": z, "node_name": f"R{r}-Node{k+2}"}
+            links.append(((x, y), (nx, ny)))
+            x, y = nx, ny
+        routes.append({"name": f"R{r}", "nodes": nodes, "links": links,
+                       "node_count": n_links + 1, "last_node": (x, y)})
+    return routes
+
+
+# ----------------------------------------------------------------------
+# 벤치마크 (반환: 결과 dict 하나)
+# ----------------------------------------------------------------------
+def bench_engine_update(vertiports, aircraft, mode="object", ticks=100, time_step=0.5, seed=0,
+                        procedure=False):
+    """procedure: True면 GroundProcedure(지상 절차 전이표 + 타이머 휠)를 붙여 실행"""
+    planes, _ = build_scenario(vertiports, aircraft, seed=seed)
+    ground_procedure = GroundProcedure().attach(planes) if procedure else None
+    engine = SimulationEngine(planes, time_step=time_step, mode=mode, procedure=ground_procedure)
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        engine.update()
+    elapsed = time.perf_counter() - t0
+    # 측정 끝 시점에 실제로 진행 중인 비행체 수 (교착/대기로 줄면 ticks/s가 좋아 보여도 비교에서 걸러냄)
+    active = [p for p in planes if p.state != "done"]
+    return {"value": ticks / elapsed, "unit": "ticks/s", "better": "higher",
+            "active": len(active), "non_waiting": sum(not p.waiting for p in active)}
+
+
+def bench_dijkstra(layout="ground", size=10, queries=100, seed=0):
+    if layout == "ground":
+        nodes, links = ground_nodes, ground_links
+    else:
+        nodes, links = grid_layout(size)
+    rng = random.Random(seed)
+    keys = list(nodes)
+    pairs = [(rng.choice(keys), rng.choice(keys)) for _ in range(queries)]
+    t0 = time.perf_counter()
+    for start, goal in pairs:
+        dijkstra(nodes, links, start, goal)
+    elapsed = time.perf_counter() - t0
+    return {"value": elapsed / queries * 1e6, "unit": "us/call", "better": "lower"}
+
+
+def bench_request_gate(aircraft, rounds=100):
+    """한 vertiport에 aircraft개가 매 round 모두 gate를 요청하고, 받은 쪽은 바로 반납"""
+    vp = Vertiport("Bench", position=(0, 0))
+    uams = [object() for _ in range(aircraft)]
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        granted = [uam for uam in uams if vp.request_gate(uam) is not None]
+        for uam in granted:
+            vp.release_gate(uam)
+    elapsed = time.perf_counter() - t0
+    return {"value": aircraft * rounds / elapsed, "unit": "requests/s", "better": "higher"}
+
+
+def bench_find_all_intersections(routes, links, queries=100, seed=0):
+    """무작위 경로 routes개에 대해 새 링크 하나의 교차점 탐색 (tool_airspace_design은 실행 시에만 import)"""
+    import tool_airspace_design as designer
+
+    app = designer.UAMMapApp.__new__(designer.UAMMapApp)   # Tk 창 없이 계산 메서드만 사용
+    saved = designer.routes[:]
+    designer.routes[:] = random_routes(routes, links, seed=seed)
+    app.link_index = designer.LinkGridIndex(designer.LINK_INDEX_CELL)
+    app.rebuild_link_index()
+    try:
+        rng = random.Random(seed + 1)
+        extent = 100000.0
+        segments = [((rng.uniform(0, extent), rng.uniform(0, extent), 1000.0),
+                     (rng.uniform(0, extent), rng.uniform(0, extent), 1000.0)) for _ in range(queries)]
+        t0 = time.perf_counter()
+        for pA, pB in segments:
+            app.find_all_intersections(pA, pB, -1)
+        elapsed = time.perf_counter() - t0
+    finally:
+        designer.routes[:] = saved
+    return {"value": queries / elapsed, "unit": "queries/s", "better": "higher"}
+
+
+BENCHMARKS = {
+    "engine_update": bench_engine_update,
+    "dijkstra": bench_dijkstra,
+    "request_gate": bench_request_gate,
+    "find_all_intersections": bench_find_all_intersections,
+}
+
+
+# ----------------------------------------------------------------------
+# 실행 / 비교
+# ----------------------------------------------------------------------
+def result_key(result):
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def run_suite(entries, only=None, repeat=3, report=print):
+    """entries의 벤치마크를 repeat번씩 실행해 가장 좋은 값을 결과로"""
+    results = []
+    for name, params in entries:
+        if only and name not in only:
+            continue
+        best = None
+        for _ in range(repeat):
+            out = BENCHMARKS[name](**params)
+            if best is None or (out["value"] > best["value"]) == (out["better"] == "higher"):
+                best = out
+        result = dict(best, name=name, params=params)
+        results.append(result)
+        if report is not None:
+            counts = ""
+            if "non_waiting" in result:
+                counts = f"  (진행 중 {result['non_waiting']}/{result['active']})"
+            report(f"{result_key(result):<80} {result['value']:>14.2f} {result['unit']}{counts}")
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    baseline(이전 결과 JSON의 results)과 비교해 tolerance(비율) 이상 나빠진 항목 리스트 반환.
+    각 항목: (key, 현재 값, baseline 값, 변화율)
+    진행 중(non_waiting) 비행체 수가 tolerance 이상 줄어든 항목도 포함 (key에 "#non_waiting")
+    """
+    base = {result_key(r): r for r in baseline}
+    regressions = []
+    for r in results:
+        key = result_key(r)
+        old = base.get(key)
+        if old is None or not old["value"]:
+            continue
+        change = r["value"] / old["value"] - 1.0
+        worse = -change if r["better"] == "higher" else change
+        if worse > tolerance:
+            regressions.append((key, r["value"], old["value"], change))
+        if old.get("non_waiting") and "non_waiting" in r:
+            moving = r["non_waiting"] / old["non_waiting"] - 1.0
+            if -moving > tolerance:
+                regressions.append((key + "#non_waiting", r["non_waiting"], old["non_waiting"], moving))
+    return regressions
+
+
+# 저장소에 함께 두는 suite별 기준 결과 (--update-baseline으로 갱신, 경로는 이 파일 기준)
+BASELINES = {
+    "quick": "benchmark_baseline_quick.json",
+}
+
+
+def baseline_path(suite):
+    name = BASELINES.get(suite)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name) if name else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="엔진/경로 탐색/교차점 계산 벤치마크")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), default=None,
+                        help="실행할 벤치마크 이름")
+    parser.add_argument("--repeat", type=int, default=3, help="벤치마크별 반복 횟수 (최고값 사용)")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=None,
+                        help="비교할 이전 결과 JSON (기본: 저장소의 suite 기준 결과, 없으면 비교 안 함)")
+    parser.add_argument("--no-baseline", action="store_true", help="기준 결과와 비교하지 않음")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="이번 결과를 저장소의 suite 기준 결과로 저장 (비교는 하지 않음)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 성능 저하 비율")
+    args = parser.parse_args(argv)
+
+    results = run_suite(SUITES[args.suite], only=args.only, repeat=args.repeat)
+    document = {
+        "suite": args.suite,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+
+    stored = baseline_path(args.suite)
+    if args.update_baseline:
+        if stored is None:
+            parser.error(f"suite {args.suite}의 기준 결과 경로가 없음 (BASELINES)")
+        with open(stored, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준 결과 저장: {stored}")
+        return 0
+
+    baseline_file = args.baseline
+    if baseline_file is None and not args.no_baseline and stored is not None and os.path.exists(stored):
+        baseline_file = stored
+    if baseline_file and not args.no_baseline:
+        with open(baseline_file, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for key, value, old, change in regressions:
+            print(f"[성능 저하] {key}: {old:.2f} → {value:.2f} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"baseline 대비 성능 저하 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
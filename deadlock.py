@@ -0,0 +1,115 @@
+class DeadlockDetector:
+    """
+    지상 노드 대기의 wait-for graph를 점진적으로 유지하면서 교착(순환 대기)을 찾는다.
+    - 비행체는 한 번에 노드 하나만 기다리므로 간선은 비행체당 최대 1개 (대기자 → 노드 → 점유자)
+    - Vertiport.wait_for_node에서 간선 추가, release_node가 노드를 넘겨줄 때 간선 제거
+    - 새 간선이 생길 때 그 비행체에서 간선을 따라가 보기만 하면 순환 여부를 알 수 있다 (순환 길이만큼)
+    policy: None      - 탐지/집계만
+            "reroute" - 기다리던 노드와 점유 중인 노드를 피하는 우회 경로로 교체, 없으면 backoff
+            "backoff" - 상대 경로 밖의 비어 있는 인접 노드로 비켜선 뒤 목표까지 다시 진행
+    순환을 닫은 (마지막으로 대기를 등록한) 비행체가 양보한다.
+    """
+
+    POLICIES = (None, "reroute", "backoff")
+
+    def __init__(self, policy="reroute"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"지원하지 않는 policy: {policy}")
+        self.policy = policy
+        self.waits_for = {}      # uam -> (vertiport, node)
+        self.deadlocks = 0
+        self.resolved = {"reroute": 0, "backoff": 0}
+        self.unresolved = 0
+        self.max_cycle = 0
+
+    def attach(self, vertiports):
+        for vp in vertiports:
+            vp.deadlock_detector = self
+        return self
+
+    # ------------------------------------------------------------------
+    # wait-for graph 갱신 (Vertiport가 호출)
+    # ------------------------------------------------------------------
+    def on_wait(self, vp, uam, node):
+        self.waits_for[uam] = (vp, node)
+        cycle = self.find_cycle(uam)
+        if cycle is None:
+            return False
+        self.deadlocks += 1
+        self.max_cycle = max(self.max_cycle, len(cycle))
+        if self.policy is not None and not self.resolve(vp, uam, node):
+            self.unresolved += 1
+        return True
+
+    def on_acquire(self, uam):
+        self.waits_for.pop(uam, None)
+
+    def find_cycle(self, uam):
+        """uam에서 시작하는 대기 사슬이 uam으로 돌아오면 순환에 포함된 비행체 리스트, 아니면 None"""
+        cycle = [uam]
+        vp, node = self.waits_for[uam]
+        for _ in range(len(self.waits_for)):
+            occupant = vp.node_occupancy.get(node)
+            if occupant is None:
+                return None
+            if occupant is uam:
+                return cycle
+            entry = self.waits_for.get(occupant)
+            if entry is None:
+                return None
+            cycle.append(occupant)
+            vp, node = entry
+        return None
+
+    # ------------------------------------------------------------------
+    # 해소
+    # ------------------------------------------------------------------
+    def resolve(self, vp, uam, node):
+        current = uam.ground_route_nodes[uam.current_ground_index]
+        goal = uam.ground_route_nodes[-1]
+        route, kind = None, None
+        if self.policy == "reroute":
+            route, kind = self._detour(vp, uam, current, goal, node), "reroute"
+        if route is None:
+            route, kind = self._backoff(vp, uam, current, goal, node), "backoff"
+        if route is None:
+            return False
+        vp.cancel_node_wait(uam, node)
+        self.waits_for.pop(uam, None)
+        uam.reroute_ground(vp, route)
+        self.resolved[kind] += 1
+        uam.resource_ready(vp)
+        return True
+
+    def _detour(self, vp, uam, current, goal, node):
+        blocked = {n for n, occupant in vp.node_occupancy.items()
+                   if occupant is not None and occupant is not uam}
+        blocked.add(node)
+        route, _ = vp.ground_route(current, goal, blocked)
+        if len(route) < 2 or any(n in blocked for n in route[1:-1]) or route[1] == node:
+            return None
+        return route
+
+    def _backoff(self, vp, uam, current, goal, node):
+        opponent = vp.node_occupancy.get(node)
+        opponent_path = set()
+        if opponent is not None and opponent.ground_route_nodes:
+            opponent_path = set(opponent.ground_route_nodes[opponent.current_ground_index:])
+        candidates = [nb for nb in vp.links.get(current, ())
+                      if nb != node and nb not in vp.gates and vp.node_occupancy.get(nb) is None]
+        candidates.sort(key=lambda nb: nb in opponent_path)
+        for nb in candidates:
+            rest, _ = vp.ground_route(nb, goal)
+            if rest:
+                return [current] + rest
+        return None
+
+    def summary(self):
+        return {
+            "policy": self.policy,
+            "deadlocks": self.deadlocks,
+            "resolved": dict(self.resolved),
+            "unresolved": self.unresolved,
+            "max_cycle": self.max_cycle,
+            "waiting": len(self.waits_for),
+        }
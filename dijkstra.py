@@ -1,27 +1,202 @@
 import math
 import heapq
+import time
+
+# 탐색 호출마다 observer(함수 이름, 소요 시간[초]) 호출 (instrumentation.Instrumentation이 설정)
+_observer = None
+
+
+def set_observer(observer):
+    global _observer
+    _observer = observer
+
+
+def get_observer():
+    return _observer
+
+
+def _observed(name, func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    _observer(name, time.perf_counter() - t0)
+    return result
+
+
+def _build_path(prev, start, goal):
+    """predecessor map으로 start → goal 경로 복원"""
+    path = [goal]
+    while path[-1] != start:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path
+
+
+def _search(nodes, links, start, goal, use_heuristic):
+    """
+    Dijkstra / A* 공통 루프.
+    경로 리스트를 큐에 넣지 않고 predecessor(prev)만 기록, 도착 시 한 번만 복원한다.
+    간선 비용은 nodes 좌표의 유클리드 거리.
+    """
+    if start == goal:
+        return [start]
+    gx, gy = nodes[goal][0], nodes[goal][1]
+    hypot = math.hypot
+    push, pop = heapq.heappush, heapq.heappop
+
+    dist = {start: 0.0}
+    prev = {}
+    closed = set()
+    sx, sy = nodes[start][0], nodes[start][1]
+    queue = [(hypot(gx - sx, gy - sy) if use_heuristic else 0.0, 0.0, start)]
+    while queue:
+        _, cost, current = pop(queue)
+        if current == goal:
+            return _build_path(prev, start, goal)
+        if current in closed:
+            continue
+        closed.add(current)
+        cx, cy = nodes[current][0], nodes[current][1]
+        for neighbor in links.get(current, ()):
+            if neighbor in closed:
+                continue
+            nx, ny = nodes[neighbor][0], nodes[neighbor][1]
+            new_cost = cost + hypot(nx - cx, ny - cy)
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                prev[neighbor] = current
+                priority = new_cost + hypot(gx - nx, gy - ny) if use_heuristic else new_cost
+                push(queue, (priority, new_cost, neighbor))
+    return []
+
 
 def dijkstra(nodes, links, start, goal):
     """
     nodes: dict of {node: [x, y]}
-    links: dict of {node: [인접 node들]} - 각 간선의 거리는 10m로 고정.
+    links: dict of {node: [인접 node들]} - 간선 비용은 두 노드 좌표 사이의 유클리드 거리.
     start, goal: 시작, 목표 노드 키
     반환: start부터 goal까지의 최단 경로 (노드 리스트). 경로가 없으면 빈 리스트.
     """
-    queue = []
-    heapq.heappush(queue, (0, start, [start]))
-    visited = set()
+    if _observer is not None:
+        return _observed("dijkstra", _search, nodes, links, start, goal, False)
+    return _search(nodes, links, start, goal, use_heuristic=False)
+
+
+def astar(nodes, links, start, goal):
+    """dijkstra와 같은 입력/반환. 목표까지의 직선거리를 휴리스틱으로 쓰는 A*"""
+    if _observer is not None:
+        return _observed("astar", _search, nodes, links, start, goal, True)
+    return _search(nodes, links, start, goal, use_heuristic=True)
+
+
+def bidirectional_dijkstra(nodes, links, start, goal, reverse_links=None):
+    """
+    start/goal 양쪽에서 동시에 확장하는 Dijkstra. 입력/반환은 dijkstra와 같다.
+    reverse_links: 역방향 인접 리스트. None이면 links를 양방향 그래프로 간주
+                   (ground_links처럼 링크가 양쪽에 모두 등록된 경우).
+    """
+    if _observer is not None:
+        return _observed("bidirectional_dijkstra", _bidirectional, nodes, links, start, goal, reverse_links)
+    return _bidirectional(nodes, links, start, goal, reverse_links)
+
+
+def _bidirectional(nodes, links, start, goal, reverse_links):
+    if start == goal:
+        return [start]
+    if reverse_links is None:
+        reverse_links = links
+    hypot = math.hypot
+    push, pop = heapq.heappush, heapq.heappop
+
+    dist = ({start: 0.0}, {goal: 0.0})
+    prev = ({}, {})
+    closed = (set(), set())
+    queues = ([(0.0, start)], [(0.0, goal)])
+    adjacency = (links, reverse_links)
+    best = math.inf
+    meet = None
+
+    while queues[0] and queues[1]:
+        # 양쪽 큐 최솟값 합이 현재 최단 경로 이상이면 종료
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        cost, current = pop(queues[side])
+        if current in closed[side]:
+            continue
+        closed[side].add(current)
+        d_side, d_other = dist[side], dist[1 - side]
+        cx, cy = nodes[current][0], nodes[current][1]
+        for neighbor in adjacency[side].get(current, ()):
+            if neighbor in closed[side]:
+                continue
+            nx, ny = nodes[neighbor][0], nodes[neighbor][1]
+            new_cost = cost + hypot(nx - cx, ny - cy)
+            if new_cost < d_side.get(neighbor, math.inf):
+                d_side[neighbor] = new_cost
+                prev[side][neighbor] = current
+                push(queues[side], (new_cost, neighbor))
+            other = d_other.get(neighbor)
+            if other is not None and d_side[neighbor] + other < best:
+                best = d_side[neighbor] + other
+                meet = neighbor
+
+    if meet is None:
+        return []
+    path = _build_path(prev[0], start, meet)
+    node = meet
+    while node != goal:
+        node = prev[1][node]
+        path.append(node)
+    return path
+
+
+def reverse_adjacency(links):
+    """단방향 links의 역방향 인접 리스트 (bidirectional_dijkstra의 reverse_links용)"""
+    reverse = {}
+    for node, neighbors in links.items():
+        for neighbor in neighbors:
+            reverse.setdefault(neighbor, []).append(node)
+    return reverse
+
+
+def shortest_path_tree(nodes, links, start):
+    """
+    start에서 도달 가능한 모든 노드까지의 최단 거리/predecessor 계산 (단일 출발 Dijkstra).
+    반환: (dist, prev) - dist: {node: 거리}, prev: {node: 직전 노드}.
+    경로는 build_path(prev, start, node)로 복원한다.
+    """
+    if _observer is not None:
+        return _observed("shortest_path_tree", _shortest_path_tree, nodes, links, start)
+    return _shortest_path_tree(nodes, links, start)
 
+
+def _shortest_path_tree(nodes, links, start):
+    hypot = math.hypot
+    push, pop = heapq.heappush, heapq.heappop
+    dist = {start: 0.0}
+    prev = {}
+    closed = set()
+    queue = [(0.0, start)]
     while queue:
-        cost, current, path = heapq.heappop(queue)
-        if current == goal:
-            return path
-        if current in visited:
+        cost, current = pop(queue)
+        if current in closed:
             continue
-        visited.add(current)
-        for neighbor in links.get(current, []):
-            if neighbor in visited:
+        closed.add(current)
+        cx, cy = nodes[current][0], nodes[current][1]
+        for neighbor in links.get(current, ()):
+            if neighbor in closed:
                 continue
-            # 각 간선 비용은 10m
-            heapq.heappush(queue, (cost + 10, neighbor, path + [neighbor]))
-    return []
+            nx, ny = nodes[neighbor][0], nodes[neighbor][1]
+            new_cost = cost + hypot(nx - cx, ny - cy)
+            if new_cost < dist.get(neighbor, math.inf):
+                dist[neighbor] = new_cost
+                prev[neighbor] = current
+                push(queue, (new_cost, neighbor))
+    return dist, prev
+
+
+def build_path(prev, start, goal):
+    """shortest_path_tree 결과에서 start → goal 경로 복원 (도달 불가면 빈 리스트)"""
+    if goal != start and goal not in prev:
+        return []
+    return _build_path(prev, start, goal)
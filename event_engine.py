@@ -0,0 +1,188 @@
+import heapq
+import itertools
+
+# 이벤트 종류
+DEPARTURE_DUE = "departure_due"   # 게이트 출발 시각 도래
+SEGMENT_END = "segment_end"       # 지상 구간/공중 구간 이동 종료
+RESOURCE_FREED = "resource_freed" # 기다리던 gate/node가 해제되어 재시도
+HOLD_END = "hold_end"             # TaxiPlanner가 정한 노드 출발 시각 도래
+
+
+class EventQueue:
+    """시각 순서로 꺼내는 이벤트 우선순위 큐 (같은 시각은 등록 순서대로)"""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+
+    def push(self, time, kind, plane):
+        heapq.heappush(self._heap, (time, next(self._seq), kind, plane))
+
+    def pop(self):
+        time, _, kind, plane = heapq.heappop(self._heap)
+        return time, kind, plane
+
+    def peek_time(self):
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class EventDrivenFleet:
+    """
+    이산 이벤트 방식으로 UAMPlane들을 진행시킨다.
+    - gate 대기(at_gate)는 departure_due 이벤트 하나로 끝
+    - 지상 구간/공중 항로 구간(leg)은 도착 시각을 미리 계산해 segment_end 이벤트로 등록
+    - gate/node가 막혀 있으면 vertiport의 대기열에서 기다리고, 자원을 넘겨받을 때만 깨운다
+    이벤트 사이의 위치는 sync_positions()로 필요할 때만 보간한다.
+    """
+
+    def __init__(self, planes, start_time=0.0, procedure=None):
+        """procedure: GroundProcedure (있으면 절차 타이머 만료 시각도 이벤트 시각으로 함께 진행)"""
+        self.planes = planes
+        self.now = start_time
+        self.procedure = procedure
+        self.queue = EventQueue()
+        self.motion = {}    # plane -> (t0, p0, t1, p1)
+        self.event_count = 0
+        for plane in planes:
+            # vertiport가 gate/node를 넘겨주면 같은 시각에 재시도
+            plane.wake_callback = self._wake
+            if plane.state == "at_gate":
+                self._schedule_departure(plane, start_time)
+
+    # ------------------------------------------------------------------
+    # 진행
+    # ------------------------------------------------------------------
+    def next_event_time(self):
+        t = self.queue.peek_time()
+        if self.procedure is not None:
+            t_timer = self.procedure.next_time()
+            if t_timer is not None and (t is None or t_timer < t):
+                return t_timer
+        return t
+
+    def advance_to(self, t_end):
+        """t_end 이하의 이벤트를 모두 처리 (시간은 이벤트 시각으로 바로 점프)"""
+        queue = self.queue
+        procedure = self.procedure
+        while True:
+            t = queue.peek_time()
+            if procedure is not None:
+                # 같은 시각이면 절차 타이머 먼저 (깨어난 비행체의 재시도 이벤트가 그 시각에 등록됨)
+                t_timer = procedure.next_time()
+                if t_timer is not None and t_timer <= t_end and (t is None or t_timer <= t):
+                    self.now = max(self.now, t_timer)
+                    procedure.advance_to(t_timer)
+                    continue
+            if t is None or t > t_end:
+                break
+            time, kind, plane = queue.pop()
+            self.now = time
+            self.event_count += 1
+            if kind == DEPARTURE_DUE:
+                self._on_departure_due(plane, time)
+            elif kind == SEGMENT_END:
+                self._on_segment_end(plane, time)
+            elif kind in (RESOURCE_FREED, HOLD_END):
+                self._retry(plane, time)
+        self.now = max(self.now, t_end)
+
+    def sync_positions(self, current_time):
+        """이동 중인 비행체의 current_pos/air_progress를 current_time 기준으로 보간"""
+        for plane, (t0, p0, t1, p1) in self.motion.items():
+            ratio = 1.0 if t1 <= t0 else min(max((current_time - t0) / (t1 - t0), 0.0), 1.0)
+            plane.current_pos = plane.lerp(p0, p1, ratio)
+            if plane.state == "in_air":
+                leg, cum = plane.air_leg, plane.air_cum
+                za, zb = plane.in_air_altitudes[leg], plane.in_air_altitudes[leg + 1]
+                plane.current_alt = za + (zb - za) * ratio
+                flown = cum[leg] + (cum[leg + 1] - cum[leg]) * ratio
+                plane.air_progress = flown / cum[-1] if cum[-1] > 0 else 1.0
+
+    # ------------------------------------------------------------------
+    # 이벤트 처리
+    # ------------------------------------------------------------------
+    def _schedule_departure(self, plane, time):
+        if plane.gate_assigned is None:
+            gate = plane.current_vp.request_gate(plane)
+            if gate is None:
+                plane.wait_for_gate(plane.current_vp)
+                return
+            plane.gate_assigned = gate
+            plane.current_pos = plane.current_vp.gates[gate]["pos"]
+        self.queue.push(max(plane.departure_time, time), DEPARTURE_DUE, plane)
+
+    def _on_departure_due(self, plane, time):
+        plane.update_at_gate(time)
+        if plane.state == "takeoff_ground":
+            self._next_ground_segment(plane, time)
+        elif not plane.waiting:
+            self._schedule_departure(plane, time)
+
+    def _on_segment_end(self, plane, time):
+        _, _, _, end_pos = self.motion.pop(plane)
+        plane.current_pos = end_pos
+        if plane.state == "in_air":
+            if plane.air_leg < len(plane.in_air_route) - 2:
+                plane.air_leg += 1
+                self._start_air_leg(plane, time)
+                return
+            plane.air_progress = 1.0
+            plane.current_alt = plane.in_air_altitudes[-1]
+            self._arrive(plane, time)
+            return
+        vp = plane.ground_vertiport()
+        plane.advance_ground_node(vp, time)
+        self._next_ground_segment(plane, time)
+
+    def _retry(self, plane, time):
+        if plane.state == "at_gate":
+            self._schedule_departure(plane, time)
+        elif plane.state == "in_air":
+            self._arrive(plane, time)
+        elif plane.state in ("takeoff_ground", "landing_ground"):
+            self._next_ground_segment(plane, time)
+
+    def _arrive(self, plane, time):
+        # 지상 절차(시동 종료)로 대기하면 타이머가 깨울 때 재시도
+        if plane.arrive_at_dest(time) and not plane.waiting:
+            self._next_ground_segment(plane, time)
+
+    def _next_ground_segment(self, plane, time):
+        vp = plane.ground_vertiport()
+        if plane.ground_route_done():
+            if plane.state == "takeoff_ground":
+                if not plane.ready_for_takeoff(time):
+                    return  # 시동 절차 타이머 대기
+                plane.begin_flight(time)
+                self._start_air_leg(plane, time)
+                return
+            plane.finish_landing(time)
+            if plane.state == "at_gate" and not plane.waiting:
+                self._schedule_departure(plane, time)
+            return
+        hold = plane.taxi_hold(time)
+        if hold > 0:
+            self.queue.push(time + hold, HOLD_END, plane)
+            return
+        if not plane.acquire_next_node(vp, time):
+            return  # 노드 대기열에서 통지 대기
+        target = plane.ground_route_positions[plane.current_ground_index + 1]
+        self._start_motion(plane, time, plane.current_pos, target, plane.ground_speed)
+
+    def _start_air_leg(self, plane, time):
+        leg = plane.air_leg
+        route = plane.in_air_route
+        self._start_motion(plane, time, route[leg], route[leg + 1], plane.air_speed)
+
+    def _start_motion(self, plane, time, start, end, speed):
+        dist = plane.distance(start, end)
+        t1 = time + (dist / speed if speed > 0 else 0.0)
+        self.motion[plane] = (time, start, t1, end)
+        self.queue.push(t1, SEGMENT_END, plane)
+
+    def _wake(self, plane):
+        """vertiport가 대기 중이던 plane에게 gate/node를 넘겨줌 → 현재 시각에 재시도"""
+        self.queue.push(self.now, RESOURCE_FREED, plane)
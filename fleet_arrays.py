@@ -0,0 +1,250 @@
+import numpy as np
+from uam_plane import UAMPlane
+
+# 상태 문자열 <-> 정수 코드
+STATE_NAMES = ("at_gate", "takeoff_ground", "in_air", "landing_ground", "done")
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+AT_GATE, TAKEOFF_GROUND, IN_AIR, LANDING_GROUND, DONE = range(len(STATE_NAMES))
+
+
+class FleetPlaneView(UAMPlane):
+    """
+    FleetArrays에 묶인 UAMPlane.
+    위치/속도/상태 등 매 tick 바뀌는 값은 FleetArrays의 배열에 저장하고,
+    속성 접근(plane.current_pos, plane.state ...)은 그 배열을 그대로 읽고 쓴다.
+    visulization.py, simulation.py 등 기존 코드는 UAMPlane과 동일하게 사용하면 된다.
+    """
+
+    @property
+    def current_pos(self):
+        x, y = self._fleet.pos[self._fleet_idx]
+        return (float(x), float(y))
+
+    @current_pos.setter
+    def current_pos(self, value):
+        self._fleet.pos[self._fleet_idx] = value
+
+    @property
+    def state(self):
+        return STATE_NAMES[self._fleet.state[self._fleet_idx]]
+
+    @state.setter
+    def state(self, value):
+        i = self._fleet_idx
+        self._fleet.state[i] = STATE_CODES[value]
+        # 상태가 바뀌면 진행 중이던 지상 구간 이동은 무효
+        self._fleet.moving[i] = False
+
+    @property
+    def departure_time(self):
+        return float(self._fleet.departure_time[self._fleet_idx])
+
+    @departure_time.setter
+    def departure_time(self, value):
+        self._fleet.departure_time[self._fleet_idx] = value
+
+    @property
+    def gate_assigned(self):
+        return self._gate_assigned
+
+    @gate_assigned.setter
+    def gate_assigned(self, value):
+        self._gate_assigned = value
+        self._fleet.has_gate[self._fleet_idx] = value is not None
+
+    @property
+    def waiting(self):
+        return bool(self._fleet.waiting[self._fleet_idx])
+
+    @waiting.setter
+    def waiting(self, value):
+        self._fleet.waiting[self._fleet_idx] = value
+
+    @property
+    def ground_speed(self):
+        return float(self._fleet.ground_speed[self._fleet_idx])
+
+    @ground_speed.setter
+    def ground_speed(self, value):
+        self._fleet.ground_speed[self._fleet_idx] = value
+
+    @property
+    def air_speed(self):
+        return float(self._fleet.air_speed[self._fleet_idx])
+
+    @air_speed.setter
+    def air_speed(self, value):
+        self._fleet.air_speed[self._fleet_idx] = value
+
+    @property
+    def current_ground_index(self):
+        return int(self._fleet.route_index[self._fleet_idx])
+
+    @current_ground_index.setter
+    def current_ground_index(self, value):
+        self._fleet.route_index[self._fleet_idx] = value
+
+    @property
+    def air_progress(self):
+        return float(self._fleet.air_progress[self._fleet_idx])
+
+    @air_progress.setter
+    def air_progress(self, value):
+        self._fleet.air_progress[self._fleet_idx] = value
+
+    @property
+    def current_alt(self):
+        return float(self._fleet.alt[self._fleet_idx])
+
+    @current_alt.setter
+    def current_alt(self, value):
+        self._fleet.alt[self._fleet_idx] = value
+
+    def set_air_route(self, waypoints):
+        super().set_air_route(waypoints)
+        self._fleet.load_air_leg(self._fleet_idx)
+
+
+# FleetArrays가 배열로 옮겨 담는 UAMPlane 속성들
+_VIEW_ATTRS = ("current_pos", "state", "departure_time", "gate_assigned", "waiting",
+               "ground_speed", "air_speed", "current_ground_index",
+               "air_progress", "current_alt")
+
+
+class FleetArrays:
+    """
+    비행체 전체 상태를 NumPy 배열(structure-of-arrays)로 보관하고,
+    같은 상태(in_air, takeoff_ground, landing_ground)의 비행체를 마스크 연산으로 한 번에 진행시킨다.
+    - 연속 이동(지상 구간 이동, 공중 보간)은 배열 연산
+    - 게이트 배정, 경로 계산, 노드 예약 같은 이산 전이는 해당 비행체만 골라 UAMPlane 메서드로 처리
+    """
+
+    def __init__(self, planes):
+        self.planes = list(planes)
+        n = len(self.planes)
+        self.pos = np.zeros((n, 2))
+        self.state = np.zeros(n, dtype=np.int8)
+        self.departure_time = np.zeros(n)
+        self.has_gate = np.zeros(n, dtype=bool)
+        self.waiting = np.zeros(n, dtype=bool)           # gate/node 대기 (통지 전까지 건너뜀)
+        self.ground_speed = np.zeros(n)
+        self.air_speed = np.zeros(n)
+        self.route_index = np.zeros(n, dtype=np.int32)   # current_ground_index
+        self.target = np.zeros((n, 2))                   # 현재 지상 구간 목표 좌표
+        self.moving = np.zeros(n, dtype=bool)            # 다음 노드를 확보하고 이동 중인지
+        self.alt = np.zeros(n)
+        # 공중: 전체 비행 거리 + 현재 구간(leg)의 양 끝 좌표/고도/누적 거리
+        self.air_total = np.zeros(n)
+        self.air_progress = np.zeros(n)
+        self.leg_a = np.zeros((n, 2))
+        self.leg_b = np.zeros((n, 2))
+        self.leg_za = np.zeros(n)
+        self.leg_zb = np.zeros(n)
+        self.leg_s0 = np.zeros(n)
+        self.leg_s1 = np.zeros(n)
+
+        for i, plane in enumerate(self.planes):
+            self.bind(plane, i)
+
+    def bind(self, plane, idx):
+        """plane의 현재 값을 배열로 옮기고, plane을 배열 뷰(FleetPlaneView)로 전환"""
+        values = {attr: getattr(plane, attr) for attr in _VIEW_ATTRS}
+        for attr in _VIEW_ATTRS:
+            plane.__dict__.pop(attr, None)
+        plane._fleet = self
+        plane._fleet_idx = idx
+        plane.__class__ = FleetPlaneView
+        for attr, value in values.items():
+            setattr(plane, attr, value)
+        if len(plane.in_air_route) >= 2:
+            self.load_air_leg(idx)
+
+    def load_air_leg(self, i):
+        """plane의 현재 air_leg 구간을 배열로 옮김 (구간이 바뀔 때만 호출)"""
+        plane = self.planes[i]
+        leg = plane.air_leg
+        cum = plane.air_cum
+        self.air_total[i] = cum[-1]
+        self.leg_a[i] = plane.in_air_route[leg]
+        self.leg_b[i] = plane.in_air_route[leg + 1]
+        self.leg_za[i] = plane.in_air_altitudes[leg]
+        self.leg_zb[i] = plane.in_air_altitudes[leg + 1]
+        self.leg_s0[i] = cum[leg]
+        self.leg_s1[i] = cum[leg + 1]
+
+    def step(self, dt, current_time):
+        planes = self.planes
+        state = self.state
+        # 이번 tick 시작 시점의 상태로 마스크 고정 (전이된 비행체는 다음 tick부터 해당 상태로 진행)
+        active = ~self.waiting
+        gate_due = (state == AT_GATE) & active & ((self.departure_time <= current_time) | ~self.has_gate)
+        ground = ((state == TAKEOFF_GROUND) | (state == LANDING_GROUND)) & active
+        air = (state == IN_AIR) & active
+
+        # 1) at_gate: 출발 시각이 되었거나 게이트가 없는 비행체만 개별 처리
+        for i in np.flatnonzero(gate_due):
+            planes[i].update_at_gate(current_time)
+
+        # 2) 지상: 다음 노드를 아직 확보하지 못한 비행체만 개별 처리
+        for i in np.flatnonzero(ground & ~self.moving):
+            plane = planes[i]
+            if plane.ground_route_done() or plane.gate_assigned is None:
+                # 경로 끝(이륙 전환/게이트 도착) 처리는 기존 update 그대로
+                plane.update(dt, current_time)
+                continue
+            if plane.taxi_hold(current_time) > 0:
+                continue  # 계획된 출발 시각 전
+            # 막혀 있으면 acquire_next_node가 노드 대기열에 등록 (waiting)
+            if plane.acquire_next_node(plane.ground_vertiport(), current_time):
+                self.target[i] = plane.ground_route_positions[self.route_index[i] + 1]
+                self.moving[i] = True
+
+        idx = np.flatnonzero(ground & self.moving)
+        if idx.size:
+            pos = self.pos[idx]
+            target = self.target[idx]
+            delta = target - pos
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            step = self.ground_speed[idx] * dt
+            arrive = step >= dist
+            ratio = np.divide(step, dist, out=np.ones_like(dist), where=dist > 0)
+            pos = np.where(arrive[:, None], target, pos + delta * ratio[:, None])
+            self.pos[idx] = pos
+            remain = target - pos
+            reached = np.hypot(remain[:, 0], remain[:, 1]) < 0.5
+            for i in idx[reached]:
+                plane = planes[i]
+                plane.advance_ground_node(plane.ground_vertiport(), current_time)
+                self.moving[i] = False
+
+        # 3) 공중: 진행률 일괄 갱신, 구간이 바뀌거나 도착한 비행체만 개별 처리
+        idx = np.flatnonzero(air)
+        if idx.size:
+            total = self.air_total[idx]
+            inc = np.divide(self.air_speed[idx] * dt, total,
+                            out=np.full_like(total, np.inf), where=total > 0)
+            progress = self.air_progress[idx] + inc
+            arrived = progress >= 1.0
+            progress[arrived] = 1.0
+            self.air_progress[idx] = progress
+            flown = progress * total
+
+            flying = ~arrived
+            crossed = flying & (flown > self.leg_s1[idx])
+            for i, dist in zip(idx[crossed], flown[crossed]):
+                planes[i].advance_air_leg(dist)
+                self.load_air_leg(i)
+
+            fi = idx[flying]
+            s0 = self.leg_s0[fi]
+            seg = self.leg_s1[fi] - s0
+            ratio = np.divide(flown[flying] - s0, seg, out=np.ones_like(seg), where=seg > 0)
+            a = self.leg_a[fi]
+            self.pos[fi] = a + (self.leg_b[fi] - a) * ratio[:, None]
+            self.alt[fi] = self.leg_za[fi] + (self.leg_zb[fi] - self.leg_za[fi]) * ratio
+
+            for i in idx[arrived]:
+                plane = planes[i]
+                self.pos[i] = plane.in_air_route[-1]
+                self.alt[i] = plane.in_air_altitudes[-1]
+                plane.arrive_at_dest(current_time)
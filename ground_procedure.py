@@ -0,0 +1,243 @@
+from timer_wheel import TimerWheel
+
+# ----------------------------------------------------------------------
+# 상태 코드 (지상절차.py의 상태 문자열 → 정수). 이름은 로그/요약 출력에만 사용
+# ----------------------------------------------------------------------
+STATE_NAMES = (
+    "outbound 비행 중",
+    "착륙 완료",
+    "시동 종료 및 견인 장비 연결 중",
+    "시동 종료 및 견인 장비 연결 완료",
+    "착륙 Que로 이동 중",
+    "최종 Que 도착",
+    "Gate 대기 중",
+    "Gate로 이동 준비 완료",
+    "Gate 도착",
+    "승객 하차 및 지상 조업 중",
+    "출발 준비 완료",
+    "Take_off Que로 이동 중",
+    "이륙 Que 대기중",
+    "FATO_Takeoff로 이동 중",
+    "시동 모드",
+    "시동 중",
+    "이륙 준비 완료",
+    "운항 종료",
+)
+(IN_FLIGHT, LANDED, SHUTTING_DOWN, SHUTDOWN_DONE, TO_LANDING_QUEUE, FINAL_QUEUE, GATE_WAIT,
+ TO_GATE, AT_GATE, GROUND_HANDLING, READY, TO_TAKEOFF_QUEUE, TAKEOFF_QUEUE, TO_FATO,
+ STARTUP_MODE, STARTING, TAKEOFF_READY, DONE) = range(len(STATE_NAMES))
+
+# 이벤트 코드 (UAMPlane의 전이 지점, 타이머 만료, 진입 처리기가 내는 자동 전이)
+EVENT_NAMES = (
+    "자동",                # 진입 처리기가 바로 다음 상태로 넘길 때
+    "타이머 만료",
+    "착륙",                # arrive_at_dest
+    "최종 착륙 Que 도착",   # 노드 도착 (vertiport.landing_queue[-1])
+    "Gate 확보",
+    "Gate 없음",
+    "Gate 도착",           # finish_landing (다음 운항 있음)
+    "운항 종료",           # finish_landing (마지막 운항)
+    "출발",                # update_at_gate
+    "최종 이륙 Que 도착",   # 노드 도착 (vertiport.takeoff_queue[-1])
+    "FATO_Takeoff 확보",   # 다음 노드 FATO_Takeoff 예약
+    "이륙 지점 도착",       # 이륙 지상 경로 끝 (begin_flight 직전)
+)
+(AUTO, TIMER, LAND, LANDING_QUEUE_END, GATE_FREE, GATE_BUSY, GATE_ARRIVE, FINISH, DEPART,
+ TAKEOFF_QUEUE_END, FATO_CLEAR, TAKEOFF_POINT) = range(len(EVENT_NAMES))
+
+# 전이표 (상태, 이벤트) → 다음 상태. 표에 없는 조합은 무시 (상태 유지)
+TRANSITIONS = (
+    (IN_FLIGHT, LAND, LANDED),
+    (LANDED, AUTO, SHUTTING_DOWN),
+    (SHUTTING_DOWN, TIMER, SHUTDOWN_DONE),
+    (SHUTDOWN_DONE, AUTO, TO_LANDING_QUEUE),
+    (TO_LANDING_QUEUE, LANDING_QUEUE_END, FINAL_QUEUE),
+    (FINAL_QUEUE, GATE_FREE, TO_GATE),
+    (FINAL_QUEUE, GATE_BUSY, GATE_WAIT),
+    (GATE_WAIT, GATE_FREE, TO_GATE),
+    (TO_GATE, GATE_ARRIVE, AT_GATE),
+    (TO_GATE, FINISH, DONE),
+    # Que 노드를 거치지 않는 경로 (교착 해소 우회 등)
+    (TO_LANDING_QUEUE, GATE_ARRIVE, AT_GATE),
+    (TO_LANDING_QUEUE, FINISH, DONE),
+    (AT_GATE, AUTO, GROUND_HANDLING),
+    (GROUND_HANDLING, TIMER, READY),
+    (READY, DEPART, TO_TAKEOFF_QUEUE),
+    (TO_TAKEOFF_QUEUE, TAKEOFF_QUEUE_END, TAKEOFF_QUEUE),
+    (TAKEOFF_QUEUE, FATO_CLEAR, TO_FATO),
+    (TO_TAKEOFF_QUEUE, FATO_CLEAR, TO_FATO),
+    (TO_FATO, TAKEOFF_POINT, STARTUP_MODE),
+    (TO_TAKEOFF_QUEUE, TAKEOFF_POINT, STARTUP_MODE),
+    (TAKEOFF_QUEUE, TAKEOFF_POINT, STARTUP_MODE),
+    (STARTUP_MODE, AUTO, STARTING),
+    (STARTING, TIMER, TAKEOFF_READY),
+    (TAKEOFF_READY, TAKEOFF_POINT, IN_FLIGHT),
+)
+
+# 상태별 진입 처리기 (GroundProcedure 메서드 이름, None이면 처리 없음)
+ENTER_HANDLERS = {
+    LANDED: "_auto",
+    SHUTTING_DOWN: "_enter_shutdown",
+    SHUTDOWN_DONE: "_auto",
+    FINAL_QUEUE: "_enter_final_queue",
+    AT_GATE: "_auto",
+    GROUND_HANDLING: "_enter_ground_handling",
+    STARTUP_MODE: "_auto",
+    STARTING: "_enter_starting",
+}
+
+# UAMPlane.state → 절차 시작 상태 (attach 시점의 상태로 맞춤)
+INITIAL_STATES = {
+    "at_gate": READY,
+    "takeoff_ground": TO_TAKEOFF_QUEUE,
+    "in_air": IN_FLIGHT,
+    "landing_ground": TO_LANDING_QUEUE,
+    "done": DONE,
+}
+
+
+def compile_table(transitions=TRANSITIONS):
+    """전이표를 state * len(EVENT_NAMES) + event로 찾는 1차원 리스트로 (-1: 전이 없음)"""
+    n_events = len(EVENT_NAMES)
+    table = [-1] * (len(STATE_NAMES) * n_events)
+    for state, event, next_state in transitions:
+        key = state * n_events + event
+        if table[key] != -1:
+            raise ValueError(f"중복 전이: {STATE_NAMES[state]} / {EVENT_NAMES[event]}")
+        table[key] = next_state
+    return table
+
+
+class GroundProcedure:
+    """
+    지상절차.py의 착륙 후 ~ 이륙 전 절차를 정수 상태 코드 + 전이표 + 상태별 진입 처리기로 진행한다.
+    - UAMPlane은 기존 전이 지점(착륙, 노드 도착, Gate 도착, 출발, 이륙 지점 도착)에서 이벤트만 전달하고,
+      현재 절차 상태는 plane.procedure_state(정수)에 둔다. 매 tick 상태 문자열을 비교하지 않는다.
+    - 시간이 걸리는 절차(시동 종료 및 견인 장비 연결, 지상 조업, 시동)는 계층형 타이머 휠에 만료 시각을 등록하고
+      그동안 비행체를 waiting으로 둔다. 세 엔진 모드 모두 waiting인 비행체는 건너뛰므로,
+      만료 시 타이머가 resource_ready로 깨울 때까지 비용이 들지 않는다.
+    shutdown_time: 착륙 후 시동 종료 및 견인 장비 연결 시간 (초, FATO_Landing에서 대기)
+    startup_time: 이륙 지점(FATO_Takeoff) 도착 후 시동 시간 (초)
+    지상 조업은 Gate 도착부터 다음 출발 시각(departure_time = 도착 + turnaround_time)까지.
+    on_transition: (plane, time, 이전 상태, 새 상태)를 받는 함수 (로그/시각화용, None이면 호출 안 함)
+    """
+
+    def __init__(self, shutdown_time=60.0, startup_time=60.0, resolution=1.0, start_time=0.0):
+        self.shutdown_time = shutdown_time
+        self.startup_time = startup_time
+        self.timers = TimerWheel(resolution=resolution, start_time=start_time)
+        self.table = compile_table()
+        self.n_events = len(EVENT_NAMES)
+        self.enter = [None] * len(STATE_NAMES)
+        for state, name in ENTER_HANDLERS.items():
+            self.enter[state] = getattr(self, name)
+        self.planes = []
+        self.pending = {}          # plane -> 타이머 handle
+        self.arrival_events = {}   # vertiport -> {노드: 이벤트}
+        self.on_transition = None
+        self.transitions = 0
+        self._held_until = None
+
+    def attach(self, planes):
+        for plane in planes:
+            plane.procedure = self
+            plane.procedure_state = INITIAL_STATES[plane.state]
+            self.planes.append(plane)
+        return self
+
+    # ------------------------------------------------------------------
+    # 이벤트 처리 (UAMPlane이 호출)
+    # ------------------------------------------------------------------
+    def fire(self, plane, event, time):
+        """
+        plane에 event 전달. 진입 처리기가 자동 이벤트를 내면 이어서 전이한다.
+        시간 절차에 들어가면 끝나는 시각 반환 (plane은 waiting, 타이머가 깨움), 아니면 None
+        """
+        table = self.table
+        n_events = self.n_events
+        state = plane.procedure_state
+        self._held_until = None
+        while event is not None:
+            next_state = table[state * n_events + event]
+            if next_state < 0:
+                break
+            self.transitions += 1
+            if self.on_transition is not None:
+                self.on_transition(plane, time, state, next_state)
+            state = plane.procedure_state = next_state
+            handler = self.enter[state]
+            event = handler(plane, time) if handler is not None else None
+        return self._held_until
+
+    def node_event(self, plane, vp, node, time):
+        """지상 노드 도착: 최종 착륙/이륙 Que 노드면 해당 이벤트 전달"""
+        events = self.arrival_events.get(vp)
+        if events is None:
+            events = self.arrival_events[vp] = self._compile_nodes(vp)
+        event = events.get(node)
+        if event is not None:
+            self.fire(plane, event, time)
+
+    def _compile_nodes(self, vp):
+        events = {}
+        if vp.landing_queue:
+            events[vp.landing_queue[-1]] = LANDING_QUEUE_END
+        if vp.takeoff_queue:
+            events[vp.takeoff_queue[-1]] = TAKEOFF_QUEUE_END
+        return events
+
+    # ------------------------------------------------------------------
+    # 진입 처리기 (다음 이벤트 또는 None 반환)
+    # ------------------------------------------------------------------
+    def _auto(self, plane, time):
+        return AUTO
+
+    def _enter_shutdown(self, plane, time):
+        return self._hold(plane, time + self.shutdown_time, time)
+
+    def _enter_final_queue(self, plane, time):
+        return GATE_FREE if plane.gate_assigned is not None else GATE_BUSY
+
+    def _enter_ground_handling(self, plane, time):
+        return self._hold(plane, plane.departure_time, time)
+
+    def _enter_starting(self, plane, time):
+        return self._hold(plane, time + self.startup_time, time)
+
+    # ------------------------------------------------------------------
+    # 타이머
+    # ------------------------------------------------------------------
+    def _hold(self, plane, until, time):
+        """until까지 plane을 대기시키고 타이머 등록. 이미 지난 시각이면 바로 타이머 만료 이벤트"""
+        if until <= time:
+            return TIMER
+        plane.waiting = True
+        self.pending[plane] = self.timers.schedule(until, self._expire, plane)
+        self._held_until = until
+        return None
+
+    def _expire(self, plane, due):
+        del self.pending[plane]
+        self.fire(plane, TIMER, due)
+        if plane not in self.pending:
+            plane.resource_ready(plane.current_vp)
+
+    def advance_to(self, time):
+        """time까지 만료된 절차 타이머 처리 (엔진이 매 tick / 이벤트 시각마다 호출)"""
+        self.timers.advance_to(time)
+
+    def next_time(self):
+        return self.timers.next_expiry()
+
+    # ------------------------------------------------------------------
+    # 요약
+    # ------------------------------------------------------------------
+    def state_name(self, plane):
+        return STATE_NAMES[plane.procedure_state]
+
+    def summary(self):
+        counts = {}
+        for plane in self.planes:
+            name = STATE_NAMES[plane.procedure_state]
+            counts[name] = counts.get(name, 0) + 1
+        return {"states": counts, "transitions": self.transitions, "timers": len(self.timers)}
@@ -0,0 +1,56 @@
+from dijkstra import dijkstra
+
+
+class GroundRouteTable:
+    """
+    하나의 ground layout(nodes, links)에 대한 경로 테이블.
+    layout은 고정이므로 (start, goal) 경로는 한 번만 계산해 모든 vertiport가 공유한다.
+    - precompute(): Gate ↔ FATO 경로를 미리 계산
+    - route(): 캐시된 경로 반환 (없으면 계산 후 캐시)
+    - blocked 노드가 경로에 걸리면 캐시를 쓰지 않고 동적으로 다시 탐색
+    """
+
+    def __init__(self, nodes, links):
+        self.nodes = nodes
+        self.links = links
+        self.routes = {}   # (start, goal) -> [node, ...]
+
+    def precompute(self, gates, fatos=("FATO_Takeoff", "FATO_Landing")):
+        for gate in gates:
+            for fato in fatos:
+                self.route(gate, fato)
+                self.route(fato, gate)
+        return self
+
+    def route(self, start, goal, blocked=None):
+        """start → goal 노드 리스트. blocked: 지나갈 수 없는 노드 집합 (start/goal 제외)"""
+        key = (start, goal)
+        path = self.routes.get(key)
+        if path is None:
+            path = dijkstra(self.nodes, self.links, start, goal)
+            self.routes[key] = path
+        if blocked and any(node in blocked for node in path[1:-1]):
+            return self.search(start, goal, blocked)
+        return path
+
+    def search(self, start, goal, blocked):
+        """blocked 노드를 제외한 그래프에서 동적 탐색 (캐시하지 않음)"""
+        links = {
+            node: [nb for nb in neighbors if nb not in blocked or nb in (start, goal)]
+            for node, neighbors in self.links.items()
+            if node not in blocked or node in (start, goal)
+        }
+        return dijkstra(self.nodes, links, start, goal)
+
+
+# layout(nodes, links 객체) 별로 하나의 테이블만 유지
+_tables = {}
+
+
+def route_table_for(nodes, links, gates=()):
+    key = (id(nodes), id(links))
+    table = _tables.get(key)
+    if table is None:
+        table = GroundRouteTable(nodes, links).precompute(gates)
+        _tables[key] = table
+    return table
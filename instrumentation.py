@@ -0,0 +1,217 @@
+import csv
+import math
+import time
+
+import dijkstra as dijkstra_module
+
+
+class Histogram:
+    """
+    로그 버킷 히스토그램 (한 옥타브(2배)를 buckets_per_octave개로 나눔).
+    샘플을 저장하지 않으므로 tick 수와 관계없이 메모리 일정, 백분위수 상대 오차 ~ 2^(1/buckets_per_octave)
+    """
+
+    def __init__(self, buckets_per_octave=8, unit=1e-6):
+        self.scale = buckets_per_octave
+        self.unit = unit          # 이 값 이하는 모두 첫 버킷 (기본 1 μs)
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        bucket = int(math.log2(value / self.unit) * self.scale) if value > self.unit else 0
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+
+    def percentile(self, p):
+        """p(0~100) 백분위수 근사값 (버킷 상한, 관측 최대값으로 제한)"""
+        if not self.count:
+            return math.nan
+        rank = p / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.unit * 2 ** ((bucket + 1) / self.scale), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def summary(self):
+        return {"count": self.count, "mean": self.mean, "p50": self.percentile(50),
+                "p99": self.percentile(99), "min": self.min if self.count else math.nan, "max": self.max}
+
+
+class MemorySink:
+    """tick 기록을 리스트에 보관"""
+
+    def __init__(self):
+        self.rows = []
+        self.final = None
+
+    def emit(self, row):
+        self.rows.append(row)
+
+    def close(self, summary):
+        self.final = summary
+
+
+class CSVSink:
+    """tick 기록을 CSV 파일로 (every tick마다 1행)"""
+
+    FIELDS = ("tick", "simulation_time", "wall_time", "dijkstra_calls", "gate_polls")
+
+    def __init__(self, path, every=1):
+        self.every = every
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.FIELDS)
+
+    def emit(self, row):
+        if row["tick"] % self.every == 0:
+            self._writer.writerow([row[f] for f in self.FIELDS])
+
+    def close(self, summary):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CallbackSink:
+    """tick마다 on_tick(row), 종료 시 on_close(summary) 호출"""
+
+    def __init__(self, on_tick, on_close=None):
+        self.on_tick = on_tick
+        self.on_close = on_close
+
+    def emit(self, row):
+        self.on_tick(row)
+
+    def close(self, summary):
+        if self.on_close is not None:
+            self.on_close(summary)
+
+
+class Instrumentation:
+    """
+    SimulationEngine 계측.
+    - tick wall time 히스토그램 (p50/p99)
+    - object 모드: UAMPlane 상태별 update 시간/호출 수 (vectorized/event 모드는 모드 이름으로 tick 전체)
+    - Dijkstra 호출 수/지연 (dijkstra 모듈 observer)
+    - Vertiport.request_gate 호출(gate poll) 수와 실패 수
+    엔진/vertiport/dijkstra에는 속성 하나(None 여부)만 확인하는 hook만 있으므로, 붙이지 않으면 비용이 거의 없다.
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        self.ticks = Histogram()
+        self.state_time = {}
+        self.state_calls = {}
+        self.dijkstra = Histogram()
+        self.gate_polls = 0
+        self.gate_misses = 0
+        self.tick_count = 0
+        self._vertiports = []
+        self._engine = None
+
+    # ------------------------------------------------------------------
+    # 연결
+    # ------------------------------------------------------------------
+    def attach(self, engine):
+        self._engine = engine
+        engine.instrumentation = self
+        self._vertiports = list(dict.fromkeys(
+            vp for p in engine.planes for vp in [p.flight_origin, p.flight_dest] + p.flight_plan))
+        for vp in self._vertiports:
+            vp.instrumentation = self
+        dijkstra_module.set_observer(self.on_dijkstra)
+        return self
+
+    def detach(self):
+        if self._engine is not None:
+            self._engine.instrumentation = None
+            self._engine = None
+        for vp in self._vertiports:
+            if vp.instrumentation is self:
+                vp.instrumentation = None
+        self._vertiports = []
+        if dijkstra_module.get_observer() == self.on_dijkstra:
+            dijkstra_module.set_observer(None)
+
+    def close(self):
+        self.detach()
+        summary = self.summary()
+        for sink in self.sinks:
+            sink.close(summary)
+        return summary
+
+    # ------------------------------------------------------------------
+    # hook
+    # ------------------------------------------------------------------
+    def update_planes(self, planes, dt, current_time):
+        """object 모드 tick: 비행체마다 상태별로 update 시간을 잰다"""
+        clock = time.perf_counter
+        state_time, state_calls = self.state_time, self.state_calls
+        for plane in planes:
+            state = plane.state
+            if state == "done":
+                continue
+            t0 = clock()
+            plane.update(dt, current_time)
+            elapsed = clock() - t0
+            state_time[state] = state_time.get(state, 0.0) + elapsed
+            state_calls[state] = state_calls.get(state, 0) + 1
+
+    def end_tick(self, engine, wall_time):
+        self.tick_count += 1
+        self.ticks.add(wall_time)
+        if engine.mode != "object":
+            self.state_time[engine.mode] = self.state_time.get(engine.mode, 0.0) + wall_time
+            self.state_calls[engine.mode] = self.state_calls.get(engine.mode, 0) + 1
+        if self.sinks:
+            row = {"tick": self.tick_count, "simulation_time": engine.simulation_time,
+                   "wall_time": wall_time, "dijkstra_calls": self.dijkstra.count,
+                   "gate_polls": self.gate_polls}
+            for sink in self.sinks:
+                sink.emit(row)
+
+    def on_dijkstra(self, name, elapsed):
+        self.dijkstra.add(elapsed)
+
+    def on_gate_poll(self, granted):
+        self.gate_polls += 1
+        if not granted:
+            self.gate_misses += 1
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+    def summary(self):
+        return {
+            "ticks": self.ticks.summary(),
+            "state_time": dict(self.state_time),
+            "state_calls": dict(self.state_calls),
+            "dijkstra": self.dijkstra.summary(),
+            "gate_polls": self.gate_polls,
+            "gate_misses": self.gate_misses,
+        }
+
+    def format_summary(self):
+        s = self.summary()
+        ticks, dj = s["ticks"], s["dijkstra"]
+        lines = [f"tick {ticks['count']}회: p50 {ticks['p50']*1e3:.3f} ms, p99 {ticks['p99']*1e3:.3f} ms, "
+                 f"최대 {ticks['max']*1e3:.3f} ms",
+                 f"dijkstra {dj['count']}회" + (f", 평균 {dj['mean']*1e3:.3f} ms" if dj["count"] else ""),
+                 f"gate poll {s['gate_polls']}회 (실패 {s['gate_misses']})"]
+        for state, total in sorted(s["state_time"].items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {state:>16}: {total:.3f} s ({s['state_calls'][state]}회)")
+        return "\n".join(lines)
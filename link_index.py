@@ -0,0 +1,108 @@
+import math
+
+
+class LinkGridIndex:
+    """
+    경로 링크(선분)의 균일 격자 공간 인덱스.
+    링크는 선분이 지나가는 격자 셀마다 등록하고, 교차 후보 조회는 질의 선분이 지나가는 셀의 링크만 모은다.
+    링크 키: (route_idx, n1, n2)  - n1, n2는 route["links"]에 저장된 (x, y) 튜플 그대로
+    """
+
+    def __init__(self, cell_size=1000.0):
+        self.cell = cell_size
+        self.cells = {}        # (ix, iy) -> set(링크 키)
+        self.link_cells = {}   # 링크 키 -> [(ix, iy), ...]
+
+    def __len__(self):
+        return len(self.link_cells)
+
+    def clear(self):
+        self.cells.clear()
+        self.link_cells.clear()
+
+    def rebuild(self, routes):
+        """routes(designer 전역 routes 구조) 전체로 다시 구성"""
+        self.clear()
+        for r_idx, route in enumerate(routes):
+            for n1, n2 in route["links"]:
+                self.insert(r_idx, n1, n2)
+
+    def insert(self, route_idx, n1, n2):
+        key = (route_idx, n1, n2)
+        if key in self.link_cells:
+            return
+        cells = self.segment_cells(n1[0], n1[1], n2[0], n2[1])
+        self.link_cells[key] = cells
+        for c in cells:
+            self.cells.setdefault(c, set()).add(key)
+
+    def remove(self, route_idx, n1, n2):
+        key = (route_idx, n1, n2)
+        for c in self.link_cells.pop(key, ()):
+            members = self.cells.get(c)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self.cells[c]
+
+    def query(self, x1, y1, x2, y2):
+        """선분 (x1,y1)-(x2,y2)와 같은 셀을 지나는 링크 키 집합 (교차 후보)"""
+        found = set()
+        cells = self.cells
+        for c in self.segment_cells(x1, y1, x2, y2):
+            members = cells.get(c)
+            if members:
+                found |= members
+        return found
+
+    def query_rect(self, x0, y0, x1, y1):
+        """사각형 (x0,y0)-(x1,y1)과 겹치는 셀을 지나는 링크 키 집합 (화면 영역 후보)"""
+        found = set()
+        for members in rect_cells(self.cells, self.cell, x0, y0, x1, y1):
+            found |= members
+        return found
+
+    def segment_cells(self, x1, y1, x2, y2):
+        """선분이 지나가는 셀 목록 (열마다 선분의 y 범위를 구해 해당 행들을 포함)"""
+        c = self.cell
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        eps = c * 1e-9   # 셀 경계 위 교차점이 부동소수 오차로 빠지지 않도록
+        floor = math.floor
+        ix0, ix1 = floor(x1 / c), floor(x2 / c)
+        dx = x2 - x1
+        cells = []
+        for ix in range(ix0, ix1 + 1):
+            if dx == 0:
+                ya, yb = y1, y2
+            else:
+                xa = max(x1, ix * c)
+                xb = min(x2, (ix + 1) * c)
+                ya = y1 + (xa - x1) * (y2 - y1) / dx
+                yb = y1 + (xb - x1) * (y2 - y1) / dx
+            lo, hi = (ya, yb) if ya <= yb else (yb, ya)
+            for iy in range(floor((lo - eps) / c), floor((hi + eps) / c) + 1):
+                cells.append((ix, iy))
+        return cells
+
+
+def rect_cells(cells, size, x0, y0, x1, y1):
+    """
+    격자 dict cells((ix, iy) -> 멤버)에서 사각형과 겹치는 셀의 멤버들.
+    사각형 안의 셀 수와 비어 있지 않은 셀 수 중 작은 쪽만 훑는다 (줌 아웃해도 데이터 크기 이상 돌지 않음)
+    """
+    floor = math.floor
+    ix0, ix1 = floor(x0 / size), floor(x1 / size)
+    iy0, iy1 = floor(y0 / size), floor(y1 / size)
+    if ix1 < ix0 or iy1 < iy0:
+        return
+    if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) <= len(cells):
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                members = cells.get((ix, iy))
+                if members:
+                    yield members
+    else:
+        for (ix, iy), members in cells.items():
+            if ix0 <= ix <= ix1 and iy0 <= iy <= iy1 and members:
+                yield members
@@ -0,0 +1,173 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulation import create_simulation
+from simulation_engine import SimulationEngine
+from fleet_arrays import AT_GATE, TAKEOFF_GROUND, IN_AIR, LANDING_GROUND, DONE
+from deadlock import DeadlockDetector
+
+# 시나리오별로 집계하는 KPI
+# completion_time은 until까지 끝나지 않은 시나리오를 until로 기록 (우측 중도절단, 실제 값의 하한)
+KPI_NAMES = ("completion_time", "completed_ratio", "mean_gate_wait", "mean_taxi_time", "wall_time")
+
+
+def make_scenarios(n, seed=0, fleet_sizes=(2, 3, 4, 5, 6), departure_spacing=60.0,
+                   departure_jitter=30.0, turnaround=(120.0, 240.0), until=4 * 3600.0,
+                   time_step=0.5, deadlock="reroute", taxi_planner=False):
+    """
+    n개의 시나리오 변형(dict) 생성.
+    - fleet_per_vertiport: fleet_sizes 중 하나
+    - departure_jitter: 초기 출발 시각(i*departure_spacing)에 더하는 균등 난수 폭 (±)
+    - turnaround: (최소, 최대) 착륙 후 대기 시간 범위
+    - deadlock: 지상 교착 해소 정책 (run_headless와 같음, None이면 사용 안 함)
+    - taxi_planner: True면 각 vertiport의 지상 이동을 TaxiPlanner로 계획
+    - seed: 각 시나리오의 난수 시드는 seed + 시나리오 번호
+    """
+    rng = random.Random(seed)
+    scenarios = []
+    for k in range(n):
+        scenarios.append({
+            "scenario": k,
+            "seed": seed + k,
+            "fleet_per_vertiport": rng.choice(fleet_sizes),
+            "departure_spacing": departure_spacing,
+            "departure_jitter": departure_jitter,
+            "turnaround": rng.uniform(*turnaround),
+            "until": until,
+            "time_step": time_step,
+            "deadlock": deadlock,
+            "taxi_planner": taxi_planner,
+        })
+    return scenarios
+
+
+def build_scenario(params):
+    """simulation.create_simulation 시나리오(4개 버티포트)에 시나리오 파라미터 적용"""
+    planes, vertiports = create_simulation(
+        taxi_planner=bool(params.get("taxi_planner")),
+        fleet_per_vertiport=params["fleet_per_vertiport"],
+        departure_spacing=params["departure_spacing"],
+        departure_jitter=params["departure_jitter"],
+        turnaround_time=params["turnaround"],
+        seed=params["seed"],
+    )
+    deadlock = params.get("deadlock")
+    if deadlock is not None:
+        DeadlockDetector(policy=None if deadlock == "detect" else deadlock).attach(vertiports)
+    return planes, vertiports
+
+
+def run_scenario(params):
+    """시나리오 1개 실행 (프로세스 풀 작업 단위). KPI dict 반환"""
+    wall_start = time.perf_counter()
+    planes, _ = build_scenario(params)
+    engine = SimulationEngine(planes, time_step=params["time_step"], mode="vectorized")
+    fleet = engine.fleet
+    dt = engine.time_step * engine.acceleration
+    gate_wait = np.zeros(len(planes))
+    taxi_time = np.zeros(len(planes))
+
+    finished = False
+    while engine.simulation_time < params["until"]:
+        state = fleet.state
+        if (state == DONE).all():
+            finished = True
+            break
+        # 이번 tick 동안의 상태별 체류 시간 누적 (배열 연산)
+        gate_wait += dt * (fleet.waiting & ((state == AT_GATE) | (state == IN_AIR)))
+        taxi_time += dt * ((state == TAKEOFF_GROUND) | (state == LANDING_GROUND))
+        engine.update()
+
+    return {
+        "scenario": params["scenario"],
+        "seed": params["seed"],
+        "fleet_size": len(planes),
+        # 끝나지 않았으면 until (중도절단). finished로 구분
+        "completion_time": engine.simulation_time if finished else float(params["until"]),
+        "finished": finished,
+        "completed_ratio": float((fleet.state == DONE).mean()),
+        "mean_gate_wait": float(gate_wait.mean()),
+        "mean_taxi_time": float(taxi_time.mean()),
+        "wall_time": time.perf_counter() - wall_start,
+    }
+
+
+def confidence_interval(values, z=1.96):
+    """평균과 정규 근사 신뢰구간 (nan 값 제외). 반환: (평균, 하한, 상한, 표본 수)"""
+    arr = np.asarray([v for v in values if not math.isnan(v)], dtype=float)
+    if arr.size == 0:
+        return (math.nan, math.nan, math.nan, 0)
+    mean = float(arr.mean())
+    if arr.size < 2:
+        return (mean, mean, mean, 1)
+    half = z * float(arr.std(ddof=1)) / math.sqrt(arr.size)
+    return (mean, mean - half, mean + half, int(arr.size))
+
+
+def aggregate(results, z=1.96):
+    """
+    시나리오 결과 리스트 → KPI별 {mean, low, high, n}.
+    until까지 끝나지 않은 시나리오 수는 "unfinished"에 (completion_time은 until로 포함되어 하한이 됨)
+    """
+    summary = {}
+    for name in KPI_NAMES:
+        mean, low, high, count = confidence_interval([r[name] for r in results], z=z)
+        summary[name] = {"mean": mean, "low": low, "high": high, "n": count}
+    summary["unfinished"] = sum(not r["finished"] for r in results)
+    return summary
+
+
+def run_batch(scenarios, workers=None, chunksize=1):
+    """
+    시나리오들을 프로세스 풀에서 병렬 실행.
+    workers: 프로세스 수 (None이면 os.cpu_count()), 1이면 현재 프로세스에서 순차 실행
+    반환: (시나리오별 결과 리스트, aggregate 요약)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        results = [run_scenario(p) for p in scenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_scenario, scenarios, chunksize=chunksize))
+    return results, aggregate(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UAM 시나리오 Monte Carlo 배치 실행")
+    parser.add_argument("-n", "--scenarios", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--until", type=float, default=4 * 3600.0, help="시나리오별 종료 시각(초)")
+    parser.add_argument("--time-step", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=30.0, help="출발 시각 난수 폭(초)")
+    parser.add_argument("--deadlock", choices=("none", "detect", "reroute", "backoff"), default="reroute",
+                        help="지상 교착 탐지/해소 정책")
+    parser.add_argument("--taxi-planner", action="store_true",
+                        help="시공간 예약 기반 지상 경로 계획 사용")
+    args = parser.parse_args(argv)
+
+    scenarios = make_scenarios(args.scenarios, seed=args.seed, departure_jitter=args.jitter,
+                               until=args.until, time_step=args.time_step,
+                               deadlock=None if args.deadlock == "none" else args.deadlock,
+                               taxi_planner=args.taxi_planner)
+    wall_start = time.perf_counter()
+    results, summary = run_batch(scenarios, workers=args.workers)
+    print(f"시나리오 {len(results)}개, 실제 {time.perf_counter() - wall_start:.1f} 초")
+    for name in KPI_NAMES:
+        s = summary[name]
+        print(f"{name:>16}: {s['mean']:.2f}  95% CI [{s['low']:.2f}, {s['high']:.2f}]  (n={s['n']})")
+    if summary["unfinished"]:
+        print(f"미완료 시나리오 {summary['unfinished']}/{len(results)}개 "
+              f"(completion_time은 until={args.until:.0f} 초로 포함, 실제 값의 하한)")
+    return results, summary
+
+
+if __name__ == "__main__":
+    main()
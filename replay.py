@@ -0,0 +1,231 @@
+import argparse
+import math
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+from matplotlib.widgets import Slider
+
+from trajectory_recorder import open_trajectory
+from fleet_arrays import IN_AIR, LANDING_GROUND, DONE
+
+COLORS = ['blue','red','green','orange','purple','brown',
+          'cyan','magenta','yellow','black','lime','pink',
+          'teal','lavender','turquoise','gold']
+
+
+class TrajectoryReplay:
+    """
+    TrajectoryRecorder 파일을 메모리 매핑해서 임의 시각의 스냅샷을 꺼낸다.
+    기록은 시각 순으로 쌓이므로 시각이 바뀌는 행 위치만 인덱스로 둔다. 메타데이터의 "frames"를 쓰고,
+    없으면(이전 기록 파일) time 열을 chunk_rows 행씩 순차로 읽어 만든다 (RAM은 프레임 수 + chunk에만 비례).
+    조회는 np.searchsorted 이분 탐색 + 해당 구간 슬라이스만 읽는다.
+    """
+
+    def __init__(self, path, chunk_rows=1 << 20):
+        self.records, self.meta = open_trajectory(path)
+        frames = self.meta.get("frames")
+        if frames is not None:
+            self.frame_times = np.asarray(frames["times"], dtype=float)
+            starts = np.asarray(frames["starts"], dtype=np.int64)
+        else:
+            self.frame_times, starts = self._index_frames(chunk_rows)
+        self.frame_starts = np.append(starts, len(self.records))
+
+    def _index_frames(self, chunk_rows):
+        """time 열을 chunk_rows 행씩 읽어 (프레임 시각, 시작 행) 배열"""
+        times = self.records["time"]
+        frame_times, frame_starts = [], []
+        prev = None
+        for start in range(0, len(times), chunk_rows):
+            chunk = np.asarray(times[start:start + chunk_rows])
+            change = np.flatnonzero(np.diff(chunk)) + 1
+            if prev is None or chunk[0] != prev:
+                change = np.concatenate(([0], change))
+            frame_times.append(chunk[change])
+            frame_starts.append(change + start)
+            prev = chunk[-1]
+        if not frame_times:
+            return np.empty(0), np.zeros(0, dtype=np.int64)
+        return np.concatenate(frame_times), np.concatenate(frame_starts).astype(np.int64)
+
+    @property
+    def start_time(self):
+        return float(self.frame_times[0]) if len(self.frame_times) else 0.0
+
+    @property
+    def end_time(self):
+        return float(self.frame_times[-1]) if len(self.frame_times) else 0.0
+
+    def frame_index(self, t):
+        """t 이하의 마지막 기록 프레임 번호 (t가 첫 기록 이전이면 0)"""
+        k = int(np.searchsorted(self.frame_times, t, side="right")) - 1
+        return min(max(k, 0), len(self.frame_times) - 1)
+
+    def air_bounds(self, chunk_rows=1 << 20):
+        """
+        공중 비행체 x/y 범위 [xmin, xmax, ymin, ymax] (기록이 없으면 None).
+        메타데이터에 있으면 그대로 쓰고, 없으면(이전 기록 파일) chunk_rows 행씩 메모리 매핑 구간을 읽어 계산
+        """
+        bounds = self.meta.get("air_bounds")
+        if bounds is not None:
+            return bounds
+        records = self.records
+        for start in range(0, len(records), chunk_rows):
+            chunk = records[start:start + chunk_rows]
+            mask = chunk["state"] == IN_AIR
+            if not mask.any():
+                continue
+            x, y = chunk["x"][mask], chunk["y"][mask]
+            part = [float(x.min()), float(x.max()), float(y.min()), float(y.max())]
+            if bounds is not None:
+                part = [min(bounds[0], part[0]), max(bounds[1], part[1]),
+                        min(bounds[2], part[2]), max(bounds[3], part[3])]
+            bounds = part
+        return bounds
+
+    def snapshot(self, t):
+        """시각 t의 기록 행들 (structured array 슬라이스)"""
+        if not len(self.frame_times):
+            return self.records[:0]
+        k = self.frame_index(t)
+        return self.records[self.frame_starts[k]:self.frame_starts[k + 1]]
+
+
+class ReplayViewer:
+    """
+    기록된 궤적을 시뮬레이션 없이 재생.
+    - seek(t): 임의 시각으로 이동, 슬라이더로 탐색
+    - speed: 실제 1초당 진행할 시뮬레이션 초 (음수면 역재생)
+    키: space 일시정지, ←/→ 60초 이동, ↑/↓ 배속 x2 / ÷2, r 역재생 전환
+    """
+
+    def __init__(self, replay, speed=60.0, interval=50):
+        self.replay = replay
+        self.speed = speed
+        self.interval = interval
+        self.paused = False
+        self.current_time = replay.start_time
+        self._last_wall = None
+
+        vps = replay.meta.get("vertiports", [])
+        n_planes = len(replay.meta.get("planes", [])) or (int(replay.records["plane"].max()) + 1
+                                                         if len(replay.records) else 0)
+        self.plane_colors = np.array([COLORS[i % len(COLORS)] for i in range(n_planes)])
+
+        n_panels = len(vps) + 1
+        ncols = math.ceil(math.sqrt(n_panels))
+        nrows = math.ceil(n_panels / ncols)
+        self.fig, axs = plt.subplots(nrows, ncols, figsize=(4*ncols, 4*nrows + 0.5), squeeze=False)
+        axs = axs.ravel()
+        for ax in axs[n_panels:]:
+            ax.axis('off')
+
+        self.ground_scats = []
+        for ax, vp in zip(axs, vps):
+            ax.set_title(vp["name"]+"(Ground)")
+            ox, oy = vp["offset"]
+            ax.set_xlim(-5+ox, 25+ox)
+            ax.set_ylim(-5+oy, 25+oy)
+            self.ground_scats.append(ax.scatter([], [], s=50, zorder=3))
+
+        ax_air = axs[len(vps)]
+        ax_air.set_title("Airspace")
+        bounds = replay.air_bounds()
+        if bounds is not None:
+            xmin, xmax, ymin, ymax = bounds
+            pad = 0.05 * max(xmax - xmin, ymax - ymin, 1.0)
+            ax_air.set_xlim(xmin - pad, xmax + pad)
+            ax_air.set_ylim(ymin - pad, ymax + pad)
+        self.air_scat = ax_air.scatter([], [], s=50, zorder=4)
+        self.title = self.fig.suptitle("")
+
+        slider_ax = self.fig.add_axes([0.15, 0.01, 0.7, 0.02])
+        self.slider = Slider(slider_ax, "t(s)", replay.start_time, max(replay.end_time, replay.start_time + 1e-9),
+                             valinit=self.current_time)
+        self.slider.on_changed(self.seek)
+        self.fig.canvas.mpl_connect("key_press_event", self.on_key)
+
+    # ------------------------------------------------------------------
+    # 재생 제어
+    # ------------------------------------------------------------------
+    def seek(self, t):
+        self.current_time = min(max(float(t), self.replay.start_time), self.replay.end_time)
+        self._last_wall = None
+        self._sync_slider()
+        self.draw(self.current_time)
+
+    def _sync_slider(self):
+        """슬라이더 표시를 현재 시각으로 (on_changed → seek가 다시 불리지 않도록 이벤트 끄고)"""
+        if self.slider.val == self.current_time:
+            return
+        self.slider.eventson = False
+        self.slider.set_val(self.current_time)
+        self.slider.eventson = True
+
+    def on_key(self, event):
+        if event.key == " ":
+            self.paused = not self.paused
+        elif event.key == "right":
+            self.seek(self.current_time + 60)
+        elif event.key == "left":
+            self.seek(self.current_time - 60)
+        elif event.key == "up":
+            self.speed *= 2
+        elif event.key == "down":
+            self.speed /= 2
+        elif event.key == "r":
+            self.speed = -self.speed
+        self._last_wall = None
+
+    def step(self, frame):
+        now = time.perf_counter()
+        if not self.paused and self._last_wall is not None:
+            t = self.current_time + (now - self._last_wall) * self.speed
+            self.current_time = min(max(t, self.replay.start_time), self.replay.end_time)
+            self._sync_slider()
+        self._last_wall = now
+        return self.draw(self.current_time)
+
+    def draw(self, t):
+        rows = self.replay.snapshot(t)
+        state = rows["state"]
+        xy = np.column_stack((rows["x"], rows["y"]))
+        colors = self.plane_colors[rows["plane"]] if len(self.plane_colors) else "blue"
+        on_ground = (state != IN_AIR) & (state != DONE)
+        for k, scat in enumerate(self.ground_scats):
+            mask = on_ground & (rows["vertiport"] == k)
+            scat.set_offsets(xy[mask])
+            if mask.any():
+                scat.set_color(colors[mask])
+        air = state == IN_AIR
+        self.air_scat.set_offsets(xy[air])
+        if air.any():
+            self.air_scat.set_color(colors[air])
+        landing = int((state == LANDING_GROUND).sum())
+        self.title.set_text(f"t = {t:.1f} s  (x{self.speed:g})  공중 {int(air.sum())}, 착륙 지상 {landing}")
+        return self.ground_scats + [self.air_scat, self.title]
+
+    def show(self):
+        self.draw(self.current_time)
+        self.ani = animation.FuncAnimation(self.fig, self.step, interval=self.interval,
+                                           cache_frame_data=False)
+        plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기록된 궤적(.npy) 재생")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=60.0, help="실제 1초당 시뮬레이션 초 (음수: 역재생)")
+    parser.add_argument("--start", type=float, default=None, help="시작 시각(초)")
+    args = parser.parse_args(argv)
+
+    viewer = ReplayViewer(TrajectoryReplay(args.path), speed=args.speed)
+    if args.start is not None:
+        viewer.seek(args.start)
+    viewer.show()
+
+
+if __name__ == "__main__":
+    main()
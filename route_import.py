@@ -0,0 +1,294 @@
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import time
+
+from route_network import route_to_json
+
+# 고도 정보가 없는 입력의 기본 고도 (ft, designer 노드 입력 기본값과 동일)
+DEFAULT_Z = 1000.0
+
+
+# ----------------------------------------------------------------------
+# 입력 파일 → 폴리라인 [(경로 이름 또는 None, [(x, y, z), ...]), ...]
+# 같은 이름의 폴리라인은 하나의 경로로 합쳐진다.
+# ----------------------------------------------------------------------
+def read_json(filename):
+    """
+    다음 두 형식을 읽는다.
+    - {"routes": [{"name": ..., "points": [[x, y, z], ...]}, ...]}
+    - designer 저장 형식 {"routes": [{"name", "nodes": {"x,y": {"z"}}, "links": [...]}]} (링크마다 2점 폴리라인)
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = data.get("routes", []) if isinstance(data, dict) else data
+    polylines = []
+    for r in items:
+        name = r.get("name")
+        if "points" in r:
+            polylines.append((name, [_point(p) for p in r["points"]]))
+            continue
+        z_of = {}
+        for key, nd in r.get("nodes", {}).items():
+            x_str, y_str = key.split(",")
+            z_of[(float(x_str), float(y_str))] = float(nd["z"])
+        for p1, p2 in r.get("links", []):
+            a, b = (float(p1[0]), float(p1[1])), (float(p2[0]), float(p2[1]))
+            polylines.append((name, [(a[0], a[1], z_of.get(a, DEFAULT_Z)),
+                                     (b[0], b[1], z_of.get(b, DEFAULT_Z))]))
+    return polylines
+
+
+def read_csv(filename):
+    """열: route, x, y[, z]. route 값이 같은 연속된 행이 하나의 폴리라인"""
+    polylines = []
+    with open(filename, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        current, points = None, []
+        for row in reader:
+            name = row.get("route") or row.get("name")
+            if points and name != current:
+                polylines.append((current, points))
+                points = []
+            current = name
+            z = row.get("z")
+            points.append((float(row["x"]), float(row["y"]), float(z) if z not in (None, "") else DEFAULT_Z))
+        if points:
+            polylines.append((current, points))
+    return polylines
+
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def read_polylines(filename):
+    """
+    한 줄에 폴리라인 하나. '#'으로 시작하면 주석.
+    - "이름: x y z, x y z, ..."  (이름과 z는 생략 가능)
+    - "LINESTRING [Z] (x y z, x y z, ...)"  (WKT)
+    """
+    polylines = []
+    with open(filename, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name = None
+            body = line
+            if body.upper().startswith("LINESTRING"):
+                body = body[body.index("(") + 1:body.rindex(")")]
+            elif ":" in body:
+                name, body = body.split(":", 1)
+                name = name.strip() or None
+            points = []
+            for chunk in body.split(","):
+                values = [float(v) for v in _NUMBER.findall(chunk)]
+                if len(values) >= 2:
+                    points.append(_point(values))
+            if len(points) >= 2:
+                polylines.append((name, points))
+    return polylines
+
+
+def load_polylines(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".json":
+        return read_json(filename)
+    if ext == ".csv":
+        return read_csv(filename)
+    return read_polylines(filename)
+
+
+def _point(p):
+    return (float(p[0]), float(p[1]), float(p[2]) if len(p) > 2 else DEFAULT_Z)
+
+
+# ----------------------------------------------------------------------
+# 교차점 계산 (x 방향 평면 스윕)
+# ----------------------------------------------------------------------
+def find_crossings(segments, groups, fixed=None, row_size=None):
+    """
+    segments: [(x1, y1, z1, x2, y2, z2), ...]
+    groups: 선분별 경로 id (같은 경로의 선분끼리는 검사하지 않음 - designer 규칙과 동일)
+    fixed: 선분별 True/False. 둘 다 fixed인 쌍은 이미 분할된 기존 링크이므로 건너뜀
+    반환: [(i, j, tI, tJ, x, y, z), ...] - 두 선분 내부(0 < t < 1)에서 교차하고 |zI - zJ| < 1.0 인 쌍
+
+    x 최소/최대 좌표를 이벤트로 정렬해 스윕하면서, 현재 x 구간에 걸친(active) 선분만
+    y 행(row_size 간격) 버킷에 보관한다. 새 선분은 자기 y 범위의 버킷에 있는 active 선분과만 비교하므로
+    검사 쌍 수는 x 구간과 y 행이 모두 겹치는 쌍으로 제한된다 (정렬 O(n log n) + 후보 검사).
+    """
+    n = len(segments)
+    if fixed is None:
+        fixed = [False] * n
+    if row_size is None:
+        spans = [abs(s[4] - s[1]) for s in segments]
+        row_size = max(1.0, sum(spans) / n) if n else 1.0
+    floor = math.floor
+
+    events = []
+    for i, s in enumerate(segments):
+        x_lo, x_hi = (s[0], s[3]) if s[0] <= s[3] else (s[3], s[0])
+        events.append((x_lo, 0, i))   # 같은 x에서는 삽입(0)을 삭제(1)보다 먼저
+        events.append((x_hi, 1, i))
+    events.sort()
+
+    rows_of = {}
+    active = {}        # row -> set(선분 index)
+    crossings = []
+    for _, kind, i in events:
+        if kind == 1:
+            for r in rows_of.pop(i):
+                bucket = active[r]
+                bucket.discard(i)
+                if not bucket:
+                    del active[r]
+            continue
+        x1, y1, z1, x2, y2, z2 = segments[i]
+        lo, hi = (y1, y2) if y1 <= y2 else (y2, y1)
+        rows = range(floor(lo / row_size), floor(hi / row_size) + 1)
+        seen = set()
+        for r in rows:
+            for j in active.get(r, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                if groups[j] == groups[i] or (fixed[i] and fixed[j]):
+                    continue
+                hit = _intersect(segments[i], segments[j])
+                if hit is not None:
+                    crossings.append((i, j) + hit)
+        rows_of[i] = rows
+        for r in rows:
+            active.setdefault(r, set()).add(i)
+    return crossings
+
+
+def _intersect(a, b):
+    """designer line_intersection_2d와 같은 계산 + 내부 교차/고도 규칙. 반환: (tA, tB, x, y, z) 또는 None"""
+    x1, y1, z1, x2, y2, z2 = a
+    x3, y3, z3, x4, y4, z4 = b
+    denom = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
+    if abs(denom) < 1e-12:
+        return None
+    ua = ((x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)) / denom
+    if not 0 < ua < 1:
+        return None
+    ub = ((x2 - x1) * (y1 - y3) - (y2 - y1) * (x1 - x3)) / denom
+    if not 0 < ub < 1:
+        return None
+    zA = z1 + ua * (z2 - z1)
+    zB = z3 + ub * (z4 - z3)
+    if abs(zA - zB) >= 1.0:
+        return None
+    return (ua, ub, x1 + ua * (x2 - x1), y1 + ua * (y2 - y1), (zA + zB) / 2)
+
+
+# ----------------------------------------------------------------------
+# designer routes에 일괄 추가
+# ----------------------------------------------------------------------
+def _new_node(route, x, y, z):
+    if (x, y) not in route["nodes"]:
+        route["node_count"] += 1
+        route["nodes"][(x, y)] = {"z": z, "node_name": f"{route['name']}-Node{route['node_count']}"}
+    return (x, y)
+
+
+def import_polylines(routes, polylines, route_count=None):
+    """
+    polylines를 새 경로로 routes(designer 전역 routes 구조, 제자리 수정)에 추가하고,
+    새 경로끼리 / 새 경로와 기존 경로의 교차점을 한 번의 스윕으로 찾아 링크를 분할한다.
+    route_count: 이름 없는 경로의 번호 시작값 (designer의 route_count, None이면 len(routes))
+    반환: (추가된 경로 수, 교차점 수)
+    """
+    if route_count is None:
+        route_count = len(routes)
+    first_new = len(routes)
+    by_name = {}
+    for name, points in polylines:
+        if name is not None and name in by_name:
+            route = by_name[name]
+        else:
+            route_count += 1
+            route = {"name": name or f"경로{route_count}", "nodes": {}, "links": [],
+                     "node_count": 0, "last_node": None}
+            routes.append(route)
+            if name is not None:
+                by_name[name] = route
+        prev = None
+        for x, y, z in points:
+            node = _new_node(route, x, y, z)
+            if prev is not None and prev != node:
+                route["links"].append((prev, node))
+            prev = node
+        route["last_node"] = prev
+
+    # 모든 링크를 선분으로 (기존 경로 링크는 fixed)
+    segments, groups, fixed, owners = [], [], [], []
+    for r_idx, route in enumerate(routes):
+        nodes = route["nodes"]
+        for link in route["links"]:
+            (x1, y1), (x2, y2) = link
+            segments.append((x1, y1, nodes[link[0]]["z"], x2, y2, nodes[link[1]]["z"]))
+            groups.append(r_idx)
+            fixed.append(r_idx < first_new)
+            owners.append((r_idx, link))
+
+    crossings = find_crossings(segments, groups, fixed)
+
+    # 선분별 분할점 모으기 (교차점 좌표는 두 경로가 같은 (x, y) 키를 공유)
+    splits = {}
+    for i, j, ti, tj, x, y, z in crossings:
+        splits.setdefault(i, []).append((ti, x, y, z))
+        splits.setdefault(j, []).append((tj, x, y, z))
+
+    # 경로별로 분할할 링크를 한 번에 교체
+    replaced = {}
+    for k, points in splits.items():
+        r_idx, link = owners[k]
+        route = routes[r_idx]
+        points.sort()
+        chain = [link[0]]
+        for _, x, y, z in points:
+            node = _new_node(route, x, y, z)
+            if node != chain[-1]:
+                chain.append(node)
+        chain.append(link[1])
+        replaced.setdefault(r_idx, {})[link] = list(zip(chain, chain[1:]))
+    for r_idx, links in replaced.items():
+        route = routes[r_idx]
+        new_links = []
+        for link in route["links"]:
+            new_links.extend(links.get(link, (link,)))
+        route["links"] = new_links
+
+    return len(routes) - first_new, len(crossings)
+
+
+def routes_to_json(routes, vertiports=()):
+    """designer save_data와 같은 JSON 구조(dict)"""
+    return {"routes": [route_to_json(r) for r in routes], "vertiports": list(vertiports)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="경로 폴리라인 일괄 가져오기 → designer JSON")
+    parser.add_argument("inputs", nargs="+", help="JSON / CSV / 폴리라인 텍스트 파일")
+    parser.add_argument("-o", "--output", required=True, help="저장할 designer JSON 경로")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    polylines = []
+    for filename in args.inputs:
+        polylines.extend(load_polylines(filename))
+    routes = []
+    count, crossings = import_polylines(routes, polylines)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(routes_to_json(routes), f, indent=2, ensure_ascii=False)
+    links = sum(len(r["links"]) for r in routes)
+    print(f"경로 {count}개, 교차점 {crossings}개, 링크 {links}개 ({time.perf_counter() - t0:.2f} 초)")
+
+
+if __name__ == "__main__":
+    main()
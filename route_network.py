@@ -0,0 +1,224 @@
+import math
+
+from link_index import rect_cells
+
+# 같은 노드로 보는 좌표 허용 오차 (m). 교차점 계산 등 부동소수 오차로 생긴 거의 같은 좌표를 한 노드로 묶는다.
+NODE_TOLERANCE = 1e-3
+# 화면 영역 조회용 노드 격자 셀 크기 (m)
+BLOCK_SIZE = 1000.0
+
+
+class RouteNetwork:
+    """
+    경로 하나(designer routes 항목)의 노드/링크 인덱스.
+    route["nodes"] ((x, y) -> {"z", "node_name"}) / route["links"] ([((x1, y1), (x2, y2)), ...])는
+    그대로 두고(JSON 스키마, route_import/link_index 호환) 그 위에 다음을 유지한다.
+    - 노드 정수 id: (x, y) <-> id
+    - 인접 인덱스: 노드 id -> 연결된 링크 키 (id_a, id_b) 집합
+    - 링크 위치: 링크 키 -> route["links"] 내 index (삭제는 마지막 항목과 자리 교체, O(1))
+    - 좌표 격자(셀 크기 = tolerance): 허용 오차 안의 기존 노드 조회
+    - 영역 격자(셀 크기 = block_size): 화면에 보이는 사각형 안의 노드 조회
+    노드 이동/링크 추가·삭제 비용은 경로 크기와 무관하게 해당 노드의 링크 수에만 비례한다.
+    경로 데이터를 이 클래스를 거치지 않고 바꾼 경우(로드/가져오기)에는 rebuild()로 다시 구성한다.
+    """
+
+    def __init__(self, route, tolerance=NODE_TOLERANCE, block_size=BLOCK_SIZE):
+        self.route = route
+        self.tol = tolerance
+        self.block_size = block_size
+        self.rebuild()
+
+    def rebuild(self):
+        self.ids = {}          # (x, y) -> id
+        self.coords = {}       # id -> (x, y)
+        self.cells = {}        # 좌표 격자 셀 -> set(id)
+        self.blocks = {}       # 영역 격자 셀 -> set(id)
+        self.adjacency = {}    # id -> set(링크 키)
+        self.link_pos = {}     # 링크 키 -> route["links"] index
+        self.next_id = 0
+        for xy in self.route["nodes"]:
+            self._index_node(xy)
+        # 중복 링크는 하나만, 끝점이 nodes에 없는 링크는 제외
+        links = self.route["links"]
+        self.route["links"] = []
+        for a, b in links:
+            if a in self.ids and b in self.ids:
+                self.add_link(a, b)
+
+    # ------------------------------------------------------------------
+    # 노드
+    # ------------------------------------------------------------------
+    def _cell(self, x, y):
+        return (math.floor(x / self.tol), math.floor(y / self.tol))
+
+    def _index_node(self, xy):
+        node_id = self.next_id
+        self.next_id += 1
+        self.ids[xy] = node_id
+        self.coords[node_id] = xy
+        self.cells.setdefault(self._cell(*xy), set()).add(node_id)
+        self.blocks.setdefault(self._block(*xy), set()).add(node_id)
+        self.adjacency[node_id] = set()
+        return node_id
+
+    def _unindex_node(self, node_id):
+        xy = self.coords.pop(node_id)
+        del self.ids[xy]
+        cell = self._cell(*xy)
+        members = self.cells[cell]
+        members.discard(node_id)
+        if not members:
+            del self.cells[cell]
+        block = self._block(*xy)
+        members = self.blocks[block]
+        members.discard(node_id)
+        if not members:
+            del self.blocks[block]
+        del self.adjacency[node_id]
+
+    def _block(self, x, y):
+        return (math.floor(x / self.block_size), math.floor(y / self.block_size))
+
+    def nodes_in_rect(self, x0, y0, x1, y1):
+        """사각형 (x0,y0)-(x1,y1) 안의 노드 좌표 키 목록 (겹치는 영역 격자 셀만 확인)"""
+        coords = self.coords
+        found = []
+        for members in rect_cells(self.blocks, self.block_size, x0, y0, x1, y1):
+            for node_id in members:
+                x, y = coords[node_id]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.append((x, y))
+        return found
+
+    def node_id(self, xy):
+        return self.ids.get(xy)
+
+    def find_node(self, x, y):
+        """(x, y)에서 tolerance 이내인 기존 노드 좌표 키 (가장 가까운 것), 없으면 None"""
+        if (x, y) in self.ids:
+            return (x, y)
+        cx, cy = self._cell(x, y)
+        best, best_d = None, self.tol
+        for ix in (cx - 1, cx, cx + 1):
+            for iy in (cy - 1, cy, cy + 1):
+                for node_id in self.cells.get((ix, iy), ()):
+                    nx, ny = self.coords[node_id]
+                    d = math.hypot(nx - x, ny - y)
+                    if d <= best_d:
+                        best, best_d = (nx, ny), d
+        return best
+
+    def add_node(self, x, y, z, node_name):
+        """노드 추가. tolerance 안에 기존 노드가 있으면 추가하지 않고 그 좌표 키 반환"""
+        found = self.find_node(x, y)
+        if found is not None:
+            return found
+        self.route["nodes"][(x, y)] = {"z": z, "node_name": node_name}
+        self._index_node((x, y))
+        return (x, y)
+
+    def move_node(self, old_xy, new_xy, z):
+        """
+        노드 이동 (이름 유지, 고도 z로 변경). 연결 링크의 좌표만 제자리에서 바꾼다.
+        new_xy에서 tolerance 이내에 다른 노드가 있으면 그 노드와 합친다 (그 노드의 이름/고도 유지,
+        중복/자기 자신 링크는 삭제).
+        반환: (이동 후 노드 좌표 키, [(옛 링크, 새 링크 또는 None(삭제됨)), ...])
+        """
+        nodes = self.route["nodes"]
+        old_id = self.ids[old_xy]
+        record = nodes.pop(old_xy)
+        old_links = [self._link_tuple(key) for key in self.adjacency[old_id]]
+        for link in old_links:
+            self.remove_link(*link)
+        self._unindex_node(old_id)
+
+        target = self.find_node(*new_xy)
+        if target is None:
+            target = new_xy
+            nodes[target] = {"z": z, "node_name": record["node_name"]}
+            self._index_node(target)
+
+        changes = []
+        for link in old_links:
+            a, b = [target if p == old_xy else p for p in link]
+            added = a != b and self.add_link(a, b)
+            changes.append((link, (a, b) if added else None))
+        return target, changes
+
+    # ------------------------------------------------------------------
+    # 링크
+    # ------------------------------------------------------------------
+    def _link_tuple(self, key):
+        return (self.coords[key[0]], self.coords[key[1]])
+
+    def has_link(self, a, b, either=False):
+        """a -> b 링크가 있으면 True (either=True면 b -> a도 확인)"""
+        ia, ib = self.ids.get(a), self.ids.get(b)
+        if ia is None or ib is None:
+            return False
+        return (ia, ib) in self.link_pos or (either and (ib, ia) in self.link_pos)
+
+    def add_link(self, a, b):
+        """a -> b 링크 추가 (두 끝점은 route["nodes"]에 있어야 함). 이미 있으면 False"""
+        key = (self.ids[a], self.ids[b])
+        if key in self.link_pos:
+            return False
+        links = self.route["links"]
+        self.link_pos[key] = len(links)
+        links.append((a, b))
+        self.adjacency[key[0]].add(key)
+        self.adjacency[key[1]].add(key)
+        return True
+
+    def remove_link(self, a, b):
+        """a -> b 링크 삭제. 마지막 링크를 빈 자리로 옮겨 O(1). 없으면 False"""
+        key = (self.ids.get(a), self.ids.get(b))
+        pos = self.link_pos.pop(key, None)
+        if pos is None:
+            return False
+        links = self.route["links"]
+        last = links.pop()
+        if pos < len(links):
+            links[pos] = last
+            self.link_pos[(self.ids[last[0]], self.ids[last[1]])] = pos
+        self.adjacency[key[0]].discard(key)
+        self.adjacency[key[1]].discard(key)
+        return True
+
+    def incident_links(self, xy):
+        """노드 xy에 연결된 링크들 [((x1, y1), (x2, y2)), ...] (route["links"] 순서)"""
+        node_id = self.ids.get(xy)
+        if node_id is None:
+            return []
+        keys = sorted(self.adjacency[node_id], key=self.link_pos.__getitem__)
+        return [self._link_tuple(key) for key in keys]
+
+    def neighbors(self, xy):
+        node_id = self.ids[xy]
+        return [self.coords[b if a == node_id else a] for a, b in self.adjacency[node_id]]
+
+
+# ----------------------------------------------------------------------
+# designer JSON 스키마 <-> 메모리 구조
+# ----------------------------------------------------------------------
+def route_from_json(data):
+    """JSON route ({name, node_count, nodes: {"x,y": {z, node_name}}, links: [[[x1,y1],[x2,y2]], ...]}) -> designer route dict"""
+    route = {"name": data["name"], "node_count": data["node_count"], "nodes": {}, "links": [],
+             "last_node": None}
+    for key, nd in data["nodes"].items():
+        x_str, y_str = key.split(",")
+        route["nodes"][(float(x_str), float(y_str))] = {"z": nd["z"], "node_name": nd["node_name"]}
+    for p1, p2 in data["links"]:
+        route["links"].append(((p1[0], p1[1]), (p2[0], p2[1])))
+    return route
+
+
+def route_to_json(route):
+    """designer route dict -> JSON route (save_data와 같은 형식)"""
+    return {
+        "name": route["name"],
+        "node_count": route["node_count"],
+        "nodes": {f"{x},{y}": {"z": nd["z"], "node_name": nd["node_name"]}
+                  for (x, y), nd in route["nodes"].items()},
+        "links": [[[p1[0], p1[1]], [p2[0], p2[1]]] for p1, p2 in route["links"]],
+    }
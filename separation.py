@@ -0,0 +1,84 @@
+import math
+
+
+class SeparationMonitor:
+    """
+    공중(in_air) 비행체 간 분리 기준 위반(loss of separation) 탐지.
+    매 tick 수평 분리 거리 크기의 균일 격자(spatial hash)를 새로 만들고,
+    같은 셀과 이웃 셀(절반만 - 쌍 중복 방지)에 있는 비행체끼리만 비교한다.
+    horizontal: 수평 분리 기준 (좌표 단위, 보통 m)
+    vertical: 수직 분리 기준 (고도 단위, designer JSON 기준 ft)
+    """
+
+    # 자기 셀 + 오른쪽/위쪽 방향 이웃 4개 → 모든 인접 셀 쌍을 한 번씩만 검사
+    NEIGHBORS = ((0, 0), (1, 0), (1, 1), (0, 1), (-1, 1))
+
+    def __init__(self, horizontal=150.0, vertical=100.0):
+        self.horizontal = horizontal
+        self.vertical = vertical
+        self.conflicts = []          # 이번 tick의 [(plane_a, plane_b, 수평 거리, 수직 거리), ...]
+        self.checks = 0              # 검사한 tick 수
+        self.conflict_ticks = 0      # 누적 (쌍 × tick)
+        self.loss_events = 0         # 새로 분리 기준을 위반한 쌍의 수 (위반 시작 시점마다 1)
+        self.max_simultaneous = 0
+        self._active = set()         # 현재 위반 중인 쌍 (이름 기준)
+
+    def check(self, planes):
+        """planes 중 in_air 비행체끼리 검사하고 이번 tick 위반 목록 반환"""
+        airborne = [p for p in planes if p.state == "in_air"]
+        return self.check_positions(airborne,
+                                    [p.current_pos for p in airborne],
+                                    [p.current_alt for p in airborne])
+
+    def check_positions(self, items, xy, z):
+        """items[k]의 위치 xy[k]=(x, y), 고도 z[k]로 검사 (배열 입력도 가능)"""
+        cell = self.horizontal
+        horizontal, vertical = self.horizontal, self.vertical
+        floor, hypot = math.floor, math.hypot
+        xs = [float(p[0]) for p in xy]
+        ys = [float(p[1]) for p in xy]
+        zs = [float(v) for v in z]
+
+        grid = {}
+        for k in range(len(items)):
+            grid.setdefault((floor(xs[k] / cell), floor(ys[k] / cell)), []).append(k)
+
+        conflicts = []
+        for (cx, cy), members in grid.items():
+            for dx, dy in self.NEIGHBORS:
+                same = dx == 0 and dy == 0
+                others = members if same else grid.get((cx + dx, cy + dy))
+                if not others:
+                    continue
+                for pos, a in enumerate(members):
+                    for b in (others[pos + 1:] if same else others):
+                        dh = hypot(xs[a] - xs[b], ys[a] - ys[b])
+                        if dh >= horizontal:
+                            continue
+                        dv = abs(zs[a] - zs[b])
+                        if dv < vertical:
+                            conflicts.append((items[a], items[b], dh, dv))
+
+        self._record(conflicts)
+        return conflicts
+
+    def _record(self, conflicts):
+        self.conflicts = conflicts
+        self.checks += 1
+        self.conflict_ticks += len(conflicts)
+        self.max_simultaneous = max(self.max_simultaneous, len(conflicts))
+        active = set()
+        for a, b, _, _ in conflicts:
+            pair = (a.name, b.name) if a.name < b.name else (b.name, a.name)
+            active.add(pair)
+        self.loss_events += len(active - self._active)
+        self._active = active
+
+    def summary(self):
+        return {
+            "checks": self.checks,
+            "conflict_ticks": self.conflict_ticks,
+            "loss_events": self.loss_events,
+            "max_simultaneous": self.max_simultaneous,
+            "active": len(self._active),
+        }
@@ -1,33 +1,69 @@
+import argparse
+import random
 import time
 from vertiport import Vertiport
 from uam_plane import UAMPlane
 from simulation_engine import SimulationEngine
+from trajectory_recorder import TrajectoryRecorder
+from deadlock import DeadlockDetector
+from instrumentation import Instrumentation, CSVSink
+from ground_procedure import GroundProcedure
+from airspace import AirspaceGraph, load_airspace
+from trajectory4d import FleetTrajectories
+from separation import SeparationMonitor
 
-def create_simulation():
+def create_simulation(taxi_planner=False, airspace=None, airspace_names=None, fleet_per_vertiport=4,
+                      departure_spacing=60, departure_jitter=0.0, turnaround_time=180, seed=None):
+    """
+    taxi_planner: True면 각 vertiport의 지상 이동을 시공간 예약(TaxiPlanner)으로 계획
+    fleet_per_vertiport: vertiport마다 출발하는 비행체 수
+    departure_spacing: 같은 vertiport 비행체 간 출발 간격 (초)
+    departure_jitter: 출발 시각(i * departure_spacing)에 더하는 균등 난수 폭 (±초, 0보다 작아지면 0)
+    turnaround_time: 착륙 후 다음 출발까지 대기 시간 (초)
+    seed: departure_jitter 난수 시드
+    airspace: 공역 designer JSON/.npz 경로 또는 AirspaceGraph. 있으면 공중 구간을 공역 항로로 비행
+    airspace_names: vertiport A~D에 대응하는 공역 버티포트 이름/번호 (None이면 AirspaceGraph.bind 기본 규칙)
+    """
     # 4개 버티포트 생성 (ground map: offset, airspace: 중심 좌표)
     vp_A = Vertiport("Vertiport A", position=(5, 30), offset=(0,0))
     vp_B = Vertiport("Vertiport B", position=(25, 30), offset=(30,0))
     vp_C = Vertiport("Vertiport C", position=(5, 5), offset=(0,30))
     vp_D = Vertiport("Vertiport D", position=(25, 5), offset=(30,30))
     vertiports = [vp_A, vp_B, vp_C, vp_D]
+    if taxi_planner:
+        for vp in vertiports:
+            vp.enable_taxi_planner()
+    if airspace is not None:
+        bind_airspace(vertiports, airspace, airspace_names)
 
+    rng = random.Random(seed)
     planes = []
     for origin in vertiports:
         # flight_plan: origin 제외한 나머지 버티포트 순서대로, 마지막에 origin 복귀
         flight_plan = [vp for vp in vertiports if vp != origin] + [origin]
-        for i in range(4):
-            departure_time = i * 60  # 60초 간격
+        for i in range(fleet_per_vertiport):
+            departure_time = i * departure_spacing  # 기본 60초 간격
+            if departure_jitter:
+                departure_time = max(0.0, departure_time + rng.uniform(-departure_jitter, departure_jitter))
             plane = UAMPlane(
                 name=f"UAM-{len(planes)+1}",
                 origin_vp=origin,
                 dest_vp=flight_plan[0],
                 departure_time=departure_time,
-                flight_plan=flight_plan
+                flight_plan=flight_plan,
+                turnaround_time=turnaround_time
             )
             planes.append(plane)
     return planes, vertiports
 
 
+def bind_airspace(vertiports, airspace, names=None):
+    """airspace(파일 경로 또는 AirspaceGraph)를 vertiports에 연결하고 AirspaceGraph 반환"""
+    if not isinstance(airspace, AirspaceGraph):
+        airspace = load_airspace(airspace)
+    return airspace.bind(vertiports, names)
+
+
 
 
 def main():
@@ -43,5 +79,193 @@ def main():
         time.sleep(engine.time_step)
     print("시뮬레이션 완료.")
 
+def run_headless(planes=None, until=None, mode="object", time_step=0.1, acceleration=1,
+                 progress_interval=5.0, report=print, record=None, record_every=1, taxi_planner=False,
+                 deadlock=None, profile=False, profile_csv=None, ground_procedure=False,
+                 airspace=None, airspace_names=None, trajectories=False, separation=None):
+    """
+    sleep/위치 출력 없이 최대 속도로 시뮬레이션 실행 후 요약(dict) 반환
+    planes: UAMPlane 리스트 (None이면 create_simulation() 시나리오 사용)
+    until: 시뮬레이션 종료 시각(초). None이면 모든 비행체가 done이 될 때까지
+           (남은 비행체가 모두 대기하고 깨울 타이머도 없으면 그 자리에서 멈추고 summary["stalled"] = True)
+    progress_interval: 진행 상황 출력 간격 (실제 경과 초 기준, None이면 출력 안 함)
+    report: 진행/요약 출력 함수 (None이면 출력 안 함)
+    record: 궤적 기록 파일 경로 (.npy, TrajectoryRecorder). None이면 기록 안 함
+    record_every: 몇 tick마다 기록할지
+    taxi_planner: planes가 None일 때 시나리오 vertiport에 TaxiPlanner 사용
+    deadlock: 지상 교착 탐지 ("detect": 집계만, "reroute"/"backoff": 해소 정책). None이면 사용 안 함
+    profile: True면 Instrumentation으로 tick 시간/상태별 시간/Dijkstra/gate poll 계측
+    profile_csv: tick별 계측 CSV 경로 (지정하면 profile도 켜짐)
+    ground_procedure: True면 GroundProcedure로 착륙 후 ~ 이륙 전 지상 절차(시동 종료, 지상 조업, 시동) 진행
+    airspace: 공역 designer JSON/.npz 경로 또는 AirspaceGraph (vertiport에 연결해 공역 항로로 비행)
+    airspace_names: vertiport 순서에 대응하는 공역 버티포트 이름/번호 (None이면 이름이 같으면 이름, 아니면 JSON 순서)
+    trajectories: True면 FleetTrajectories로 4D 일정 기록 (event 모드 기록/분리 검사 위치를 일정에서 일괄 보간)
+    separation: 공중 분리 기준 검사. SeparationMonitor 또는 (수평, 수직) 기준 튜플, True면 기본 기준. None이면 검사 안 함
+    """
+    vertiports = []
+    if planes is None:
+        planes, vertiports = create_simulation(taxi_planner=taxi_planner)
+    if not vertiports:
+        vertiports = list(dict.fromkeys(vp for p in planes for vp in [p.flight_origin] + p.flight_plan))
+    if airspace is not None:
+        bind_airspace(vertiports, airspace, airspace_names)
+    detector = None
+    if deadlock is not None:
+        detector = DeadlockDetector(policy=None if deadlock == "detect" else deadlock).attach(vertiports)
+    recorder = None
+    if record is not None:
+        recorder = TrajectoryRecorder(record, planes, vertiports, every=record_every)
+    instrumentation = None
+    if profile or profile_csv is not None:
+        sinks = [CSVSink(profile_csv)] if profile_csv is not None else []
+        instrumentation = Instrumentation(sinks)
+    procedure = None
+    if ground_procedure:
+        procedure = GroundProcedure().attach(planes)
+    fleet_trajectories = FleetTrajectories(planes) if trajectories else None
+    monitor = None
+    if separation is True:
+        monitor = SeparationMonitor()
+    elif isinstance(separation, SeparationMonitor):
+        monitor = separation
+    elif separation:
+        monitor = SeparationMonitor(*separation)
+    engine = SimulationEngine(planes, time_step=time_step, acceleration=acceleration, mode=mode,
+                              separation=monitor, recorder=recorder, instrumentation=instrumentation,
+                              procedure=procedure, trajectories=fleet_trajectories)
+
+    wall_start = time.perf_counter()
+    last_report = wall_start
+    ticks = 0
+    stalled = False
+    while any(p.state != "done" for p in planes):
+        if until is not None and engine.simulation_time >= until:
+            break
+        if mode == "event":
+            next_time = engine.events.next_event_time()
+            if next_time is None:
+                # 더 이상 진행될 이벤트 없음 (모두 대기)
+                if until is not None:
+                    engine.run_until(until)
+                stalled = True
+                break
+            engine.run_until(next_time if until is None else min(next_time, until))
+        else:
+            engine.update()
+            if is_stalled(planes, procedure):
+                # 남은 비행체가 모두 gate/node 대기이고 깨워 줄 절차 타이머도 없음 (교착)
+                ticks += 1
+                stalled = True
+                break
+        ticks += 1
+        if report is not None and progress_interval is not None:
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                last_report = now
+                done = sum(p.state == "done" for p in planes)
+                report(f"[진행] 시뮬레이션 시간 {engine.simulation_time:.1f} 초, "
+                       f"완료 {done}/{len(planes)}, 경과 {now - wall_start:.1f} 초")
+
+    wall_time = time.perf_counter() - wall_start
+    if recorder is not None:
+        recorder.close()
+    profile_summary = instrumentation.close() if instrumentation is not None else None
+    states = {}
+    for p in planes:
+        states[p.state] = states.get(p.state, 0) + 1
+    summary = {
+        "mode": mode,
+        "simulation_time": engine.simulation_time,
+        "wall_time": wall_time,
+        "steps": ticks,
+        "speedup": engine.simulation_time / wall_time if wall_time > 0 else float("inf"),
+        "planes": len(planes),
+        "done": states.get("done", 0),
+        "stalled": stalled,
+        "states": states,
+        "recorded_rows": recorder.rows_written if recorder is not None else 0,
+        "deadlock": detector.summary() if detector is not None else None,
+        "profile": profile_summary,
+        "procedure": procedure.summary() if procedure is not None else None,
+        "separation": monitor.summary() if monitor is not None else None,
+    }
+    if report is not None:
+        report(f"[요약] 모드 {mode}, 시뮬레이션 시간 {summary['simulation_time']:.1f} 초, "
+               f"실제 {wall_time:.2f} 초 (x{summary['speedup']:.0f}), "
+               f"완료 {summary['done']}/{summary['planes']}, 상태 {states}"
+               + (" (정지: 남은 비행체 모두 대기)" if stalled else ""))
+        if detector is not None:
+            report(f"[교착] {summary['deadlock']}")
+        if instrumentation is not None:
+            report("[계측] " + instrumentation.format_summary())
+        if procedure is not None:
+            report(f"[지상 절차] {summary['procedure']}")
+        if monitor is not None:
+            report(f"[분리] {summary['separation']}")
+    return summary
+
+
+def is_stalled(planes, procedure=None):
+    """
+    done이 아닌 비행체가 모두 waiting(gate/node 대기 또는 절차 타이머 대기)이고
+    절차 타이머도 남아 있지 않으면 True (더 진행해도 아무도 깨어나지 않음).
+    taxi 계획 대기/출발 시각 대기 비행체는 waiting이 아니므로 정지로 보지 않는다.
+    """
+    if procedure is not None and procedure.next_time() is not None:
+        return False
+    remaining = [p for p in planes if p.state != "done"]
+    return bool(remaining) and all(p.waiting for p in remaining)
+
+
+def parse_airspace_names(text):
+    """--airspace-names 값 ("Vertiport1,Vertiport2" 또는 "0,1,2,3") → 리스트 (숫자는 번호로)"""
+    if not text:
+        return None
+    return [int(name) if name.strip().isdigit() else name.strip() for name in text.split(",")]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="UAM 교통 시뮬레이션")
+    parser.add_argument("--headless", action="store_true",
+                        help="sleep/위치 출력 없이 최대 속도로 실행")
+    parser.add_argument("--until", type=float, default=None,
+                        help="시뮬레이션 종료 시각(초)")
+    parser.add_argument("--mode", choices=("object", "vectorized", "event"), default="object",
+                        help="SimulationEngine 모드")
+    parser.add_argument("--time-step", type=float, default=0.1)
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="진행 상황 출력 간격(실제 초)")
+    parser.add_argument("--record", default=None, help="궤적 기록 파일(.npy) 경로")
+    parser.add_argument("--record-every", type=int, default=1, help="몇 tick마다 기록할지")
+    parser.add_argument("--taxi-planner", action="store_true",
+                        help="시공간 예약 기반 지상 경로 계획 사용")
+    parser.add_argument("--deadlock", choices=("detect", "reroute", "backoff"), default=None,
+                        help="지상 교착 탐지/해소 정책")
+    parser.add_argument("--profile", action="store_true", help="tick/상태별/Dijkstra/gate poll 계측")
+    parser.add_argument("--profile-csv", default=None, help="tick별 계측 CSV 경로")
+    parser.add_argument("--ground-procedure", action="store_true",
+                        help="착륙 후 ~ 이륙 전 지상 절차(시동 종료, 지상 조업, 시동) 사용")
+    parser.add_argument("--airspace", default=None, metavar="PATH",
+                        help="공역 designer JSON/.npz 경로 (공중 구간을 공역 항로로 비행)")
+    parser.add_argument("--separation", type=float, nargs=2, default=None, metavar=("H", "V"),
+                        help="공중 분리 기준 검사 (수평 m, 수직 ft)")
+    parser.add_argument("--trajectories", action="store_true",
+                        help="4D 일정 기록 (event 모드 궤적 기록 위치를 일정에서 보간)")
+    parser.add_argument("--airspace-names", default=None,
+                        help="vertiport 순서대로 연결할 공역 버티포트 이름 또는 번호 (쉼표 구분)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.headless:
+        run_headless(until=args.until, mode=args.mode, time_step=args.time_step,
+                     progress_interval=args.progress_interval,
+                     record=args.record, record_every=args.record_every,
+                     taxi_planner=args.taxi_planner, deadlock=args.deadlock,
+                     profile=args.profile, profile_csv=args.profile_csv,
+                     ground_procedure=args.ground_procedure,
+                     airspace=args.airspace, airspace_names=parse_airspace_names(args.airspace_names),
+                     trajectories=args.trajectories, separation=args.separation)
+    else:
+        main()
@@ -1,18 +1,138 @@
+import time
+import numpy as np
+from fleet_arrays import FleetArrays, IN_AIR
+from event_engine import EventDrivenFleet
+
 class SimulationEngine:
-    def __init__(self, planes, time_step=0.1, acceleration=1):
+    def __init__(self, planes, time_step=0.1, acceleration=1, mode="object", separation=None,
+                 recorder=None, instrumentation=None, procedure=None, trajectories=None):
         """
         planes: UAMPlane 인스턴스 리스트
         time_step: 실제 업데이트 지연 (초)
         acceleration: 시뮬레이션 배속 (dt에 곱해짐)
+        mode: "object"     - 비행체마다 UAMPlane.update 호출 (기본)
+              "vectorized" - FleetArrays(NumPy 배열)로 같은 상태의 비행체를 일괄 갱신
+              "event"      - EventDrivenFleet으로 이벤트 시각 사이를 건너뛰며 진행
+        separation: SeparationMonitor (있으면 update() 후마다 공중 분리 기준 검사,
+                    event 모드 run_until()은 time_step * acceleration 초 간격 시각마다 검사)
+        recorder: TrajectoryRecorder (있으면 update() 후마다 상태 기록,
+                  event 모드 run_until()은 every * time_step * acceleration 초 간격 시각마다 기록)
+        instrumentation: Instrumentation (있으면 tick 시간/상태별 시간/Dijkstra/gate poll 계측)
+        procedure: GroundProcedure (있으면 매 tick 만료된 지상 절차 타이머 처리, event 모드는 이벤트와 함께 진행)
+        trajectories: FleetTrajectories (event 모드 기록 시각의 위치를 비행체별 sync_positions 대신
+                      4D 일정에서 한 번에 보간)
         """
         self.planes = planes
         self.time_step = time_step
         self.acceleration = acceleration
         self.simulation_time = 0
+        self.mode = mode
+        self.fleet = None
+        self.events = None
+        self.separation = separation
+        self.recorder = recorder
+        self.instrumentation = None
+        self.procedure = procedure
+        self.trajectories = trajectories
+        self._sample_index = 1   # event 모드 다음 표본 번호 (시각 = 번호 * time_step * acceleration, update()의 tick 시각과 같음)
+        if mode == "vectorized":
+            self.fleet = FleetArrays(planes)
+        elif mode == "event":
+            self.events = EventDrivenFleet(planes, start_time=self.simulation_time, procedure=procedure)
+        elif mode != "object":
+            raise ValueError(f"지원하지 않는 mode: {mode}")
+        if instrumentation is not None:
+            instrumentation.attach(self)
 
     def update(self):
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            t0 = time.perf_counter()
         dt = self.time_step * self.acceleration
         self.simulation_time += dt
-        for plane in self.planes:
-            if plane.state != "done":
-                plane.update(dt, self.simulation_time)
+        if self.procedure is not None and self.events is None:
+            # 만료된 지상 절차 타이머가 비행체를 깨운 뒤 진행 (event 모드는 EventDrivenFleet이 함께 처리)
+            self.procedure.advance_to(self.simulation_time)
+        if self.events is not None:
+            self.events.advance_to(self.simulation_time)
+            self.events.sync_positions(self.simulation_time)
+        elif self.fleet is not None:
+            self.fleet.step(dt, self.simulation_time)
+        elif instrumentation is not None:
+            instrumentation.update_planes(self.planes, dt, self.simulation_time)
+        else:
+            for plane in self.planes:
+                if plane.state != "done":
+                    plane.update(dt, self.simulation_time)
+        if self.separation is not None:
+            self.check_separation()
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if instrumentation is not None:
+            instrumentation.end_tick(self, time.perf_counter() - t0)
+
+    def run_until(self, until):
+        """
+        simulation_time이 until에 도달할 때까지 진행.
+        event 모드는 이벤트 시각 사이를 한 번에 건너뛰고, 그 외 모드는 update()를 반복한다.
+        """
+        if self.events is not None:
+            instrumentation = self.instrumentation
+            if instrumentation is not None:
+                t0 = time.perf_counter()
+            recorder, separation = self.recorder, self.separation
+            if recorder is not None or separation is not None:
+                # tick 모드와 같은 시각 격자로 멈춰 위치를 맞추고 분리 검사(매 표본) / 기록(every 표본마다)
+                # → 이벤트 사이(구간 도중)에 생긴 분리 위반도 놓치지 않음
+                dt = self.time_step * self.acceleration
+                while self._sample_index * dt <= until:
+                    k = self._sample_index
+                    self._sample_index += 1
+                    t = k * dt
+                    record = recorder is not None and (k - 1) % recorder.every == 0
+                    if t < self.simulation_time or not (record or separation is not None):
+                        continue
+                    self.events.advance_to(t)
+                    self.simulation_time = t
+                    xyz = self.sample_positions(t)
+                    if separation is not None:
+                        self.check_separation(xyz)
+                    if record:
+                        recorder.snapshot(self, xyz)
+            self.events.advance_to(until)
+            self.simulation_time = max(self.simulation_time, until)
+            self.events.sync_positions(self.simulation_time)
+            if instrumentation is not None:
+                # event 모드는 run_until 한 번(이벤트 시각 하나)을 tick 하나로 계측
+                instrumentation.end_tick(self, time.perf_counter() - t0)
+            return
+        while self.simulation_time < until and any(p.state != "done" for p in self.planes):
+            self.update()
+
+    def sample_positions(self, t):
+        """
+        event 모드 표본 시각 t의 전 비행체 위치 (N, 3) 배열.
+        4D 일정이 있으면 FleetTrajectories.positions로 일괄 보간, 없으면 sync_positions 후 None (비행체 속성 사용)
+        """
+        if self.trajectories is not None:
+            return self.trajectories.positions(t)[0]
+        self.events.sync_positions(t)
+        return None
+
+    def check_separation(self, xyz=None):
+        """
+        공중 비행체 간 분리 기준 위반 목록 (vectorized 모드는 배열을 그대로 사용).
+        xyz: event 모드 표본 시각의 전 비행체 위치 (N, 3) 배열 (None이면 비행체의 현재 위치)
+        """
+        if xyz is not None:
+            idx = [i for i, p in enumerate(self.planes) if p.state == "in_air"]
+            return self.separation.check_positions([self.planes[i] for i in idx], xyz[idx, :2], xyz[idx, 2])
+        if self.fleet is not None:
+            idx = np.flatnonzero(self.fleet.state == IN_AIR)
+            return self.separation.check_positions([self.planes[i] for i in idx],
+                                                   self.fleet.pos[idx], self.fleet.alt[idx])
+        return self.separation.check(self.planes)
+
+    @property
+    def conflicts(self):
+        return self.separation.conflicts if self.separation is not None else []
@@ -0,0 +1,166 @@
+import heapq
+import itertools
+import math
+
+
+class ReservationTable:
+    """
+    vertiport 하나의 지상 노드 × 시간 슬롯 예약표.
+    (node, 슬롯 번호) -> 예약한 비행체. 슬롯 번호 k는 [k*slot, (k+1)*slot) 구간
+    """
+
+    def __init__(self, slot=1.0):
+        self.slot = slot
+        self.slots = {}    # (node, k) -> uam
+        self.owned = {}    # uam -> [(node, k), ...]  (재계획 시 한 번에 해제)
+
+    def slot_of(self, t):
+        """시각 t 이후 첫 슬롯 번호 (t가 슬롯 경계면 그 슬롯)"""
+        return math.ceil(t / self.slot - 1e-9)
+
+    def is_free(self, node, k0, k1, uam=None):
+        """node가 슬롯 k0~k1(포함) 동안 비어 있거나 uam 자신의 예약뿐이면 True"""
+        slots = self.slots
+        for k in range(k0, k1 + 1):
+            owner = slots.get((node, k))
+            if owner is not None and owner is not uam:
+                return False
+        return True
+
+    def reserve(self, uam, node, k0, k1):
+        """슬롯 k0~k1 예약 (다른 비행체가 이미 잡은 슬롯은 그대로 둔다)"""
+        owned = self.owned.setdefault(uam, [])
+        for k in range(k0, k1 + 1):
+            if self.slots.get((node, k)) is None:
+                self.slots[(node, k)] = uam
+                owned.append((node, k))
+
+    def release(self, uam):
+        for key in self.owned.pop(uam, ()):
+            if self.slots.get(key) is uam:
+                del self.slots[key]
+
+
+class TaxiPlanner:
+    """
+    시공간 예약표 기반 협조 지상 경로 계획 (cooperative A*).
+    Gate/FATO를 떠날 때 (노드, 시간 슬롯) 상태 공간에서 A*로 탐색해
+    먼저 계획한 비행체들의 예약과 겹치지 않는 경로 + 노드별 출발 시각을 한 번에 정한다.
+    - 구간 a → b를 지나는 동안(이동 시간 + margin 슬롯)은 a, b를 모두 예약 → 정면 교차/추월 불가
+    - 출발 노드(자기 Gate 또는 FATO)에서는 예약과 관계없이 대기 가능
+    - 다른 비행체의 Gate 노드는 지나가지 않음
+    horizon 슬롯 안에 목표에 도달하지 못하면 None (호출 측은 기존 노드 단위 예약으로 진행)
+    """
+
+    def __init__(self, nodes, links, gates=(), slot=1.0, margin=2, horizon=1800):
+        self.nodes = nodes
+        self.links = links
+        self.gates = set(gates)
+        self.margin = margin
+        self.horizon = horizon
+        self.table = ReservationTable(slot)
+        self._durations = {}   # speed -> {(a, b): 이동 슬롯 수}
+        self.plans = 0
+        self.failures = 0
+
+    def _duration(self, speed):
+        durations = self._durations.get(speed)
+        if durations is None:
+            durations = {}
+            slot = self.table.slot
+            for a, neighbors in self.links.items():
+                for b in neighbors:
+                    dist = math.dist(self.nodes[a], self.nodes[b])
+                    durations[(a, b)] = max(1, math.ceil(dist / speed / slot - 1e-9))
+            self._durations[speed] = durations
+        return durations
+
+    def plan(self, uam, start, goal, start_time, speed):
+        """
+        start → goal 지상 경로 계획 후 예약.
+        반환: (노드 리스트, 노드별 출발 가능 시각 리스트) 또는 None
+        """
+        table = self.table
+        table.release(uam)   # 이전 계획의 예약은 무효
+        slot, margin = table.slot, self.margin
+        durations = self._duration(speed)
+        goal_pos = self.nodes[goal]
+        heuristic = {}
+
+        def h(node):
+            value = heuristic.get(node)
+            if value is None:
+                value = math.floor(math.dist(self.nodes[node], goal_pos) / speed / slot)
+                heuristic[node] = value
+            return value
+
+        k_start = table.slot_of(start_time)
+        k_max = k_start + self.horizon
+        counter = itertools.count()
+        open_heap = [(k_start + h(start), k_start, next(counter), start)]
+        parent = {(start, k_start): None}
+        closed = set()
+        found = None
+
+        while open_heap:
+            _, k, _, node = heapq.heappop(open_heap)
+            if (node, k) in closed:
+                continue
+            closed.add((node, k))
+            if node == goal:
+                found = (node, k)
+                break
+            # 제자리 대기
+            if k < k_max and (node == start or table.is_free(node, k + 1, k + 1, uam)):
+                state = (node, k + 1)
+                if state not in parent:
+                    parent[state] = (node, k)
+                    heapq.heappush(open_heap, (k + 1 + h(node), k + 1, next(counter), node))
+            # 인접 노드로 이동
+            for nb in self.links.get(node, ()):
+                if nb in self.gates and nb != goal:
+                    continue
+                d = durations[(node, nb)]
+                if k + d > k_max:
+                    continue
+                hold = k + d + margin
+                if node != start and not table.is_free(node, k, hold, uam):
+                    continue
+                if not table.is_free(nb, k, hold, uam):
+                    continue
+                state = (nb, k + d)
+                if state in parent:
+                    continue
+                parent[state] = (node, k)
+                heapq.heappush(open_heap, (k + d + h(nb), k + d, next(counter), nb))
+
+        self.plans += 1
+        if found is None:
+            self.failures += 1
+            return None
+
+        states = []
+        state = found
+        while state is not None:
+            states.append(state)
+            state = parent[state]
+        states.reverse()
+
+        # 같은 노드의 연속 상태(대기)를 묶어: 노드, 진입 예약 시작 슬롯, 출발 슬롯
+        route, enter, leave = [], [], []
+        for i, (node, k) in enumerate(states):
+            if route and route[-1] == node:
+                leave[-1] = k
+                continue
+            route.append(node)
+            # 구간 이동을 시작한 슬롯부터 다음 노드도 예약되어 있음
+            enter.append(states[i - 1][1] if i else k)
+            leave.append(k)
+
+        for i, node in enumerate(route):
+            if i + 1 < len(route):
+                end = leave[i] + durations[(node, route[i + 1])] + margin
+            else:
+                end = leave[i] + margin
+            table.reserve(uam, node, enter[i], end)
+        return route, [k * slot for k in leave]
@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import math
+
+
+class TimerWheel:
+    """
+    계층형 타이머 휠 (hashed hierarchical timing wheel).
+    시각을 resolution 단위 tick으로 나누고, 남은 tick 수에 따라 레벨을 고른다.
+    - 레벨 0: 앞으로 slots tick 이내 (slot = tick % slots)
+    - 레벨 L: 앞으로 slots^(L+1) tick 이내 (slot = (tick // slots^L) % slots)
+    레벨 0이 한 바퀴 돌 때마다 상위 레벨의 다음 slot을 아래 레벨로 다시 나눠 담는다(cascade).
+    등록/취소는 O(1), advance_to는 지나간 tick 수 + 만료된 타이머 수에 비례한다.
+    가장 먼 레벨을 넘는 타이머는 overflow heap에 두었다가 범위 안에 들어오면 옮긴다.
+    만료 콜백은 callback(arg, due)로, 같은 advance_to 안에서는 (콜백이 새로 등록한 것을 포함해) due 시각 순서로 호출된다.
+    """
+
+    def __init__(self, resolution=1.0, slots=64, levels=4, start_time=0.0):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.spans = [slots ** level for level in range(levels + 1)]
+        self.overflow = []                        # (tick, seq, entry)
+        self.tick = self._tick_of(start_time)     # 다음에 처리할 tick
+        self.count = 0
+        self._seq = itertools.count()
+        self._next = None     # next_expiry 캐시 (None: 다시 계산)
+        self._batch = None    # advance_to 중 만료 대기 heap (콜백이 등록한 만료 시각 이내 타이머도 여기로)
+        self._batch_time = None
+
+    def _tick_of(self, time):
+        return int(math.floor(time / self.resolution))
+
+    def __len__(self):
+        return self.count
+
+    # ------------------------------------------------------------------
+    # 등록 / 취소
+    # ------------------------------------------------------------------
+    def schedule(self, due, callback, arg=None):
+        """due 시각에 callback(arg, due) 호출. 반환값(handle)은 cancel에 사용"""
+        entry = [due, next(self._seq), callback, arg]
+        self.count += 1
+        if self._batch is not None and due <= self._batch_time:
+            heapq.heappush(self._batch, entry)
+            return entry
+        self._insert(entry, self._tick_of(due))
+        if self._next is not None and due < self._next:
+            self._next = due
+        return entry
+
+    def cancel(self, entry):
+        """아직 만료되지 않은 타이머 취소 (slot에서 바로 빼지 않고 만료 시 건너뜀)"""
+        if entry[2] is None:
+            return False
+        entry[2] = None
+        entry[3] = None
+        self.count -= 1
+        if entry[0] == self._next:
+            self._next = None
+        return True
+
+    def _insert(self, entry, tick):
+        # 이미 지난 tick은 현재 slot에 (다음 advance_to에서 바로 만료)
+        delta = tick - self.tick
+        if delta < 0:
+            tick, delta = self.tick, 0
+        spans = self.spans
+        for level in range(self.levels):
+            if delta < spans[level + 1]:
+                self.wheels[level][(tick // spans[level]) % self.slots].append(entry)
+                return
+        heapq.heappush(self.overflow, (tick, entry[1], entry))
+
+    def _cascade(self):
+        """self.tick이 레벨 경계에 도달하면 상위 레벨 slot을 아래로 다시 나눠 담는다"""
+        spans = self.spans
+        for level in range(1, self.levels):
+            if self.tick % spans[level]:
+                break
+            slot = self.wheels[level][(self.tick // spans[level]) % self.slots]
+            if slot:
+                entries = slot[:]
+                slot.clear()
+                for entry in entries:
+                    if entry[2] is not None:
+                        self._insert(entry, self._tick_of(entry[0]))
+        else:
+            if self.tick % spans[self.levels] == 0:
+                self._drain_overflow()
+
+    def _drain_overflow(self):
+        limit = self.tick + self.spans[self.levels]
+        overflow = self.overflow
+        while overflow and overflow[0][0] < limit:
+            tick, _, entry = heapq.heappop(overflow)
+            if entry[2] is not None:
+                self._insert(entry, tick)
+
+    # ------------------------------------------------------------------
+    # 진행
+    # ------------------------------------------------------------------
+    def advance_to(self, time):
+        """time 이하의 타이머를 모두 만료시킨다 (콜백에서 새로 등록한 타이머도 time 이하면 함께 만료)"""
+        batch = self._collect(time, self._tick_of(time))
+        if not batch:
+            return
+        self._next = None
+        heapq.heapify(batch)     # [due, seq, ...] 순서
+        self._batch, self._batch_time = batch, time
+        try:
+            while batch:
+                entry = heapq.heappop(batch)
+                callback, arg = entry[2], entry[3]
+                if callback is None:
+                    continue   # 먼저 호출된 콜백이 취소
+                entry[2] = entry[3] = None
+                self.count -= 1
+                callback(arg, entry[0])
+        finally:
+            self._batch = self._batch_time = None
+
+    def _collect(self, time, target):
+        due = []
+        wheel = self.wheels[0]
+        slots = self.slots
+        while True:
+            if not self.count:
+                # 타이머가 없으면 tick만 맞춰 둠 (상위 레벨/overflow도 비어 있음)
+                self.tick = max(self.tick, target)
+                return due
+            slot = wheel[self.tick % slots]
+            if self.tick < target:
+                due.extend(entry for entry in slot if entry[2] is not None)
+                slot.clear()
+                self.tick += 1
+                self._cascade()
+                continue
+            if slot:
+                keep = []
+                for entry in slot:
+                    if entry[2] is None:
+                        continue
+                    (due if entry[0] <= time else keep).append(entry)
+                slot[:] = keep
+            return due
+
+    def next_expiry(self):
+        """가장 이른 만료 예정 시각 (없으면 None)"""
+        if not self.count:
+            return None
+        if self._next is not None:
+            return self._next
+        best = None
+        spans = self.spans
+        for level in range(self.levels):
+            # 레벨 L의 slot은 현재 위치 다음부터 순서대로 앞선 구간 (레벨 0은 현재 slot 포함)
+            base = self.tick // spans[level] + (0 if level == 0 else 1)
+            wheel = self.wheels[level]
+            for i in range(self.slots):
+                times = [entry[0] for entry in wheel[(base + i) % self.slots] if entry[2] is not None]
+                if times:
+                    t = min(times)
+                    best = t if best is None else min(best, t)
+                    break
+        for _, _, entry in self.overflow:
+            if entry[2] is not None:
+                best = entry[0] if best is None else min(best, entry[0])
+        self._next = best
+        return best
@@ -2,6 +2,7 @@ import tkinter as tk
 import tkinter.font as tkFont
 from tkinter import ttk, simpledialog, messagebox, filedialog
 import json
+import math
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
@@ -9,6 +10,11 @@ import numpy as np
 # Matplotlib 한글 폰트(Windows: 맑은 고딕)
 matplotlib.rcParams['font.family'] = 'Malgun Gothic'
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+from link_index import LinkGridIndex
+from route_network import RouteNetwork, route_from_json, route_to_json
+import route_import
+import airspace_npz
 
 ###############################################################################
 # 전역 데이터
@@ -16,6 +22,35 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 routes = []
 vertiports = []
 
+# 링크 공간 인덱스 격자 크기 (m)
+LINK_INDEX_CELL = 1000.0
+
+# 2D 화면 LOD: 격자 최소 간격(px), 노드 이름을 표시하는 최소 줌, 줌 아웃 시 노드를 묶는 칸 크기(px),
+# 보이는 영역 밖으로 미리 그려 둘 여유(보이는 폭 대비 비율, 팬 중에는 다시 그리지 않음)
+GRID_MIN_PX = 12
+LABEL_MIN_ZOOM = 1.0
+NODE_CLUSTER_PX = 6
+VIEW_MARGIN = 0.5
+
+# 버티포트 3D 원통 (높이 ft, 둘레 분할 수, 높이 분할 수)
+CYLINDER_HEIGHT = 2000
+CYLINDER_SEGMENTS = 30
+CYLINDER_LEVELS = 2
+
+
+def _unit_cylinder():
+    """반지름 1, 높이 1 원통 옆면의 사각형 면 배열 (F, 4, 3). 버티포트마다 크기/위치만 바꿔 재사용"""
+    theta = np.linspace(0, 2*np.pi, CYLINDER_SEGMENTS)
+    zvals = np.linspace(0, 1, CYLINDER_LEVELS)
+    theta_grid, z_grid = np.meshgrid(theta, zvals)
+    P = np.stack([np.cos(theta_grid), np.sin(theta_grid), z_grid], axis=-1)
+    # 격자 한 칸(사각형)의 네 꼭짓점
+    quads = np.stack([P[:-1, :-1], P[:-1, 1:], P[1:, 1:], P[1:, :-1]], axis=2)
+    return quads.reshape(-1, 4, 3)
+
+
+UNIT_CYLINDER = _unit_cylinder()
+
 ROUTE_COLORS = [
     "red", "blue", "green", "orange", "purple",
     "brown", "cyan", "magenta", "gray", "navy"
@@ -47,8 +82,23 @@ class UAMMapApp:
         self.CANVAS_SIZE = 600
         self.zoom_level = 1.0  # 2D Canvas용 임의 Zoom 값
 
+        # 모든 경로 링크의 격자 인덱스 (교차점 후보 조회용, 링크 추가/삭제 시 함께 갱신)
+        self.link_index = LinkGridIndex(LINK_INDEX_CELL)
+        # 경로별 노드/링크 인덱스 (routes와 같은 순서)
+        self.route_networks = []
+
+        # 변경 추적 (refresh_all이 바뀐 부분만 다시 그림)
+        self.dirty_routes = set()
+        self.dirty_vertiports = set()
+        self.full_redraw = True
+        self.view_dirty = False
+        self.route_artists = {}   # 경로 index -> 3D artist 목록
+        self.vp_artists = []      # 전체 버티포트 3D artist (마커 1개 + 원통 mesh 1개)
+        self.tree_rows = {}       # 경로 index -> 트리뷰 iid 목록
+
         # 우클릭 드래그로 Canvas를 이동하기 위한 내부 변수
         self.is_panning = False
+        self.view_rect = (0, 0, self.MAP_SIZE, self.MAP_SIZE)   # update_view_rect()에서 갱신
         self.pan_start_x = 0
         self.pan_start_y = 0
 
@@ -86,6 +136,7 @@ class UAMMapApp:
         # 우클릭 드래그: 지도 이동(팬)
         self.canvas_2d.bind("<Button-3>", self.on_right_click_press)
         self.canvas_2d.bind("<B3-Motion>", self.on_right_click_drag)
+        self.canvas_2d.bind("<ButtonRelease-3>", self.on_right_click_release)
 
         self.canvas_2d.bind("<Motion>", self.on_canvas_mouse_move)
 
@@ -113,6 +164,8 @@ class UAMMapApp:
                   command=self.load_data).grid(row=1, column=0, padx=5, pady=2)
         tk.Button(btn_frame, text="Save",
                   command=self.save_data).grid(row=1, column=1, padx=5, pady=2)
+        tk.Button(btn_frame, text="Import",
+                  command=self.import_routes).grid(row=1, column=2, padx=5, pady=2)
 
         # 3D Matplotlib
         self.fig = plt.Figure(figsize=(5, 5))
@@ -149,6 +202,7 @@ class UAMMapApp:
         self.mouse_info_label.place(x=10, y=10)  # 일단 임의 위치에 두었다가
         # --------------------------------------------------------
 
+        self.update_view_rect()
         self.draw_grid()
         self.create_new_route()
 
@@ -170,6 +224,14 @@ class UAMMapApp:
         self.canvas_2d.scan_dragto(event.x, event.y, gain=1)
         self.show_corner_coords()
 
+    def on_right_click_release(self, event):
+        """팬 종료 → 새로 보이는 영역 기준으로 2D 다시 그림 (보이는 것만 그리므로)"""
+        if not self.is_panning:
+            return
+        self.is_panning = False
+        self.view_dirty = True
+        self.refresh_all()
+
     # ------------------------------------------------------------------------
     # 마우스 이동 시 좌표 표시
     # ------------------------------------------------------------------------
@@ -194,13 +256,15 @@ class UAMMapApp:
     def clear_all(self):
         routes.clear()
         vertiports.clear()
+        self.link_index.clear()
+        self.route_networks.clear()
         self.route_count = 0
         self.vertiport_count = 0
         self.current_route_idx = None
         self.node_to_update = None
         self.input_mode = "NODE"
         # 화면 갱신
-        self.draw_grid()
+        self.mark_all_dirty()
         self.refresh_all()
 
         # ★ 새 경로 자동 생성 (원한다면)
@@ -210,55 +274,37 @@ class UAMMapApp:
     # Load/Save (JSON)
     ############################################################################
     def load_data(self):
-        """JSON 파일에서 routes, vertiports 로드"""
+        """JSON 또는 바이너리(.npz) 파일에서 routes, vertiports 로드"""
         global routes, vertiports
         filename = filedialog.askopenfilename(
             title="Load JSON",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=[("Airspace Files", "*.json *.npz"), ("JSON Files", "*.json"),
+                       ("Binary Airspace", "*.npz"), ("All Files", "*.*")]
         )
         if not filename:
             return
 
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if filename.lower().endswith(".npz"):
+                # memory-map으로 열어 경로별로 바로 메모리 구조 생성 (문자열 키 파싱 없음)
+                airspace_file = airspace_npz.AirspaceFile(filename)
+                routes_data = list(airspace_file.routes())
+                verts_data = list(airspace_file.vertiports())
+            else:
+                with open(filename, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # {name, node_count, nodes: {"x,y": {...}}, links: [[[x1,y1],[x2,y2]], ...]}
+                routes_data = [route_from_json(r) for r in data.get("routes", [])]
+                verts_data = data.get("vertiports", [])
 
             # 기존 데이터 비우고 다시 채움
             routes.clear()
             vertiports.clear()
 
             # 라우트 정보 복원
-            routes_data = data.get("routes", [])
-            for r in routes_data:
-                # {name, node_count, nodes, links}
-                new_r = {
-                    "name": r["name"],
-                    "node_count": r["node_count"],
-                    "nodes": {},
-                    "links": []
-                }
-                # nodes
-                for k, nd in r["nodes"].items():
-                    # k = "x,y" 형태 or just a string?
-                    # 혹은 원래 (x,y) tuple을 dict key로 썼다면 JSON 저장 시 문자열이었을 가능성
-                    # 여기서는 x,y를 float 변환
-                    x_str, y_str = k.split(",")
-                    xx = float(x_str)
-                    yy = float(y_str)
-                    new_r["nodes"][(xx, yy)] = {
-                        "z": nd["z"],
-                        "node_name": nd["node_name"]
-                    }
-                # links
-                for ln in r["links"]:
-                    # ln = [[x1, y1], [x2, y2]] 형태라고 가정
-                    p1, p2 = ln
-                    new_r["links"].append(((p1[0], p1[1]), (p2[0], p2[1])))
-
-                routes.append(new_r)
+            routes.extend(routes_data)
 
             # 버티포트
-            verts_data = data.get("vertiports", [])
             for vp in verts_data:
                 vertiports.append({
                     "name": vp["name"],
@@ -274,49 +320,60 @@ class UAMMapApp:
             self.route_count = len(routes)
             self.vertiport_count = len(vertiports)
             self.current_route_idx = 0 if len(routes) > 0 else None
+            self.rebuild_indexes()
 
+            self.mark_all_dirty()
             self.refresh_all()
             messagebox.showinfo("로드 성공", f"파일 '{filename}' 로드 완료.")
         except Exception as e:
             messagebox.showerror("로드 실패", f"에러: {e}")
 
+    def import_routes(self):
+        """JSON/CSV/폴리라인 파일의 경로들을 한 번에 추가 (교차점은 일괄 계산 후 분할)"""
+        filename = filedialog.askopenfilename(
+            title="Import Routes",
+            filetypes=[("Route Files", "*.json *.csv *.txt *.wkt"), ("All Files", "*.*")]
+        )
+        if not filename:
+            return
+
+        try:
+            polylines = route_import.load_polylines(filename)
+            count, crossings = route_import.import_polylines(routes, polylines, self.route_count)
+            self.route_count += count
+            if count:
+                self.current_route_idx = len(routes) - 1
+            self.rebuild_indexes()
+            self.mark_all_dirty()
+            self.refresh_all()
+            messagebox.showinfo("가져오기 완료", f"경로 {count}개, 교차점 {crossings}개 추가.")
+        except Exception as e:
+            messagebox.showerror("가져오기 실패", f"에러: {e}")
+
     def save_data(self):
-        """현재 routes, vertiports 데이터를 JSON 파일로 저장"""
+        """현재 routes, vertiports 데이터를 JSON 또는 바이너리(.npz) 파일로 저장"""
         filename = filedialog.asksaveasfilename(
             title="Save JSON",
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=[("JSON Files", "*.json"), ("Binary Airspace", "*.npz"), ("All Files", "*.*")]
         )
         if not filename:
             return
 
         try:
+            if filename.lower().endswith(".npz"):
+                airspace_npz.save_npz(filename, routes, vertiports)
+                messagebox.showinfo("저장 완료", f"파일 '{filename}' 저장되었습니다.")
+                return
+
             data = {
                 "routes": [],
                 "vertiports": []
             }
             # routes
+            # 노드 key (x,y) -> "x,y", 링크 ((x1,y1),(x2,y2)) -> [[x1,y1],[x2,y2]]
             for r in routes:
-                # 노드 딕셔너리는 (x,y) -> {...} 형태이므로
-                # JSON에 저장하려면 key를 문자열로 변환
-                node_dict = {}
-                for (xx, yy), nd in r["nodes"].items():
-                    key_str = f"{xx},{yy}"
-                    node_dict[key_str] = {
-                        "z": nd["z"],
-                        "node_name": nd["node_name"]
-                    }
-                # links: [((x1,y1),(x2,y2)), ...] -> [[[x1,y1],[x2,y2]],...]
-                link_list = []
-                for (p1, p2) in r["links"]:
-                    link_list.append([[p1[0], p1[1]], [p2[0], p2[1]]])
-
-                data["routes"].append({
-                    "name": r["name"],
-                    "node_count": r["node_count"],
-                    "nodes": node_dict,
-                    "links": link_list
-                })
+                data["routes"].append(route_to_json(r))
 
             # vertiports
             for vp in vertiports:
@@ -348,6 +405,8 @@ class UAMMapApp:
             self.zoom_level *= 0.9
         #  너무 작아지거나 커지는 것 방지
         self.zoom_level = max(0.1, min(self.zoom_level, 10.0))
+        # 줌은 2D 좌표만 바뀜
+        self.view_dirty = True
         self.refresh_all()
 
     ###########################################################################
@@ -355,40 +414,25 @@ class UAMMapApp:
     ###########################################################################
     def world_to_canvas(self, x, y):
         """
-        World 좌표 (x,y) -> Canvas 픽셀좌표 (cx, cy), 
-        패닝(스크롤) + 줌(zoom_level) 모두 반영
+        World 좌표 (x,y) -> Canvas 내부 절대 좌표 (cx, cy), 줌(zoom_level) 반영.
+        스크롤(패닝)은 Canvas가 보이는 위치만 옮기므로 여기서는 빼지 않는다
         """
 
         step_px = (self.CANVAS_SIZE / self.GRID_COUNT) * self.zoom_level
         real_px = (x / self.GRID_SIZE) * step_px
         real_py = (y / self.GRID_SIZE) * step_px
 
-        offset_x = self.canvas_2d.canvasx(0)
-        offset_y = self.canvas_2d.canvasy(0)
-
-        # 스크롤 오프셋만큼 빼줘야 "현재 보이는" 캔버스 좌표가 됨
-        local_cx = real_px - offset_x
-        local_cy = real_py - offset_y
-
-        return int(local_cx), int(local_cy)
+        # Canvas item은 스크롤과 무관한 절대(내부) 좌표로 그림 → 팬(scan_dragto) 후에도 그대로 맞음
+        return int(real_px), int(real_py)
 
     def canvas_to_world(self, cx, cy):
         """
-        Canvas 픽셀좌표 (cx, cy) -> World 좌표 (x, y),
-        패닝(스크롤) + 줌(zoom_level) 모두 반영
+        Canvas 내부 절대 좌표 (cx, cy) -> World 좌표 (x, y), 줌(zoom_level) 반영.
+        화면(이벤트) 픽셀은 canvasx/canvasy로 스크롤을 더한 값을 넘긴다 (world_to_canvas의 역변환)
         """
-        offset_x_pix = self.canvas_2d.canvasx(0)
-        offset_y_pix = self.canvas_2d.canvasy(0)
-
-        step_px = (self.CANVAS_SIZE / self.GRID_COUNT) * self.zoom_level
-
-        # 실제 캔버스 내부 절대 좌표 = 스크롤 오프셋 + 현재 로컬 픽셀
-        real_cx = offset_x_pix + cx
-        real_cy = offset_y_pix + cy
-
         step_px = (self.CANVAS_SIZE / self.GRID_COUNT) * self.zoom_level
-        x_m = (real_cx / step_px) * self.GRID_SIZE
-        y_m = (real_cy / step_px) * self.GRID_SIZE
+        x_m = (cx / step_px) * self.GRID_SIZE
+        y_m = (cy / step_px) * self.GRID_SIZE
 
         return x_m, y_m
 
@@ -406,6 +450,7 @@ class UAMMapApp:
         "last_node": None
         }
         routes.append(new_route)
+        self.route_networks.append(RouteNetwork(new_route))
         self.current_route_idx = len(routes) - 1
         messagebox.showinfo("안내", f"'{rname}'를 입력하세요.")
 
@@ -417,13 +462,12 @@ class UAMMapApp:
         """
 
         route = routes[route_idx]
+        self.mark_route_dirty(route_idx)
 
         # ### 1) last_node가 None이면 = 경로 첫 노드 ###
         if route["last_node"] is None:
-            # 첫 노드 단순 등록
-            self._create_node(route, x, y, z)
-            # 방금 추가한 노드가 last_node
-            route["last_node"] = (x,y)
+            # 첫 노드 단순 등록, 방금 추가한 노드가 last_node
+            route["last_node"] = self._create_node(route_idx, x, y, z)
             return
 
         # ### 2) last_node(LN) 좌표, Z ###
@@ -447,9 +491,9 @@ class UAMMapApp:
         current_start = (lx, ly, lz)
         for (t, ix, iy, iz, o_idx, n1, n2, tB) in intersects:
             # LN->(ix,iy,iz)
-            iCoord = self._create_node(route, ix, iy, iz)
+            iCoord = self._create_node(route_idx, ix, iy, iz)
             prevCoord = (current_start[0], current_start[1])
-            route["links"].append((prevCoord, iCoord))
+            self._add_link(route_idx, prevCoord, iCoord)
 
             # 상대 경로(o_idx)에도 교차노드 추가
             self.insert_intersection_node(o_idx, n1, n2, (ix, iy, iz), tB)
@@ -457,8 +501,8 @@ class UAMMapApp:
             current_start = (ix, iy, iz)
 
         # 최종 사용자 노드
-        userCoord = self._create_node(route, x, y, z)
-        route["links"].append(((current_start[0], current_start[1]), userCoord))
+        userCoord = self._create_node(route_idx, x, y, z)
+        self._add_link(route_idx, (current_start[0], current_start[1]), userCoord)
 
         # ### 새로 추가된 노드를 last_node로 갱신 ###
         route["last_node"] = userCoord
@@ -466,49 +510,56 @@ class UAMMapApp:
 
     def update_node_position(self, route_idx, old_x, old_y, new_x, new_y, new_z):
         route = routes[route_idx]
-        old_node_name = route["nodes"][(old_x,old_y)]["node_name"]
-
-        # 1) pop old
-        route["nodes"].pop((old_x, old_y), None)
-        # 2) insert new
-        route["nodes"][(new_x, new_y)] = {
-            "z": new_z,
-            "node_name": old_node_name
-        }
+        self.mark_route_dirty(route_idx)
 
-        # 링크 치환
-        old_links = []
-        for ln in route["links"]:
-            if (old_x, old_y) in ln:
-                old_links.append(ln)
-        for ln in old_links:
-            route["links"].remove(ln)
-            a,b = ln
-            # 치환
-            if a == (old_x,old_y): a = (new_x,new_y)
-            if b == (old_x,old_y): b = (new_x,new_y)
-            # 다시 추가
-            route["links"].append((a,b))
+        # 노드 이동 + 연결 링크 치환 (인접 인덱스로 해당 노드 링크만)
+        target, changes = self.route_networks[route_idx].move_node((old_x, old_y), (new_x, new_y), new_z)
+        for old_link, new_link in changes:
+            self.link_index.remove(route_idx, old_link[0], old_link[1])
+            if new_link is not None:
+                self.link_index.insert(route_idx, new_link[0], new_link[1])
 
         # 만약 last_node가 old_x,old_y였으면 업데이트
         if route["last_node"] == (old_x,old_y):
-            route["last_node"] = (new_x, new_y)
+            route["last_node"] = target
 
-    def _create_node(self, route, x, y, z):
+    def _create_node(self, route_idx, x, y, z):
         """
         route에 (x,y,z) 노드를 생성
-        이미 존재하면 그대로 반환
+        이미 존재하면(허용 오차 이내 포함) 그 노드 좌표를 반환
         """
-        if (x, y) in route["nodes"]:
-            return (x, y)
+        network = self.route_networks[route_idx]
+        found = network.find_node(x, y)
+        if found is not None:
+            return found
 
+        route = routes[route_idx]
         route["node_count"] += 1
         node_name = f"{route['name']}-Node{route['node_count']}"
-        route["nodes"][(x, y)] = {
-            "z": z,
-            "node_name": node_name
-        }
-        return (x, y)
+        return network.add_node(x, y, z, node_name)
+
+    def _add_link(self, route_idx, a, b):
+        """링크 추가 (경로 + 공간 인덱스). 이미 있으면 추가하지 않음"""
+        if self.route_networks[route_idx].add_link(a, b):
+            self.link_index.insert(route_idx, a, b)
+            self.mark_route_dirty(route_idx)
+
+    def _remove_link(self, route_idx, link):
+        """링크 삭제 (경로 + 공간 인덱스). 없으면 False"""
+        if not self.route_networks[route_idx].remove_link(link[0], link[1]):
+            return False
+        self.link_index.remove(route_idx, link[0], link[1])
+        self.mark_route_dirty(route_idx)
+        return True
+
+    def rebuild_link_index(self):
+        """전역 routes를 통째로 바꾼 뒤(로드 등) 인덱스 재구성"""
+        self.link_index.rebuild(routes)
+
+    def rebuild_indexes(self):
+        """경로별 노드/링크 인덱스 + 링크 공간 인덱스 재구성"""
+        self.route_networks = [RouteNetwork(r) for r in routes]
+        self.rebuild_link_index()
 
     def find_all_intersections(self, pA, pB, this_route_idx):
         """
@@ -526,28 +577,30 @@ class UAMMapApp:
         (x2, y2, z2) = pB
 
         results = []
-        for r_idx, routeB in enumerate(routes):
+        # 선분이 지나가는 격자 셀의 링크만 후보로 검사 (경로/링크 순서대로)
+        candidates = sorted(self.link_index.query(x1, y1, x2, y2), key=lambda key: key[0])
+        for (r_idx, n1, n2) in candidates:
             if r_idx == this_route_idx:
                 continue
-            for (n1, n2) in routeB["links"]:
-                (xa, ya) = n1
-                (xb, yb) = n2
-                zb_a = routeB["nodes"][n1]["z"]
-                zb_b = routeB["nodes"][n2]["z"]
-
-                # 2D 교차
-                inter = self.line_intersection_2d((x1, y1), (x2, y2),
-                                                  (xa, ya), (xb, yb))
-                if not inter:
-                    continue
-                iX, iY, tA, tB = inter
-                if 0 < tA < 1 and 0 < tB < 1:
-                    # z 보간
-                    zA = z1 + tA * (z2 - z1)
-                    zB = zb_a + tB * (zb_b - zb_a)
-                    if abs(zA - zB) < 1.0:
-                        iZ = (zA + zB)/2
-                        results.append((tA, iX, iY, iZ, r_idx, n1, n2, tB))
+            routeB = routes[r_idx]
+            (xa, ya) = n1
+            (xb, yb) = n2
+            zb_a = routeB["nodes"][n1]["z"]
+            zb_b = routeB["nodes"][n2]["z"]
+
+            # 2D 교차
+            inter = self.line_intersection_2d((x1, y1), (x2, y2),
+                                              (xa, ya), (xb, yb))
+            if not inter:
+                continue
+            iX, iY, tA, tB = inter
+            if 0 < tA < 1 and 0 < tB < 1:
+                # z 보간
+                zA = z1 + tA * (z2 - z1)
+                zB = zb_a + tB * (zb_b - zb_a)
+                if abs(zA - zB) < 1.0:
+                    iZ = (zA + zB)/2
+                    results.append((tA, iX, iY, iZ, r_idx, n1, n2, tB))
 
         return results
 
@@ -557,26 +610,22 @@ class UAMMapApp:
         교차점 iCoord=(iX,iY,iZ)를 노드로 추가한다.
         이미 있는 노드면 추가 X
         """
-        route = routes[route_idx]
+        self.mark_route_dirty(route_idx)
         (iX, iY, iZ) = iCoord
 
-        if (iX, iY) in route["nodes"]:
+        if self.route_networks[route_idx].find_node(iX, iY) is not None:
             return
 
         # 새 노드 생성
-        route["node_count"] += 1
-        node_name = f"{route['name']}-Node{route['node_count']}"
-        route["nodes"][(iX, iY)] = {"z": iZ, "node_name": node_name}
+        iNode = self._create_node(route_idx, iX, iY, iZ)
 
         # 원래 링크 제거
-        if (n1, n2) in route["links"]:
-            route["links"].remove((n1, n2))
-        elif (n2, n1) in route["links"]:
-            route["links"].remove((n2, n1))
+        if not self._remove_link(route_idx, (n1, n2)):
+            self._remove_link(route_idx, (n2, n1))
 
         # 새 링크 2개
-        route["links"].append((n1, (iX, iY)))
-        route["links"].append(((iX, iY), n2))
+        self._add_link(route_idx, n1, iNode)
+        self._add_link(route_idx, iNode, n2)
 
     def line_intersection_2d(self, p1, p2, p3, p4):
         """
@@ -621,6 +670,7 @@ class UAMMapApp:
             "radius_inner": 700
         }
         vertiports.append(vp)
+        self.mark_vertiport_dirty(len(vertiports) - 1)
 
     ###########################################################################
     # Canvas 이벤트
@@ -656,7 +706,7 @@ class UAMMapApp:
         elif self.input_mode == "UPDATE_NODE":
             if not self.node_to_update:
                 return
-            (r_idx, old_x, old_y, old_name, old_links) = self.node_to_update
+            (r_idx, old_x, old_y) = self.node_to_update
 
             new_z = self._ask_integer_near_mouse(
                 event.x, event.y,
@@ -671,41 +721,8 @@ class UAMMapApp:
                 self.node_to_update = None
                 return
 
-            route = routes[r_idx]
-            # 기존 노드 삭제
-            route["nodes"].pop((old_x, old_y), None)
-            # 새 노드 등록(노드명 그대로 사용)
-            route["nodes"][(sx, sy)] = {
-                "z": new_z,
-                "node_name": old_name
-            }
-
-            # 링크 재설정
-            new_links = []
-            for ln in old_links:
-                a, b = ln
-                if a == (old_x, old_y):
-                    a = (sx, sy)
-                if b == (old_x, old_y):
-                    b = (sx, sy)
-                new_links.append((a, b))
-
-            # route["links"]에서 old_links 제거
-            for ln in old_links:
-                if ln in route["links"]:
-                    route["links"].remove(ln)
-                rev = (ln[1], ln[0])
-                if rev in route["links"]:
-                    route["links"].remove(rev)
-
-            # 새 링크 등록(중복되면 제외)
-            for nl in new_links:
-                if nl not in route["links"] and (nl[1], nl[0]) not in route["links"]:
-                    route["links"].append(nl)
-
-            # ### 추가: 만약 이 노드가 last_node면 갱신 ###
-            if route["last_node"] == (old_x, old_y):
-                route["last_node"] = (sx, sy)
+            # 노드 이동(노드명 그대로), 연결 링크 치환, last_node 갱신
+            self.update_node_position(r_idx, old_x, old_y, sx, sy, new_z)
 
             self.input_mode = "NODE"
             self.node_to_update = None
@@ -725,15 +742,8 @@ class UAMMapApp:
         route = routes[r_idx]
         if (old_x, old_y) not in route["nodes"]:
             return
-        old_node_name = route["nodes"][(old_x, old_y)]["node_name"]
-        # 해당 노드에 연결된 링크 수집
-        old_links = []
-        for ln in route["links"]:
-            if (old_x, old_y) in ln:
-                old_links.append(ln)
-
-        self.node_to_update = (r_idx, old_x, old_y,
-                               old_node_name, old_links)
+        # 연결 링크는 위치 지정 시 인접 인덱스로 찾음
+        self.node_to_update = (r_idx, old_x, old_y)
         self.input_mode = "UPDATE_NODE"
         messagebox.showinfo("노드 위치 변경",
                             "지도를 클릭하여 새 위치를 지정하세요.")
@@ -798,127 +808,248 @@ class UAMMapApp:
     ###########################################################################
     def refresh_treeview(self):
         self.tree.delete(*self.tree.get_children())
-        for i, route in enumerate(routes):
-            for (x, y), nd in route["nodes"].items():
-                rname = route["name"]
-                nname = nd["node_name"]
-                zz = nd["z"]
-                iid = f"{i}-{x}-{y}"
-                self.tree.insert("", "end", iid=iid,
-                                 values=(rname, nname, x, y, zz))
+        self.tree_rows = {}
+        for i in range(len(routes)):
+            self.refresh_treeview_route(i)
+
+    def refresh_treeview_route(self, i):
+        """경로 i의 행만 지우고 다시 넣음 (다른 경로 행은 그대로)"""
+        old_rows = self.tree_rows.pop(i, [])
+        if old_rows:
+            self.tree.delete(*old_rows)
+        if i >= len(routes):
+            return
+        # 앞 경로들의 행 뒤에 삽입해 경로 순서 유지
+        index = sum(len(self.tree_rows.get(k, ())) for k in range(i))
+        route = routes[i]
+        rows = []
+        for (x, y), nd in route["nodes"].items():
+            iid = f"{i}-{x}-{y}"
+            self.tree.insert("", index + len(rows), iid=iid,
+                             values=(route["name"], nd["node_name"], x, y, nd["z"]))
+            rows.append(iid)
+        self.tree_rows[i] = rows
+
+    ###########################################################################
+    # 변경 추적
+    ###########################################################################
+    def mark_route_dirty(self, route_idx):
+        self.dirty_routes.add(route_idx)
+
+    def mark_vertiport_dirty(self, vp_idx):
+        self.dirty_vertiports.add(vp_idx)
+
+    def mark_all_dirty(self):
+        """데이터를 통째로 바꾼 경우(로드/Clear/가져오기) - 다음 refresh_all에서 전부 다시 그림"""
+        self.full_redraw = True
 
     ###########################################################################
     # 그리기 (2D/3D)
+    # 2D: 경로 i의 item은 tag "route{i}", 버티포트 j는 "vp{j}" → 바뀐 것만 delete 후 다시 생성
+    # 3D: 경로/버티포트별 artist 목록을 보관 → 바뀐 것만 remove 후 다시 생성
     ###########################################################################
+    def update_view_rect(self):
+        """
+        현재 보이는 World 영역 (x0, y0, x1, y1)을 계산 (VIEW_MARGIN 비율만큼 여유 포함).
+        2D 그리기는 이 영역과 겹치는 것만 만든다.
+        """
+        w = self.CANVAS_SIZE
+        h = self.CANVAS_SIZE
+        x0, y0 = self.canvas_to_world(self.canvas_2d.canvasx(0), self.canvas_2d.canvasy(0))
+        x1, y1 = self.canvas_to_world(self.canvas_2d.canvasx(w), self.canvas_2d.canvasy(h))
+        mx = (x1 - x0) * VIEW_MARGIN
+        my = (y1 - y0) * VIEW_MARGIN
+        self.view_rect = (x0 - mx, y0 - my, x1 + mx, y1 + my)
+
+    def px_per_meter(self):
+        return (self.CANVAS_SIZE / self.GRID_COUNT) * self.zoom_level / self.GRID_SIZE
+
+    def show_node_labels(self):
+        return self.zoom_level >= LABEL_MIN_ZOOM
+
+    def in_view(self, x0, y0, x1, y1):
+        """World 사각형 (x0,y0)-(x1,y1)이 view_rect와 겹치면 True"""
+        vx0, vy0, vx1, vy1 = self.view_rect
+        return x1 >= vx0 and x0 <= vx1 and y1 >= vy0 and y0 <= vy1
+
     def draw_grid(self):
+        """
+        보이는 영역의 격자만 그림. 간격은 GRID_SIZE에서 1-2-5 배수로 늘려
+        화면상 간격이 GRID_MIN_PX 이상이 되도록 (줌 아웃해도 선 수 일정)
+        """
         self.canvas_2d.delete("grid")
-        step_px = (self.CANVAS_SIZE // self.GRID_COUNT) * self.zoom_level
-        for i in range(self.GRID_COUNT + 1):
-            c = i * step_px
-            self.canvas_2d.create_line(c, 0, c, self.CANVAS_SIZE,
+        px_per_m = self.px_per_meter()
+        spacing = self.GRID_SIZE
+        k = 0
+        while spacing * px_per_m < GRID_MIN_PX:
+            k += 1
+            spacing = self.GRID_SIZE * (1, 2, 5)[k % 3] * 10 ** (k // 3)
+
+        vx0, vy0, vx1, vy1 = self.view_rect
+        x0, x1 = max(vx0, 0), min(vx1, self.MAP_SIZE)
+        y0, y1 = max(vy0, 0), min(vy1, self.MAP_SIZE)
+        if x0 > x1 or y0 > y1:
+            return
+        _, top = self.world_to_canvas(0, y0)
+        _, bottom = self.world_to_canvas(0, y1)
+        left, _ = self.world_to_canvas(x0, 0)
+        right, _ = self.world_to_canvas(x1, 0)
+        for i in range(math.ceil(x0 / spacing), math.floor(x1 / spacing) + 1):
+            c, _ = self.world_to_canvas(i * spacing, 0)
+            self.canvas_2d.create_line(c, top, c, bottom,
                                        fill="lightgray", tags="grid")
-            self.canvas_2d.create_line(0, c, self.CANVAS_SIZE, c,
+        for i in range(math.ceil(y0 / spacing), math.floor(y1 / spacing) + 1):
+            _, c = self.world_to_canvas(0, i * spacing)
+            self.canvas_2d.create_line(left, c, right, c,
                                        fill="lightgray", tags="grid")
+        self.canvas_2d.tag_lower("grid")
 
+    def visible_links(self):
+        """view_rect와 겹치는 링크를 경로별로 {route_idx: [(n1, n2), ...]} (링크 격자 인덱스 조회)"""
+        by_route = {}
+        for r_idx, n1, n2 in self.link_index.query_rect(*self.view_rect):
+            by_route.setdefault(r_idx, []).append((n1, n2))
+        return by_route
 
     def draw_all_routes_2d(self):
-        for i, route in enumerate(routes):
-            color = ROUTE_COLORS[i % len(ROUTE_COLORS)]
-            # 노드
-            for (x, y), nd in route["nodes"].items():
-                cx, cy = self.world_to_canvas(x, y)
-                self.canvas_2d.create_oval(cx-4, cy-4, cx+4, cy+4,
-                                           fill=color, outline=color)
+        links = self.visible_links()
+        for i in range(len(routes)):
+            self.draw_route_2d(i, links.get(i, []))
+
+    def draw_route_2d(self, i, links=None):
+        """
+        경로 i 중 view_rect 안의 노드/링크만 그림 (노드는 경로의 영역 격자, 링크는 링크 격자 인덱스로 조회하므로
+        화면 밖 항목은 훑지 않음). links: 미리 조회한 이 경로의 보이는 링크 후보 (None이면 조회)
+        줌 아웃(LABEL_MIN_ZOOM 미만) 시 노드 이름을 숨기고, 화면상 NODE_CLUSTER_PX 칸에 모인 노드는 점 하나로
+        """
+        tag = f"route{i}"
+        self.canvas_2d.delete(tag)
+        if i >= len(routes):
+            return
+        route = routes[i]
+        color = ROUTE_COLORS[i % len(ROUTE_COLORS)]
+        labels = self.show_node_labels()
+        drawn = set()
+        if links is None:
+            links = self.visible_links().get(i, [])
+        # 노드
+        nodes = route["nodes"]
+        for x, y in self.route_networks[i].nodes_in_rect(*self.view_rect):
+            nd = nodes[(x, y)]
+            cx, cy = self.world_to_canvas(x, y)
+            if not labels:
+                cell = (cx // NODE_CLUSTER_PX, cy // NODE_CLUSTER_PX)
+                if cell in drawn:
+                    continue
+                drawn.add(cell)
+            self.canvas_2d.create_oval(cx-4, cy-4, cx+4, cy+4,
+                                       fill=color, outline=color, tags=tag)
+            if labels:
                 self.canvas_2d.create_text(cx+10, cy,
                                            text=nd["node_name"],
                                            anchor="w", fill=color,
-                                           font=("맑은 고딕", 8))
-            # 링크
-            for (n1, n2) in route["links"]:
-                x1, y1 = n1
-                x2, y2 = n2
-                cx1, cy1 = self.world_to_canvas(x1, y1)
-                cx2, cy2 = self.world_to_canvas(x2, y2)
-                self.canvas_2d.create_line(cx1, cy1, cx2, cy2,
-                                           fill=color, width=2)
+                                           font=("맑은 고딕", 8), tags=tag)
+        # 링크
+        for (n1, n2) in links:
+            x1, y1 = n1
+            x2, y2 = n2
+            if not self.in_view(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+                continue
+            cx1, cy1 = self.world_to_canvas(x1, y1)
+            cx2, cy2 = self.world_to_canvas(x2, y2)
+            if cx1 == cx2 and cy1 == cy2:
+                continue
+            self.canvas_2d.create_line(cx1, cy1, cx2, cy2,
+                                       fill=color, width=2, tags=tag)
 
     def draw_all_vertiports_2d(self):
-        for vp in vertiports:
-            x, y = vp["x"], vp["y"]
-            cx, cy = self.world_to_canvas(x, y)
-            self.canvas_2d.create_text(cx, cy-10,
-                                       text=vp["name"],
-                                       anchor="s", fill="black",
-                                       font=("맑은 고딕", 9, "bold"))
-            # Outer
-            r_out_px = int(vp["radius_outer"]
-                           / (self.MAP_SIZE/self.CANVAS_SIZE)
-                           * self.zoom_level)
-            self.canvas_2d.create_oval(cx-r_out_px, cy-r_out_px,
-                                       cx+r_out_px, cy+r_out_px,
-                                       outline="gray", width=2)
-            # Inner
-            r_in_px = int(vp["radius_inner"]
-                          / (self.MAP_SIZE/self.CANVAS_SIZE)
-                          * self.zoom_level)
-            self.canvas_2d.create_oval(cx-r_in_px, cy-r_in_px,
-                                       cx+r_in_px, cy+r_in_px,
-                                       outline="gray", width=2, dash=(4,2))
+        for i in range(len(vertiports)):
+            self.draw_vertiport_2d(i)
+
+    def draw_vertiport_2d(self, i):
+        tag = f"vp{i}"
+        self.canvas_2d.delete(tag)
+        if i >= len(vertiports):
+            return
+        vp = vertiports[i]
+        x, y = vp["x"], vp["y"]
+        r = vp["radius_outer"]
+        if not self.in_view(x - r, y - r, x + r, y + r):
+            return
+        cx, cy = self.world_to_canvas(x, y)
+        self.canvas_2d.create_text(cx, cy-10,
+                                   text=vp["name"],
+                                   anchor="s", fill="black",
+                                   font=("맑은 고딕", 9, "bold"), tags=tag)
+        # Outer
+        r_out_px = int(vp["radius_outer"]
+                       / (self.MAP_SIZE/self.CANVAS_SIZE)
+                       * self.zoom_level)
+        self.canvas_2d.create_oval(cx-r_out_px, cy-r_out_px,
+                                   cx+r_out_px, cy+r_out_px,
+                                   outline="gray", width=2, tags=tag)
+        # Inner
+        r_in_px = int(vp["radius_inner"]
+                      / (self.MAP_SIZE/self.CANVAS_SIZE)
+                      * self.zoom_level)
+        self.canvas_2d.create_oval(cx-r_in_px, cy-r_in_px,
+                                   cx+r_in_px, cy+r_in_px,
+                                   outline="gray", width=2, dash=(4,2), tags=tag)
 
     def draw_all_routes_3d(self):
-        for i, route in enumerate(routes):
-            color = ROUTE_COLORS[i % len(ROUTE_COLORS)]
-            xs, ys, zs = [], [], []
-            for (x, y), nd in route["nodes"].items():
-                xs.append(x)
-                ys.append(y)
-                zs.append(nd["z"])
-            self.ax.scatter(xs, ys, zs, marker='o', color=color,
-                            label=route["name"])
-            # 링크
-            for (n1, n2) in route["links"]:
-                x1, y1 = n1
-                x2, y2 = n2
-                z1 = route["nodes"][n1]["z"]
-                z2 = route["nodes"][n2]["z"]
-                self.ax.plot([x1, x2], [y1, y2], [z1, z2], color=color)
+        for i in range(len(routes)):
+            self.draw_route_3d(i)
+
+    def draw_route_3d(self, i):
+        """경로 i: 노드 scatter 1개 + 링크 Line3DCollection 1개"""
+        for artist in self.route_artists.pop(i, []):
+            artist.remove()
+        if i >= len(routes):
+            return
+        route = routes[i]
+        color = ROUTE_COLORS[i % len(ROUTE_COLORS)]
+        nodes = route["nodes"]
+        xyz = np.array([(x, y, nd["z"]) for (x, y), nd in nodes.items()], dtype=float).reshape(-1, 3)
+        artists = [self.ax.scatter(xyz[:, 0], xyz[:, 1], xyz[:, 2], marker='o', color=color,
+                                   label=route["name"])]
+        # 링크
+        if route["links"]:
+            segments = [((n1[0], n1[1], nodes[n1]["z"]), (n2[0], n2[1], nodes[n2]["z"]))
+                        for n1, n2 in route["links"]]
+            lines = Line3DCollection(segments, colors=color)
+            self.ax.add_collection3d(lines)
+            artists.append(lines)
+        self.route_artists[i] = artists
 
     def draw_all_vertiports_3d(self):
         """
         버티포트를 3D에서 투명한 원통형으로 표시
-        - z=0 ~ 1000(ft) 라고 가정(필요시 변경)
-        - alpha=0.2 (투명도)
+        - 전체 버티포트의 outer/inner 원통을 Poly3DCollection 하나로 합쳐 그림
+        - z=0 ~ CYLINDER_HEIGHT(ft), alpha=0.2 (투명도)
         """
-        for vp in vertiports:
-            cx, cy = vp["x"], vp["y"]
-            self.ax.scatter(cx, cy, vp["z"],
-                            marker='^', color="black", label=vp["name"])
-
-            # 원통: theta=[0,2pi], z=[0,1000]
-            # Outer
-            height = 2000
-            theta = np.linspace(0, 2*np.pi, 30)
-            zvals = np.linspace(0, height, 5)
-            theta_grid, z_grid = np.meshgrid(theta, zvals)
-            X = cx + vp["radius_outer"] * np.cos(theta_grid)
-            Y = cy + vp["radius_outer"] * np.sin(theta_grid)
-            Z = z_grid
-            self.ax.plot_surface(X, Y, Z,
-                                 color='gray',
-                                 alpha=0.2,
-                                 linewidth=0,
-                                 shade=True)
-
-            # Inner
-            X2 = cx + vp["radius_inner"] * np.cos(theta_grid)
-            Y2 = cy + vp["radius_inner"] * np.sin(theta_grid)
-            Z2 = z_grid
-            self.ax.plot_surface(X2, Y2, Z2,
-                                 color='gray',
-                                 alpha=0.2,
-                                 linewidth=0,
-                                 shade=True)
-            
+        for artist in self.vp_artists:
+            artist.remove()
+        self.vp_artists = []
+        if not vertiports:
+            return
+        centers = np.array([(vp["x"], vp["y"], vp["z"]) for vp in vertiports], dtype=float)
+        self.vp_artists.append(self.ax.scatter(centers[:, 0], centers[:, 1], centers[:, 2],
+                                               marker='^', color="black", label="버티포트"))
+
+        # 원통: 단위 원통을 (반지름, 반지름, 높이)로 늘리고 중심으로 이동 - outer, inner 순
+        radii = np.array([r for vp in vertiports for r in (vp["radius_outer"], vp["radius_inner"])],
+                         dtype=float)
+        scale = np.stack([radii, radii, np.full_like(radii, CYLINDER_HEIGHT)], axis=1)
+        offset = np.repeat(centers * (1, 1, 0), 2, axis=0)
+        faces = UNIT_CYLINDER[None] * scale[:, None, None, :] + offset[:, None, None, :]
+        faces = faces.reshape(-1, 4, 3)
+        mesh = Poly3DCollection(faces, facecolor='gray', alpha=0.2, linewidth=0)
+        self.ax.add_collection3d(mesh)
+        self.vp_artists.append(mesh)
+        # 원통 전체가 보이도록 축 범위 갱신
+        lo, hi = faces.reshape(-1, 3).min(axis=0), faces.reshape(-1, 3).max(axis=0)
+        self.ax.auto_scale_xyz([lo[0], hi[0]], [lo[1], hi[1]], [lo[2], hi[2]], had_data=True)
+
     def show_corner_coords(self):
         """
         Canvas (0,0), (width,0), (0,height), (width,height)에 해당하는
@@ -981,33 +1112,68 @@ class UAMMapApp:
         )
 
     def refresh_all(self):
-        # 2D
-        self.draw_grid()
-        self.canvas_2d.delete("all")
-        self.draw_grid()  # 그리드 다시
-        self.draw_all_routes_2d()
-        self.draw_all_vertiports_2d()
+        """
+        변경 추적 결과에 따라 필요한 부분만 다시 그림.
+        - full_redraw (로드/Clear/가져오기): 2D/3D/트리뷰 전체
+        - view_dirty (줌/팬): 2D만 전체 (3D/트리뷰는 그대로)
+        2D는 보이는 영역(view_rect)과 겹치는 것만 그림
+        - dirty_routes / dirty_vertiports: 해당 경로/버티포트의 2D item, 3D artist, 트리뷰 행만
+        """
+        self.update_view_rect()
+        if self.full_redraw:
+            # 2D
+            self.canvas_2d.delete("all")
+            self.draw_grid()
+            self.draw_all_routes_2d()
+            self.draw_all_vertiports_2d()
+
+            # 3D
+            self.ax.clear()
+            self.route_artists.clear()
+            self.vp_artists = []
+            self.ax.set_title("UAM 3D 항로 설계")
+            self.draw_all_routes_3d()
+            self.draw_all_vertiports_3d()
+            self.ax.set_xlabel("X(m)")
+            self.ax.set_ylabel("Y(m)")
+            self.ax.set_zlabel("Z(ft)")
+            self.update_legend()
+            self.canvas_3d.draw_idle()
+
+            # 트리뷰
+            self.refresh_treeview()
+        else:
+            if self.view_dirty:
+                self.canvas_2d.delete("all")
+                self.draw_grid()
+                self.draw_all_routes_2d()
+                self.draw_all_vertiports_2d()
+            else:
+                for i in sorted(self.dirty_routes):
+                    self.draw_route_2d(i)
+                for i in sorted(self.dirty_vertiports):
+                    self.draw_vertiport_2d(i)
+            if self.dirty_routes or self.dirty_vertiports:
+                for i in sorted(self.dirty_routes):
+                    self.draw_route_3d(i)
+                    self.refresh_treeview_route(i)
+                if self.dirty_vertiports:
+                    self.draw_all_vertiports_3d()
+                self.update_legend()
+                self.canvas_3d.draw_idle()
+
+        self.full_redraw = False
+        self.view_dirty = False
+        self.dirty_routes.clear()
+        self.dirty_vertiports.clear()
 
-        # 3D
-        self.ax.clear()
-        self.ax.set_title("UAM 3D 항로 설계")
-        self.draw_all_routes_3d()
-        self.draw_all_vertiports_3d()
-        self.ax.set_xlabel("X(m)")
-        self.ax.set_ylabel("Y(m)")
-        self.ax.set_zlabel("Z(ft)")
+        self.show_corner_coords()
 
-        # 범례 중복 제거
+    def update_legend(self):
+        # 범례 중복 제거 (위치 고정 - "best"는 모든 원통 면을 검사하므로 느림)
         handles, labels = self.ax.get_legend_handles_labels()
         unique = dict(zip(labels, handles))
-        self.ax.legend(unique.values(), unique.keys())
-
-        self.canvas_3d.draw()
-
-        # 트리뷰
-        self.refresh_treeview()
-
-        self.show_corner_coords()
+        self.ax.legend(unique.values(), unique.keys(), loc="upper right")
 
 ###############################################################################
 # 실행
@@ -0,0 +1,138 @@
+import math
+
+import numpy as np
+
+
+class Trajectory4D:
+    """
+    비행체 하나의 구간 선형 (t, x, y, z) 일정.
+    경로가 정해지는 시점(지상 경로 계획, 이륙, 착륙 후 지상 경로, 게이트 대기)에 UAMPlane이 앞으로의 구간을 미리 기록하고,
+    계획과 달라지면(노드 대기, 우회) 그 시각 이후만 다시 기록한다. 마지막 점 이후에는 그 위치에 머무는 것으로 본다.
+    좌표는 UAMPlane.current_pos와 같음 (지상: ground map, 공중: 공역 좌표), z는 고도 (지상 0)
+    """
+
+    def __init__(self):
+        self.t = []
+        self.x = []
+        self.y = []
+        self.z = []
+        self.version = 0
+        # 지상 경로 노드 index -> 그 노드 도착 점(knot) index. 대기 후 재계획 시 그 점 이후를 다시 쓴다
+        self.ground_knots = {}
+        self.stale = False          # 노드 대기/우회로 남은 지상 일정이 틀어졌으면 True
+
+    def __len__(self):
+        return len(self.t)
+
+    @property
+    def last(self):
+        return len(self.t) - 1
+
+    def cut(self, knot):
+        """knot index 이후의 점을 모두 버림"""
+        for values in (self.t, self.x, self.y, self.z):
+            del values[knot + 1:]
+        self.version += 1
+
+    def restart(self, t0, x, y, z):
+        """t0 이후의 예정 구간을 버리고 (t0, x, y, z)에서 다시 시작"""
+        t = self.t
+        k = len(t)
+        while k and t[k - 1] > t0:
+            k -= 1
+        self.cut(k - 1)
+        self.append(t0, x, y, z)
+
+    def append(self, t, x, y, z):
+        self.t.append(t)
+        self.x.append(x)
+        self.y.append(y)
+        self.z.append(z)
+        self.version += 1
+
+    def hold_until(self, t):
+        """현재 마지막 위치에서 t까지 머무름"""
+        if self.t and t > self.t[-1]:
+            self.append(t, self.x[-1], self.y[-1], self.z[-1])
+
+    def move_to(self, x, y, z, speed):
+        """마지막 위치에서 (x, y, z)까지 수평 속도 speed로 이동 (시뮬레이션과 같이 수평 거리 기준)"""
+        dist = math.hypot(x - self.x[-1], y - self.y[-1])
+        dt = dist / speed if speed > 0 else 0.0
+        self.append(self.t[-1] + dt, x, y, z)
+
+    def position(self, t):
+        """시각 t의 (x, y, z)"""
+        ts = self.t
+        return (float(np.interp(t, ts, self.x)), float(np.interp(t, ts, self.y)),
+                float(np.interp(t, ts, self.z)))
+
+
+class FleetTrajectories:
+    """
+    비행체 전체의 Trajectory4D를 붙이고, 임의 시각의 위치를 한 번에 계산한다.
+    모든 비행체의 점을 한 배열로 이어 붙이고 비행체 i의 시각에 i * span을 더해(구간이 겹치지 않게)
+    np.interp 한 번으로 전 비행체를 보간한다. 배열은 일정이 바뀐 뒤 처음 조회할 때만,
+    바뀐 비행체의 점만 다시 읽어 만든다.
+    """
+
+    def __init__(self, planes, start_time=0.0):
+        self.planes = list(planes)
+        self.tracks = []
+        for plane in self.planes:
+            track = Trajectory4D()
+            x, y = plane.current_pos
+            track.append(start_time, x, y, plane.current_alt)
+            if plane.state == "at_gate":
+                track.hold_until(plane.departure_time)
+            plane.trajectory = track
+            self.tracks.append(track)
+        self._versions = None
+        self._compiled = None
+        self._arrays = [None] * len(self.tracks)   # 비행체별 (4, 점 수) 배열 캐시
+
+    def detach(self):
+        for plane, track in zip(self.planes, self.tracks):
+            if plane.trajectory is track:
+                plane.trajectory = None
+
+    def compile(self):
+        """(시각, x, y, z) 연결 배열과 비행체별 시작/끝 시각, 시각 이동량"""
+        versions = [track.version for track in self.tracks]
+        if versions == self._versions:
+            return self._compiled
+        arrays = self._arrays
+        old = self._versions
+        for i, track in enumerate(self.tracks):
+            if old is None or old[i] != versions[i]:
+                arrays[i] = np.array((track.t, track.x, track.y, track.z), dtype=float)
+        counts = np.array([a.shape[1] for a in arrays])
+        data = np.concatenate(arrays, axis=1) if arrays else np.empty((4, 0))
+        t = data[0]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        first = t[starts]
+        last = t[starts + counts - 1]
+        span = (last.max() - first.min() + 1.0) if len(t) else 1.0
+        shift = np.arange(len(self.tracks)) * span
+        xyz = data[1:].T
+        self._compiled = (t + np.repeat(shift, counts), xyz, first, last, shift)
+        self._versions = versions
+        return self._compiled
+
+    def positions(self, times):
+        """
+        times(스칼라 또는 배열)의 전 비행체 위치.
+        반환: (xyz, valid) - xyz shape (..., N, 3), valid는 그 시각에 일정이 시작된 비행체 (..., N)
+        첫 점 이전은 첫 위치, 마지막 점 이후는 마지막 위치
+        """
+        t_shifted, xyz, first, last, shift = self.compile()
+        times = np.asarray(times, dtype=float)[..., None]
+        query = np.clip(times, first, last) + shift
+        out = np.stack([np.interp(query, t_shifted, xyz[:, col]) for col in range(3)], axis=-1)
+        return out, times >= first
+
+    def sample(self, t0, t1, step):
+        """t0 ~ t1을 step 간격으로 (시각 배열, 위치 (T, N, 3), valid (T, N))"""
+        times = np.arange(t0, t1 + step * 0.5, step)
+        xyz, valid = self.positions(times)
+        return times, xyz, valid
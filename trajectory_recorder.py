@@ -0,0 +1,178 @@
+import json
+import numpy as np
+from fleet_arrays import STATE_NAMES, STATE_CODES, DONE, IN_AIR
+
+# 레코드 1행: 시각, 비행체 id, 위치, 상태 코드, vertiport id
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("plane", "<i4"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("z", "<f4"),
+    ("state", "i1"),
+    ("vertiport", "<i2"),   # 지상: 해당 ground map의 vertiport, 공중: 목적지 vertiport
+])
+
+# .npy 헤더 고정 길이 (종료 시 행 수만 바꿔 다시 쓴다)
+_HEADER_SIZE = 256
+
+
+def _npy_header(n_rows):
+    header = {"descr": np.lib.format.dtype_to_descr(RECORD_DTYPE),
+              "fortran_order": False, "shape": (n_rows,)}
+    text = repr(header).encode("latin1")
+    pad = _HEADER_SIZE - 10 - len(text) - 1
+    return b"\x93NUMPY\x01\x00" + (_HEADER_SIZE - 10).to_bytes(2, "little") + text + b" " * pad + b"\n"
+
+
+class TrajectoryRecorder:
+    """
+    SimulationEngine에 붙여 매 tick(또는 every tick마다) 비행체 상태를 기록.
+    event 모드는 tick이 없으므로 엔진이 every * time_step * acceleration 초 간격 시각마다 snapshot을 호출한다
+    (이벤트 사이 위치는 sync_positions로 보간되므로 다른 모드와 같은 시각 격자로 기록됨).
+    - 미리 할당한 NumPy 블록(chunk_rows 행)에 채우고, 가득 차면 파일 끝에 순차 기록
+    - 결과는 하나의 .npy 파일 (np.load(path, mmap_mode="r")로 메모리 매핑해서 읽기)
+    - 비행체/버티포트 이름 등 메타데이터는 path + ".meta.json"
+      (close 시 공중 비행체 x/y 범위 "air_bounds" [xmin, xmax, ymin, ymax]와
+       기록 시각별 시작 행 "frames" {"times", "starts"}를 함께 기록 → 재생 시 time 열을 다시 읽지 않음)
+    RAM 사용량은 chunk_rows에만 비례한다.
+    """
+
+    def __init__(self, path, planes, vertiports=(), every=1, chunk_rows=1 << 16):
+        self.path = path
+        self.planes = list(planes)
+        self.vertiports = list(vertiports)
+        self.every = every
+        self.plane_ids = {p: i for i, p in enumerate(self.planes)}
+        self.vp_ids = {vp: i for i, vp in enumerate(self.vertiports)}
+        self.block = np.zeros(chunk_rows, dtype=RECORD_DTYPE)
+        self.fill = 0
+        self.rows_written = 0
+        self.ticks = 0
+        self.air_bounds = None   # 공중 비행체 [xmin, xmax, ymin, ymax] (flush마다 블록 단위로 갱신)
+        self.frame_times = []    # 기록 시각 (행이 있는 시각만)
+        self.frame_starts = []   # 그 시각의 첫 행 번호
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(0))
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "planes": [p.name for p in self.planes],
+            "vertiports": [{"name": vp.name, "position": list(vp.position), "offset": list(vp.offset)}
+                           for vp in self.vertiports],
+            "states": list(STATE_NAMES),
+            "every": self.every,
+        }
+        if self.air_bounds is not None:
+            meta["air_bounds"] = self.air_bounds
+        if self._file is None:
+            meta["frames"] = {"times": self.frame_times, "starts": self.frame_starts}
+        with open(self.path + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    def _vertiport_id(self, plane):
+        vp = plane.flight_dest if plane.state in ("in_air", "landing_ground") else plane.flight_origin
+        return self.vp_ids.get(vp, -1)
+
+    def record(self, engine):
+        """engine.update() 후 호출. every tick마다 done이 아닌 비행체를 기록"""
+        self.ticks += 1
+        if (self.ticks - 1) % self.every:
+            return
+        self.snapshot(engine)
+
+    def snapshot(self, engine, xyz=None):
+        """
+        현재 시각(engine.simulation_time)의 done이 아닌 비행체를 기록.
+        xyz: 전 비행체 위치 (N, 3) 배열 (event 모드 4D 일정 보간값, None이면 비행체의 현재 위치 사용)
+        """
+        fleet = engine.fleet
+        if fleet is not None:
+            idx = np.flatnonzero(fleet.state != DONE)
+            x, y = fleet.pos[idx, 0], fleet.pos[idx, 1]
+            z = fleet.alt[idx]
+            state = fleet.state[idx]
+        else:
+            idx = np.array([i for i, p in enumerate(self.planes) if p.state != "done"], dtype=np.int64)
+            active = [self.planes[i] for i in idx]
+            if xyz is not None:
+                x, y, z = xyz[idx, 0], xyz[idx, 1], xyz[idx, 2]
+            else:
+                x = np.array([p.current_pos[0] for p in active], dtype=float)
+                y = np.array([p.current_pos[1] for p in active], dtype=float)
+                z = np.array([getattr(p, "current_alt", 0.0) for p in active], dtype=float)
+            state = np.array([STATE_CODES[p.state] for p in active], dtype=np.int8)
+        vertiport = np.fromiter((self._vertiport_id(self.planes[i]) for i in idx),
+                                dtype=np.int16, count=len(idx))
+        self.append(engine.simulation_time, idx, x, y, z, state, vertiport)
+
+    def append(self, time, plane, x, y, z, state, vertiport):
+        """같은 시각의 여러 행을 블록에 추가 (블록이 차면 flush)"""
+        n = len(plane)
+        if n and (not self.frame_times or self.frame_times[-1] != time):
+            self.frame_times.append(float(time))
+            self.frame_starts.append(self.rows_written + self.fill)
+        start = 0
+        while start < n:
+            room = len(self.block) - self.fill
+            take = min(room, n - start)
+            rows = self.block[self.fill:self.fill + take]
+            sl = slice(start, start + take)
+            rows["time"] = time
+            rows["plane"] = plane[sl]
+            rows["x"] = x[sl]
+            rows["y"] = y[sl]
+            rows["z"] = z[sl]
+            rows["state"] = state[sl]
+            rows["vertiport"] = vertiport[sl]
+            self.fill += take
+            start += take
+            if self.fill == len(self.block):
+                self.flush()
+
+    def flush(self):
+        if self.fill:
+            rows = self.block[:self.fill]
+            self._update_bounds(rows)
+            self._file.write(rows.tobytes())
+            self.rows_written += self.fill
+            self.fill = 0
+
+    def _update_bounds(self, rows):
+        air = rows[rows["state"] == IN_AIR]
+        if not len(air):
+            return
+        bounds = [float(air["x"].min()), float(air["x"].max()), float(air["y"].min()), float(air["y"].max())]
+        if self.air_bounds is not None:
+            old = self.air_bounds
+            bounds = [min(old[0], bounds[0]), max(old[1], bounds[1]), min(old[2], bounds[2]), max(old[3], bounds[3])]
+        self.air_bounds = bounds
+
+    def close(self):
+        """남은 블록을 쓰고 헤더의 행 수를 갱신"""
+        if self._file is None:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(_npy_header(self.rows_written))
+        self._file.close()
+        self._file = None
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_trajectory(path):
+    """기록 파일을 메모리 매핑으로 열기. 반환: (레코드 배열(memmap), 메타데이터 dict)"""
+    records = np.load(path, mmap_mode="r")
+    try:
+        with open(path + ".meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = {}
+    return records, meta
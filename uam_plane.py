@@ -1,13 +1,14 @@
-from dijkstra import dijkstra
 import math
+from ground_procedure import LAND, GATE_FREE, GATE_ARRIVE, FINISH, DEPART, FATO_CLEAR, TAKEOFF_POINT
 
 class UAMPlane:
     def __init__(
         self, name, origin_vp, dest_vp, departure_time,
-        ground_speed=1.34, air_speed=1.34, flight_plan=None
+        ground_speed=1.34, air_speed=1.34, flight_plan=None, turnaround_time=180
     ):
         """
         flight_plan: 방문할 Vertiport 인스턴스 리스트 (출발지 제외 후 마지막에 origin 복귀)
+        turnaround_time: 착륙 후 다음 출발까지 Gate 대기 시간 (초)
         """
         self.name = name
 
@@ -22,6 +23,7 @@ class UAMPlane:
         self.departure_time = departure_time
         self.ground_speed = ground_speed
         self.air_speed = air_speed
+        self.turnaround_time = turnaround_time
         self.flight_plan = flight_plan[:] if flight_plan else []
 
         # === 초기 상태: flight_origin의 Gate에서 대기 ===
@@ -36,65 +38,103 @@ class UAMPlane:
         self.ground_route_nodes = []
         self.ground_route_positions = []
         self.current_ground_index = 0
-        self.in_air_route = []
+        self.taxi_schedule = None     # TaxiPlanner 사용 시 지상 경로 노드별 출발 가능 시각
+        self.in_air_route = []        # 공중 waypoint (x, y) 리스트
+        self.in_air_altitudes = []    # waypoint별 고도
+        self.air_cum = [0.0]          # waypoint까지의 누적 거리
+        self.air_leg = 0              # 현재 비행 중인 구간 (in_air_route[air_leg] → [air_leg+1])
         self.air_progress = 0.0
+        self.current_alt = 0.0
+        # gate/node/지상 절차 타이머 대기 중이면 True. 자원을 넘겨받거나 타이머가 만료되면 resource_ready()로 해제
+        self.waiting = False
+        self.wake_callback = None
+        # 지상 절차 (ground_procedure.GroundProcedure.attach로 설정, 없으면 기존 전이만 사용)
+        self.procedure = None
+        self.procedure_state = None
+        # 4D 일정 (trajectory4d.FleetTrajectories가 설정, 없으면 기록하지 않음)
+        self.trajectory = None
+        # 운항 구간(flight_origin/flight_dest)이 바뀌면 leg_callback(plane) 호출 (시각화 등, 없으면 호출 안 함)
+        self.leg_callback = None
 
-    def plan_ground_route(self, vp, start_node, goal_node):
-        route_nodes = dijkstra(vp.nodes, vp.links, start_node, goal_node)
-        route_positions = []
-        for node in route_nodes:
-            base = vp.nodes[node]
-            pos = (base[0] + vp.offset[0], base[1] + vp.offset[1])
-            route_positions.append(pos)
-        return route_nodes, route_positions
+    def plan_ground_route(self, vp, start_node, goal_node, blocked=None):
+        # layout 공유 경로 테이블 사용 (blocked 노드가 걸리면 vertiport가 동적 탐색으로 대체)
+        return vp.ground_route(start_node, goal_node, blocked)
+
+    def plan_taxi(self, vp, start_node, goal_node, current_time):
+        """
+        지상 경로 설정. vp에 taxi_planner가 있으면 시공간 예약으로 경로와 노드별 출발 시각을 한 번에 정하고,
+        없거나 계획에 실패하면 기존 경로 테이블 + 노드 단위 예약으로 진행
+        """
+        plan = None
+        if vp.taxi_planner is not None:
+            plan = vp.taxi_planner.plan(self, start_node, goal_node, current_time, self.ground_speed)
+        if plan is not None:
+            self.ground_route_nodes, self.taxi_schedule = plan
+            self.ground_route_positions = vp.node_positions(self.ground_route_nodes)
+        else:
+            self.taxi_schedule = None
+            self.ground_route_nodes, self.ground_route_positions = self.plan_ground_route(
+                vp, start_node, goal_node
+            )
+        self.current_ground_index = 0
+        if self.trajectory is not None:
+            self.plan_ground_trajectory(vp, current_time)
+
+    def plan_ground_trajectory(self, vp, t0, start_index=0):
+        """
+        지상 경로의 start_index 노드(시각 t0)부터 끝까지를 4D 일정으로 기록.
+        taxi_schedule이 있으면 노드별 출발 시각까지 대기, 목표가 gate면 gate 위치까지 포함
+        """
+        traj = self.trajectory
+        positions = self.ground_route_positions
+        if not positions:
+            return
+        x, y = positions[start_index]
+        traj.restart(t0, x, y, 0.0)
+        traj.ground_knots = {start_index: traj.last}
+        for k in range(start_index + 1, len(positions)):
+            if self.taxi_schedule is not None:
+                traj.hold_until(self.taxi_schedule[k - 1])
+            traj.move_to(positions[k][0], positions[k][1], 0.0, self.ground_speed)
+            traj.ground_knots[k] = traj.last
+        goal = self.ground_route_nodes[-1]
+        if goal in vp.gates:
+            gx, gy = vp.gates[goal]["pos"]
+            traj.move_to(gx, gy, 0.0, self.ground_speed)
+        traj.stale = False
+
+    def resync_ground_trajectory(self, vp, current_time):
+        """노드 대기/우회 뒤 다시 움직일 때: 현재 노드 도착 이후의 일정을 current_time 출발로 다시 기록"""
+        traj = self.trajectory
+        k = self.current_ground_index
+        knot = traj.ground_knots.get(k)
+        if knot is not None:
+            traj.cut(knot)
+        self.plan_ground_trajectory(vp, current_time, k)
+
+    def taxi_hold(self, current_time):
+        """현재 노드에서 계획된 출발 시각까지 남은 시간 (계획이 없으면 0)"""
+        if self.taxi_schedule is None:
+            return 0.0
+        hold = self.taxi_schedule[self.current_ground_index] - current_time
+        return hold if hold > 1e-9 else 0.0
 
     def update(self, dt, current_time):
+        if self.waiting:
+            return  # vertiport의 통지 전까지 아무것도 하지 않음
+
         if self.state == "at_gate":
-            # 게이트 재할당 시도
-            if self.gate_assigned is None:
-                new_gate = self.current_vp.request_gate(self)
-                if new_gate is None:
-                    return
-                self.gate_assigned = new_gate
-                self.current_pos = self.current_vp.gates[new_gate]["pos"]
-
-            if current_time >= self.departure_time:
-                gate_name = self.gate_assigned
-                self.current_vp.release_gate(self)
-                # 여기서는 flight_origin의 ground map을 사용하여, Gate → FATO_Takeoff 경로 계산
-                self.ground_route_nodes, self.ground_route_positions = self.plan_ground_route(
-                    self.flight_origin, gate_name, "FATO_Takeoff"
-                )
-                self.current_ground_index = 0
-                self.flight_origin.reserve_node(self, self.ground_route_nodes[0])
-                self.state = "takeoff_ground"
+            self.update_at_gate(current_time)
 
         elif self.state == "takeoff_ground":
             vp = self.flight_origin
-            if self.current_ground_index < len(self.ground_route_positions) - 1:
-                next_node = self.ground_route_nodes[self.current_ground_index + 1]
-                if vp.node_occupancy.get(next_node) in [None, self]:
-                    if vp.node_occupancy.get(next_node) is None:
-                        vp.reserve_node(self, next_node)
-                    target_pos = self.ground_route_positions[self.current_ground_index + 1]
-                    self.current_pos = self.move_towards(self.current_pos, target_pos, self.ground_speed, dt)
-                    if self.reached(self.current_pos, target_pos):
-                        prev_node = self.ground_route_nodes[self.current_ground_index]
-                        vp.release_node(self, prev_node)
-                        self.current_ground_index += 1
-            else:
-                vp.release_node(self, self.ground_route_nodes[self.current_ground_index])
-                # in_air 경로는 flight_origin의 FATO_Takeoff → flight_dest의 FATO_Landing 사용
-                start_pt = (vp.nodes["FATO_Takeoff"][0] + vp.offset[0],
-                            vp.nodes["FATO_Takeoff"][1] + vp.offset[1])
-                end_pt = (self.flight_dest.nodes["FATO_Landing"][0] + self.flight_dest.offset[0],
-                        self.flight_dest.nodes["FATO_Landing"][1] + self.flight_dest.offset[1])
-                self.in_air_route = [start_pt, end_pt]
-                self.air_progress = 0.0
-                self.state = "in_air"
+            if not self.ground_route_done():
+                self.step_ground(vp, dt, current_time)
+            elif self.ready_for_takeoff(current_time):
+                self.begin_flight(current_time)
 
         elif self.state == "in_air":
-            total_dist = self.distance(*self.in_air_route)
+            total_dist = self.air_cum[-1]
             if total_dist <= 0:
                 self.air_progress = 1.0
             else:
@@ -102,73 +142,258 @@ class UAMPlane:
 
             if self.air_progress >= 1.0:
                 self.air_progress = 1.0
-                self.current_pos = self.in_air_route[1]
-                # flight_dest의 Gate 할당 (새로운 운항 전까지 고정)
-                gate_name = None
-                for g in self.flight_dest.gates.keys():
-                    if self.flight_dest.gates[g]["occupied"] is None:
-                        gate_name = g
-                        break
-                if gate_name is None:
-                    return  # Gate 대기
-                self.flight_dest.gates[gate_name]["occupied"] = self
-                self.flight_dest.reserve_node(self, gate_name)
-                self.gate_assigned = gate_name
-                self.current_vp = self.flight_dest
-                # flight_dest의 ground map에서 FATO_Landing → Gate 경로 계산
-                self.ground_route_nodes, self.ground_route_positions = self.plan_ground_route(
-                    self.flight_dest, "FATO_Landing", gate_name
-                )
-                self.current_ground_index = 0
-                self.state = "landing_ground"
+                self.current_pos = self.in_air_route[-1]
+                self.current_alt = self.in_air_altitudes[-1]
+                self.arrive_at_dest(current_time)
             else:
-                start_pt, end_pt = self.in_air_route
-                self.current_pos = self.lerp(start_pt, end_pt, self.air_progress)
+                self.current_pos, self.current_alt = self.air_position(self.air_progress)
 
         elif self.state == "landing_ground":
             vp = self.flight_dest
             if self.gate_assigned is None:
                 new_gate = vp.request_gate(self)
                 if new_gate is None:
+                    self.wait_for_gate(vp)
                     return
                 self.gate_assigned = new_gate
+                self.procedure_event(GATE_FREE, current_time)
 
-            if self.current_ground_index < len(self.ground_route_positions) - 1:
-                next_node = self.ground_route_nodes[self.current_ground_index + 1]
-                if vp.node_occupancy.get(next_node) in [None, self]:
-                    if vp.node_occupancy.get(next_node) is None:
-                        vp.reserve_node(self, next_node)
-                    target_pos = self.ground_route_positions[self.current_ground_index + 1]
-                    self.current_pos = self.move_towards(self.current_pos, target_pos, self.ground_speed, dt)
-                    if self.reached(self.current_pos, target_pos):
-                        prev_node = self.ground_route_nodes[self.current_ground_index]
-                        vp.release_node(self, prev_node)
-                        self.current_ground_index += 1
+            if not self.ground_route_done():
+                self.step_ground(vp, dt, current_time)
             else:
                 gate_pos = vp.gates[self.gate_assigned]["pos"]
                 if self.reached(self.current_pos, gate_pos):
-                    # 착륙 완료: 다음 운항 준비
-                    if self.flight_plan:
-                        # **중요**: 이번 운항이 끝났으므로, 새로운 운항을 위해 flight_origin과 flight_dest를 갱신하고,
-                        # current_vp도 새 flight_origin의 ground 좌표계를 사용하도록 업데이트
-                        self.flight_origin = self.flight_dest
-                        self.flight_dest = self.flight_plan.pop(0)
-                        self.current_vp = self.flight_origin  # 갱신!
-                        new_gate = self.flight_origin.request_gate(self)
-                        if new_gate is None:
-                            return
-                        self.gate_assigned = new_gate
-                        self.current_pos = self.flight_origin.gates[new_gate]["pos"]
-                        self.departure_time = current_time + 180
-                        self.ground_route_nodes.clear()
-                        self.ground_route_positions.clear()
-                        self.current_ground_index = 0
-                        self.state = "at_gate"
-                    else:
-                        self.state = "done"
+                    self.finish_landing(current_time)
                 else:
                     self.current_pos = self.move_towards(self.current_pos, gate_pos, self.ground_speed, dt)
 
+    # -------------------------- 상태 전이 단위 동작 --------------------------
+    # update()와 배치 엔진(fleet_arrays.FleetArrays)이 함께 사용하는 단위 동작들.
+    # 연속 이동(move_towards/lerp)은 호출하는 쪽에서 처리하고, 여기서는 이산적인 전이만 다룬다.
+    def ground_vertiport(self):
+        """현재 지상 이동 중인 ground map의 vertiport"""
+        return self.flight_origin if self.state == "takeoff_ground" else self.flight_dest
+
+    def procedure_event(self, event, current_time):
+        """
+        지상 절차에 event 전달 (절차가 없으면 None).
+        시간이 걸리는 절차에 들어가면 끝나는 시각을 반환하고, 타이머가 깨울 때까지 waiting
+        """
+        if self.procedure is None:
+            return None
+        until = self.procedure.fire(self, event, current_time)
+        if until is not None and self.trajectory is not None:
+            self.trajectory.hold_until(until)
+        return until
+
+    def ready_for_takeoff(self, current_time):
+        """이륙 지상 경로 끝(FATO_Takeoff): 지상 절차의 시동이 남아 있으면 False (타이머가 깨울 때까지 대기)"""
+        return self.procedure_event(TAKEOFF_POINT, current_time) is None
+
+    def update_at_gate(self, current_time):
+        # 게이트 재할당 시도
+        if self.gate_assigned is None:
+            new_gate = self.current_vp.request_gate(self)
+            if new_gate is None:
+                self.wait_for_gate(self.current_vp)
+                return
+            self.gate_assigned = new_gate
+            self.current_pos = self.current_vp.gates[new_gate]["pos"]
+
+        if current_time >= self.departure_time:
+            gate_name = self.gate_assigned
+            self.current_vp.release_gate(self)
+            # 여기서는 flight_origin의 ground map을 사용하여, Gate → FATO_Takeoff 경로 계산
+            self.plan_taxi(self.flight_origin, gate_name, "FATO_Takeoff", current_time)
+            self.flight_origin.reserve_node(self, self.ground_route_nodes[0])
+            self.state = "takeoff_ground"
+            self.procedure_event(DEPART, current_time)
+
+    def reroute_ground(self, vp, route_nodes):
+        """지상 이동 중 현재 노드부터의 경로를 교체 (교착 해소 등). 기존 시공간 계획은 버린다"""
+        if vp.taxi_planner is not None:
+            vp.taxi_planner.table.release(self)
+        self.taxi_schedule = None
+        if self.trajectory is not None:
+            # 새 경로의 0번 노드 = 현재 노드 (다시 움직일 때 acquire_next_node에서 재계획)
+            knot = self.trajectory.ground_knots.get(self.current_ground_index)
+            self.trajectory.ground_knots = {0: knot} if knot is not None else {}
+            self.trajectory.stale = True
+        self.ground_route_nodes = list(route_nodes)
+        self.ground_route_positions = vp.node_positions(self.ground_route_nodes)
+        self.current_ground_index = 0
+
+    def ground_route_done(self):
+        return self.current_ground_index >= len(self.ground_route_positions) - 1
+
+    def acquire_next_node(self, vp, current_time=None):
+        """
+        다음 ground node가 비어 있거나 이미 자신이 점유 중이면 예약하고 True 반환.
+        다른 비행체가 점유 중이면 해당 노드 대기열에 등록하고 False 반환
+        """
+        next_node = self.ground_route_nodes[self.current_ground_index + 1]
+        occupant = vp.node_occupancy.get(next_node)
+        if occupant is None:
+            vp.reserve_node(self, next_node)
+        elif occupant is not self:
+            self.wait_for_node(vp, next_node)
+            return False
+        if self.trajectory is not None and self.trajectory.stale and current_time is not None:
+            self.resync_ground_trajectory(vp, current_time)
+        if self.procedure is not None and next_node == "FATO_Takeoff":
+            self.procedure_event(FATO_CLEAR, current_time)
+        return True
+
+    def advance_ground_node(self, vp, current_time=None):
+        """다음 노드 도착: 이전 노드 해제 후 인덱스 증가"""
+        prev_node = self.ground_route_nodes[self.current_ground_index]
+        vp.release_node(self, prev_node)
+        self.current_ground_index += 1
+        if self.procedure is not None:
+            self.procedure.node_event(self, vp, self.ground_route_nodes[self.current_ground_index],
+                                      current_time)
+
+    def step_ground(self, vp, dt, current_time=None):
+        if current_time is not None and self.taxi_hold(current_time) > 0:
+            return  # 계획된 출발 시각 전에는 현재 노드에서 대기
+        if self.acquire_next_node(vp, current_time):
+            target_pos = self.ground_route_positions[self.current_ground_index + 1]
+            self.current_pos = self.move_towards(self.current_pos, target_pos, self.ground_speed, dt)
+            if self.reached(self.current_pos, target_pos):
+                self.advance_ground_node(vp, current_time)
+
+    def begin_flight(self, current_time=None):
+        vp = self.flight_origin
+        vp.release_node(self, self.ground_route_nodes[self.current_ground_index])
+        # 공역 그래프가 연결되어 있으면 미리 계산된 항로(waypoint)를 따라 비행
+        waypoints = vp.air_route_to(self.flight_dest)
+        if waypoints is None:
+            # in_air 경로는 flight_origin의 FATO_Takeoff → flight_dest의 FATO_Landing 사용
+            start_pt = (vp.nodes["FATO_Takeoff"][0] + vp.offset[0],
+                        vp.nodes["FATO_Takeoff"][1] + vp.offset[1])
+            end_pt = (self.flight_dest.nodes["FATO_Landing"][0] + self.flight_dest.offset[0],
+                    self.flight_dest.nodes["FATO_Landing"][1] + self.flight_dest.offset[1])
+            waypoints = [(start_pt[0], start_pt[1], 0.0), (end_pt[0], end_pt[1], 0.0)]
+        self.set_air_route(waypoints)
+        self.state = "in_air"
+        if self.trajectory is not None and current_time is not None:
+            # 항로 waypoint 고도(designer 경로 노드 z)를 그대로 사용
+            traj = self.trajectory
+            traj.restart(current_time, *waypoints[0][:3])
+            for w in waypoints[1:]:
+                traj.move_to(w[0], w[1], w[2], self.air_speed)
+
+    def set_air_route(self, waypoints):
+        """waypoints: [(x, y, z), ...]. 구간별 누적 거리를 한 번만 계산해 두고 진행률로 위치를 구한다"""
+        route = [(w[0], w[1]) for w in waypoints]
+        cum = [0.0]
+        for a, b in zip(route, route[1:]):
+            cum.append(cum[-1] + self.distance(a, b))
+        self.in_air_route = route
+        self.in_air_altitudes = [w[2] for w in waypoints]
+        self.air_cum = cum
+        self.air_leg = 0
+        self.air_progress = 0.0
+
+    def advance_air_leg(self, flown):
+        """누적 비행 거리 flown이 속한 구간으로 air_leg를 앞으로 이동"""
+        cum = self.air_cum
+        leg = self.air_leg
+        while leg < len(cum) - 2 and cum[leg + 1] < flown:
+            leg += 1
+        self.air_leg = leg
+        return leg
+
+    def air_position(self, progress):
+        """진행률(0~1)에 해당하는 ((x, y), z)"""
+        cum = self.air_cum
+        flown = progress * cum[-1]
+        leg = self.advance_air_leg(flown)
+        seg = cum[leg + 1] - cum[leg]
+        t = (flown - cum[leg]) / seg if seg > 0 else 1.0
+        za, zb = self.in_air_altitudes[leg], self.in_air_altitudes[leg + 1]
+        return self.lerp(self.in_air_route[leg], self.in_air_route[leg + 1], t), za + (zb - za) * t
+
+    def arrive_at_dest(self, current_time):
+        """in_air 종료 시점: flight_dest의 Gate를 잡고 landing_ground 전환. Gate가 없으면 False"""
+        # flight_dest의 Gate 할당 (새로운 운항 전까지 고정)
+        gate_name = self.flight_dest.request_gate(self)
+        if gate_name is None:
+            self.wait_for_gate(self.flight_dest)  # Gate 대기
+            return False
+        self.gate_assigned = gate_name
+        self.current_vp = self.flight_dest
+        if self.trajectory is not None:
+            # 지상 절차 대기도 ground map 좌표로 기록되도록 FATO_Landing에서 다시 시작
+            self.trajectory.restart(current_time, *self.flight_dest.node_positions(["FATO_Landing"])[0], 0.0)
+        # 시동 종료/견인 장비 연결 절차가 있으면 끝나는 시각부터 지상 이동
+        taxi_time = self.procedure_event(LAND, current_time)
+        if taxi_time is None:
+            taxi_time = current_time
+        # flight_dest의 ground map에서 FATO_Landing → Gate 경로 계산
+        self.plan_taxi(self.flight_dest, "FATO_Landing", gate_name, taxi_time)
+        # 공역 좌표로 비행한 경우에도 지상 이동은 FATO_Landing(ground map 좌표)에서 시작
+        if self.ground_route_positions:
+            self.current_pos = self.ground_route_positions[0]
+        self.current_alt = 0.0
+        self.state = "landing_ground"
+        return True
+
+    def finish_landing(self, current_time):
+        # 착륙 완료: 다음 운항 준비
+        if self.flight_plan:
+            # 도착 시 잡은 Gate를 그대로 다음 운항의 출발 Gate로 사용
+            new_gate = self.flight_dest.request_gate(self)
+            if new_gate is None:
+                self.wait_for_gate(self.flight_dest)
+                return
+            # **중요**: 이번 운항이 끝났으므로, 새로운 운항을 위해 flight_origin과 flight_dest를 갱신하고,
+            # current_vp도 새 flight_origin의 ground 좌표계를 사용하도록 업데이트
+            self.flight_origin = self.flight_dest
+            self.flight_dest = self.flight_plan.pop(0)
+            self.current_vp = self.flight_origin  # 갱신!
+            if self.leg_callback is not None:
+                self.leg_callback(self)
+            self.gate_assigned = new_gate
+            self.current_pos = self.flight_origin.gates[new_gate]["pos"]
+            self.departure_time = current_time + self.turnaround_time
+            self.ground_route_nodes.clear()
+            self.ground_route_positions.clear()
+            self.current_ground_index = 0
+            self.taxi_schedule = None
+            self.state = "at_gate"
+            if self.trajectory is not None:
+                self.trajectory.restart(current_time, *self.current_pos, 0.0)
+                self.trajectory.hold_until(self.departure_time)
+            # 승객 하차 및 지상 조업 (출발 시각까지)
+            self.procedure_event(GATE_ARRIVE, current_time)
+        else:
+            self.state = "done"
+            if self.trajectory is not None:
+                self.trajectory.restart(current_time, *self.current_pos, 0.0)
+            self.procedure_event(FINISH, current_time)
+
+
+    # -------------------------- 자원 대기 --------------------------
+    def wait_for_gate(self, vp):
+        self.waiting = True
+        vp.wait_for_gate(self, self.resource_ready)
+
+    def wait_for_node(self, vp, node):
+        self.waiting = True
+        if self.trajectory is not None:
+            # 다시 움직일 때까지 현재 노드에 머무르도록 이후 일정을 버리고, 다시 움직일 때 재계획
+            knot = self.trajectory.ground_knots.get(self.current_ground_index)
+            if knot is not None:
+                self.trajectory.cut(knot)
+            self.trajectory.stale = True
+        vp.wait_for_node(self, node, self.resource_ready)
+
+    def resource_ready(self, vp):
+        """vertiport가 기다리던 gate/node를 넘겨줬을 때 호출됨"""
+        self.waiting = False
+        if self.wake_callback is not None:
+            self.wake_callback(self)
 
     # -------------------------- 보조 메서드들 --------------------------
     def move_towards(self, current, target, speed, dt):
@@ -1,4 +1,8 @@
-from vertiport_2f6g import ground_nodes, ground_links, gates
+import heapq
+from collections import deque
+from vertiport_2f6g import ground_nodes, ground_links, gates, landing_queue, takeoff_queue
+from ground_routes import route_table_for
+from taxi_planner import TaxiPlanner
 
 class Vertiport:
     def __init__(self, name, position, offset=(0,0)):
@@ -12,42 +16,156 @@ class Vertiport:
         self.offset = offset
         self.nodes = ground_nodes
         self.links = ground_links
+        # 지상 절차(ground_procedure)가 사용하는 착륙/이륙 Que 노드
+        self.landing_queue = landing_queue
+        self.takeoff_queue = takeoff_queue
         # Gate는 ground map상의 노드명으로 관리
         self.gates = {gate: {"occupied": None, "pos": (self.nodes[gate][0] + offset[0],
                                                          self.nodes[gate][1] + offset[1])}
                       for gate in gates}
         # 각 ground node의 점유 상태 (초기에는 모두 비어있음)
         self.node_occupancy = {node: None for node in self.nodes}
+        # Gate 자원 관리: 빈 Gate 풀(정의 순서 우선), 점유자 → Gate 역인덱스, FIFO 대기열
+        self.gate_order = {gate: i for i, gate in enumerate(self.gates)}
+        self.free_gates = [(i, gate) for gate, i in self.gate_order.items()]
+        heapq.heapify(self.free_gates)
+        self.gate_of = {}
+        self.gate_waiters = deque()   # (uam, callback)
+        self.node_waiters = {}        # node -> deque[(uam, callback)]
+        # 공역 그래프 연결 (airspace.AirspaceGraph.bind로 설정, 없으면 FATO 간 직선 비행)
+        self.airspace = None
+        self.air_name = None
+        # 같은 layout을 쓰는 vertiport끼리 공유하는 경로 테이블 + 이 vertiport의 오프셋 적용 좌표 캐시
+        self.route_table = route_table_for(self.nodes, self.links, gates)
+        self.route_positions = {}
+        # 시공간 예약 기반 지상 경로 계획 (enable_taxi_planner로 설정, 없으면 노드 단위 예약)
+        self.taxi_planner = None
+        # 노드 대기 교착 탐지 (deadlock.DeadlockDetector.attach로 설정)
+        self.deadlock_detector = None
+        # request_gate 호출 계측 (instrumentation.Instrumentation.attach로 설정)
+        self.instrumentation = None
+        # 노드 점유가 바뀌면 occupancy_callback(vp, node, 점유 uam 또는 None) 호출 (시각화 등)
+        self.occupancy_callback = None
+
+    def enable_taxi_planner(self, slot=1.0, margin=2, horizon=1800):
+        """이 vertiport의 지상 이동을 TaxiPlanner(노드 × 시간 슬롯 예약표)로 계획"""
+        self.taxi_planner = TaxiPlanner(self.nodes, self.links, self.gates,
+                                        slot=slot, margin=margin, horizon=horizon)
+        return self.taxi_planner
+
+    def ground_route(self, start_node, goal_node, blocked=None):
+        """
+        start_node → goal_node 경로 (노드 리스트, 오프셋 적용 좌표 리스트) 반환.
+        경로는 layout 공유 테이블에서, 좌표 오프셋은 (start, goal)마다 한 번만 계산한다.
+        """
+        route_nodes = self.route_table.route(start_node, goal_node, blocked)
+        key = (start_node, goal_node)
+        cached = self.route_positions.get(key)
+        if cached is not None and cached[0] is route_nodes:
+            positions = cached[1]
+        else:
+            positions = self.node_positions(route_nodes)
+            # blocked로 동적 탐색한 경로는 캐시하지 않음
+            if route_nodes is self.route_table.routes.get(key):
+                self.route_positions[key] = (route_nodes, positions)
+        return list(route_nodes), list(positions)
+
+    def node_positions(self, route_nodes):
+        """노드 리스트 → 오프셋 적용 좌표 리스트"""
+        return [(self.nodes[n][0] + self.offset[0], self.nodes[n][1] + self.offset[1])
+                for n in route_nodes]
+
+    def air_route_to(self, dest):
+        """dest vertiport까지의 공중 waypoint 리스트 [(x, y, z), ...]. 공역 그래프가 없으면 None"""
+        if self.airspace is None or dest.airspace is not self.airspace:
+            return None
+        return self.airspace.path(self.air_name, dest.air_name)
 
     def reserve_node(self, uam, node):
         """노드가 비어있으면 uam을 예약하고 True 반환, 아니면 False"""
         if self.node_occupancy.get(node) is None:
             self.node_occupancy[node] = uam
+            if self.occupancy_callback is not None:
+                self.occupancy_callback(self, node, uam)
             return True
         return False
 
     def release_node(self, uam, node):
-        """해당 노드에 uam이 점유 중이면 해제"""
-        if self.node_occupancy.get(node) == uam:
-            self.node_occupancy[node] = None
-            return True
+        """해당 노드에 uam이 점유 중이면 해제. 대기 중인 uam이 있으면 바로 넘겨준다"""
+        if self.node_occupancy.get(node) is not uam:
+            return False
+        self.node_occupancy[node] = None
+        waiters = self.node_waiters.get(node)
+        if waiters:
+            waiter, callback = waiters.popleft()
+            if not waiters:
+                del self.node_waiters[node]
+            self.node_occupancy[node] = waiter
+            if self.occupancy_callback is not None:
+                self.occupancy_callback(self, node, waiter)
+            if self.deadlock_detector is not None:
+                self.deadlock_detector.on_acquire(waiter)
+            callback(self)
+        elif self.occupancy_callback is not None:
+            self.occupancy_callback(self, node, None)
+        return True
+
+    def wait_for_node(self, uam, node, callback):
+        """node가 해제되면 uam에게 예약한 뒤 callback(vertiport) 호출 (FIFO)"""
+        self.node_waiters.setdefault(node, deque()).append((uam, callback))
+        if self.deadlock_detector is not None:
+            self.deadlock_detector.on_wait(self, uam, node)
+
+    def cancel_node_wait(self, uam, node):
+        """node 대기열에서 uam 제거 (교착 해소로 경로를 바꾼 경우)"""
+        waiters = self.node_waiters.get(node)
+        if not waiters:
+            return False
+        for entry in waiters:
+            if entry[0] is uam:
+                waiters.remove(entry)
+                if not waiters:
+                    del self.node_waiters[node]
+                return True
         return False
 
     def request_gate(self, uam):
-        """Gate 중 비어있는 것을 찾아 할당; 할당되면 Gate 이름 반환, 아니면 None"""
-        for gate_name, info in self.gates.items():
-            if info["occupied"] is None:
-                self.gates[gate_name]["occupied"] = uam
-                # Gate 노드 점유도 함께 예약
-                self.node_occupancy[gate_name] = uam
-                return gate_name
-        return None
+        """
+        빈 Gate를 할당해 Gate 이름 반환, 없으면 None.
+        이미 이 vertiport의 Gate를 점유 중인 uam에게는 그 Gate를 그대로 반환한다.
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.on_gate_poll(uam in self.gate_of or bool(self.free_gates))
+        gate_name = self.gate_of.get(uam)
+        if gate_name is not None:
+            return gate_name
+        if not self.free_gates:
+            return None
+        _, gate_name = heapq.heappop(self.free_gates)
+        self._assign_gate(uam, gate_name)
+        return gate_name
 
     def release_gate(self, uam):
-        """uAM이 할당받은 Gate를 해제"""
-        for gate, info in self.gates.items():
-            if info["occupied"] == uam:
-                info["occupied"] = None
-                self.node_occupancy[gate] = None
-                return gate
-        return None
+        """uAM이 할당받은 Gate를 해제. 대기 중인 uam이 있으면 그 Gate를 바로 넘겨준다"""
+        gate = self.gate_of.pop(uam, None)
+        if gate is None:
+            return None
+        self.gates[gate]["occupied"] = None
+        self.release_node(uam, gate)
+        if self.gate_waiters:
+            waiter, callback = self.gate_waiters.popleft()
+            self._assign_gate(waiter, gate)
+            callback(self)
+        else:
+            heapq.heappush(self.free_gates, (self.gate_order[gate], gate))
+        return gate
+
+    def wait_for_gate(self, uam, callback):
+        """Gate가 해제되면 uam에게 할당한 뒤 callback(vertiport) 호출 (FIFO)"""
+        self.gate_waiters.append((uam, callback))
+
+    def _assign_gate(self, uam, gate):
+        self.gates[gate]["occupied"] = uam
+        self.gate_of[uam] = gate
+        # Gate 노드 점유도 함께 예약
+        self.reserve_node(uam, gate)
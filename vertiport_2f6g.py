@@ -79,6 +79,10 @@ ground_links = {
 
 gates = ["GATE1", "GATE2", "GATE3", "GATE4", "GATE5", "GATE6"]
 
+# 착륙/이륙 Que 노드 (진행 순서, 마지막이 최종 Que - 지상절차.py의 "4", "31")
+landing_queue = ["1", "2", "3", "4"]
+takeoff_queue = ["34", "33", "32", "31"]
+
 ###############################################################################
 # 시각화 함수
 ###############################################################################
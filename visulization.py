@@ -1,9 +1,13 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
+import math
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from vertiport import Vertiport
 from uam_plane import UAMPlane
 from simulation_engine import SimulationEngine
+from fleet_arrays import STATE_CODES, AT_GATE, TAKEOFF_GROUND, IN_AIR, LANDING_GROUND
 import itertools
 
 COLORS = ['blue','red','green','orange','purple','brown',
@@ -38,161 +42,175 @@ def create_simulation():
     return planes, vertiports
 
 def draw_ground(ax, vp):
+    """정적 ground layout: 링크는 LineCollection 1개, 노드/게이트는 scatter 1개씩"""
+    segments = []
     for node, neighbors in vp.links.items():
         x0 = vp.nodes[node][0] + vp.offset[0]
         y0 = vp.nodes[node][1] + vp.offset[1]
         for nb in neighbors:
             x1 = vp.nodes[nb][0] + vp.offset[0]
             y1 = vp.nodes[nb][1] + vp.offset[1]
-            ax.plot([x0,x1],[y0,y1],c="gray",lw=0.5)
-    for node, coord in vp.nodes.items():
-        x, y = coord[0]+vp.offset[0], coord[1]+vp.offset[1]
-        ax.plot(x, y, 'ko', ms=3)
+            segments.append(((x0, y0), (x1, y1)))
+    ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.5))
+    coords = np.array([(c[0] + vp.offset[0], c[1] + vp.offset[1]) for c in vp.nodes.values()])
+    ax.scatter(coords[:, 0], coords[:, 1], c="k", s=9)
     # gate들
+    gate_pos = np.array([info["pos"] for info in vp.gates.values()])
+    ax.scatter(gate_pos[:, 0], gate_pos[:, 1], c="r", marker="s", s=36)
     for gate, info in vp.gates.items():
         gx, gy = info["pos"]
-        ax.plot(gx, gy, 'rs', ms=6)
         ax.text(gx+0.5, gy+0.5, gate, fontsize=6, color="red")
 
-def main():
-    planes, vertiports = create_simulation()
-    engine = SimulationEngine(planes, time_step=0.1, acceleration=3)
-
-    fig, axs = plt.subplots(2,3, figsize=(12,8))
-    ax_A = axs[0,0]
-    ax_B = axs[0,1]
-    ax_C = axs[1,0]
-    ax_D = axs[1,1]
-    ax_air = axs[0,2]
-    axs[1,2].axis('off')
-
-    ground_axes = {}
-    for ax, vp in zip([ax_A, ax_B, ax_C, ax_D], vertiports):
-        ax.set_title(vp.name+"(Ground)")
-        draw_ground(ax, vp)
-        ax.set_xlim(-5+vp.offset[0], 25+vp.offset[0])
-        ax.set_ylim(-5+vp.offset[1], 25+vp.offset[1])
-        ground_axes[vp.name] = ax
-
-    ax_air.set_title("Airspace")
-    ax_air.set_xlim(0,30)
-    ax_air.set_ylim(0,35)
-
-    # airspace 내 버티포트 위치(초록 사각)
-    for vp in vertiports:
-        ax_air.plot(vp.position[0], vp.position[1], marker='s', ms=10, color='green', zorder=2)
-        ax_air.text(vp.position[0]+0.5, vp.position[1]+0.5, vp.name, fontsize=9, color='green', zorder=2)
-
-    # ground scatter
-    scat_ground = {}
-    for vp in vertiports:
-        scat_ground[vp.name] = ground_axes[vp.name].scatter([],[], s=50, c='blue', zorder=3)
-
-    occ_scats = {}
-    for vp in vertiports:
-        occ_scats[vp.name] = ground_axes[vp.name].scatter([],[], s=100, marker='x', zorder=5)
-
-    scat_air_depart = ax_air.scatter([],[], s=50, c='blue', marker='o', zorder=4)
-    scat_air_arrive = ax_air.scatter([],[], s=50, c='cyan', marker='o', zorder=1)
-
-    ground_lines = {}
-
-    def update(frame):
-        engine.update()
-
-        ground_positions = {vp.name:[] for vp in vertiports}
-        air_depart_positions = []
-        air_arrive_positions = []
-        new_ground_routes = {}
-
-        for p in planes:
-            # 이륙 전/중인 경우
-            if p.state in ["at_gate","takeoff_ground"]:
-                # subplot은 이번 운항 출발지 flight_origin
-                home_name = p.flight_origin.name
-                ground_positions[home_name].append(p.current_pos)
-                # 공역에서도 flight_origin.position 찍어준다
-                air_depart_positions.append(p.flight_origin.position)
-
-                if p.state=="takeoff_ground" and p.ground_route_positions:
-                    route = [p.current_pos]+p.ground_route_positions[p.current_ground_index+1:]
-                    new_ground_routes[p.name] = route
-
-            elif p.state=="in_air":
-                # 공역 보간
-                t = p.air_progress
-                ox, oy = p.flight_origin.position
-                dx, dy = p.flight_dest.position
-                px = ox+(dx-ox)*t
-                py = oy+(dy-oy)*t
-                air_depart_positions.append((px,py))
-
-            elif p.state=="landing_ground":
-                # subplot은 이번 운항 목적지 flight_dest
-                home_name = p.flight_dest.name
-                ground_positions[home_name].append(p.current_pos)
-                # 공역에서는 flight_dest.position 찍어준다
-                air_arrive_positions.append(p.flight_dest.position)
-
-                if p.ground_route_positions:
-                    route = [p.current_pos]+p.ground_route_positions[p.current_ground_index+1:]
-                    new_ground_routes[p.name] = route
-
-        # ground scatter
+
+class FleetRenderer:
+    """
+    미리 만든 artist를 매 프레임 재사용하는 렌더러 (blit 사용).
+    - vertiport 패널마다: 비행체 scatter, 점유 노드 scatter, 지상 경로 LineCollection 1개
+    - 공역 패널: 출발/도착 scatter
+    - 위치는 SimulationEngine(mode="vectorized")의 FleetArrays 배열에서 바로 읽는다
+    - 비행체별 출발/도착 vertiport 번호와 vertiport별 노드 점유(점유 비행체 번호, 없으면 -1)는 배열로 두고
+      UAMPlane.leg_callback / Vertiport.occupancy_callback으로 바뀔 때만 갱신 (프레임마다 전체를 훑지 않음)
+    """
+
+    def __init__(self, engine, vertiports):
+        self.engine = engine
+        self.planes = engine.planes
+        self.vertiports = vertiports
+        self.vp_index = {vp: k for k, vp in enumerate(vertiports)}
+        self.vp_pos = np.array([vp.position for vp in vertiports], dtype=float)
+        self.colors = np.array([to_rgba(getattr(p, "color", "blue")) for p in self.planes])
+        # vertiport별 node 좌표 (점유 표시용)
+        self.node_names = [list(vp.nodes) for vp in vertiports]
+        self.node_xy = [np.array([(vp.nodes[n][0] + vp.offset[0], vp.nodes[n][1] + vp.offset[1])
+                                  for n in names])
+                        for vp, names in zip(vertiports, self.node_names)]
+        self.plane_index = {p: i for i, p in enumerate(self.planes)}
+        self.node_index = [{n: j for j, n in enumerate(names)} for names in self.node_names]
+        self.origin = np.zeros(len(self.planes), dtype=np.intp)
+        self.dest = np.zeros(len(self.planes), dtype=np.intp)
+        for p in self.planes:
+            self.on_leg(p)
+            p.leg_callback = self.on_leg
+        self.occupant = []
+        for vp, names in zip(vertiports, self.node_names):
+            occ = np.full(len(names), -1, dtype=np.intp)
+            for j, n in enumerate(names):
+                uam = vp.node_occupancy[n]
+                if uam is not None:
+                    occ[j] = self.plane_index[uam]
+            self.occupant.append(occ)
+            vp.occupancy_callback = self.on_occupancy
+
+        n_panels = len(vertiports) + 1
+        ncols = math.ceil(math.sqrt(n_panels))
+        nrows = math.ceil(n_panels / ncols)
+        self.fig, axs = plt.subplots(nrows, ncols, figsize=(4*ncols, 4*nrows), squeeze=False)
+        axs = axs.ravel()
+        for ax in axs[n_panels:]:
+            ax.axis('off')
+
+        self.ground_axes = []
+        self.scat_ground = []
+        self.occ_scats = []
+        self.route_lines = []
+        for ax, vp in zip(axs, vertiports):
+            ax.set_title(vp.name+"(Ground)")
+            draw_ground(ax, vp)
+            ax.set_xlim(-5+vp.offset[0], 25+vp.offset[0])
+            ax.set_ylim(-5+vp.offset[1], 25+vp.offset[1])
+            self.ground_axes.append(ax)
+            self.route_lines.append(ax.add_collection(LineCollection([], linewidths=2, zorder=4)))
+            self.scat_ground.append(ax.scatter([], [], s=50, c='blue', zorder=3))
+            self.occ_scats.append(ax.scatter([], [], s=100, marker='x', zorder=5))
+
+        ax_air = axs[len(vertiports)]
+        ax_air.set_title("Airspace")
+        margin = 5
+        ax_air.set_xlim(self.vp_pos[:, 0].min() - margin, self.vp_pos[:, 0].max() + margin)
+        ax_air.set_ylim(self.vp_pos[:, 1].min() - margin, self.vp_pos[:, 1].max() + margin)
+        # airspace 내 버티포트 위치(초록 사각)
+        ax_air.scatter(self.vp_pos[:, 0], self.vp_pos[:, 1], marker='s', s=100, color='green', zorder=2)
         for vp in vertiports:
-            arr = ground_positions[vp.name]
-            scat_ground[vp.name].set_offsets(np.array(arr) if arr else np.empty((0,2)))
+            ax_air.text(vp.position[0]+0.5, vp.position[1]+0.5, vp.name, fontsize=9, color='green', zorder=2)
+        self.scat_air_depart = ax_air.scatter([], [], s=50, c='blue', marker='o', zorder=4)
+        self.scat_air_arrive = ax_air.scatter([], [], s=50, c='cyan', marker='o', zorder=1)
+        self.ax_air = ax_air
+
+        self.artists = (self.scat_ground + self.occ_scats + self.route_lines
+                        + [self.scat_air_depart, self.scat_air_arrive])
+
+    def on_leg(self, plane):
+        i = self.plane_index[plane]
+        self.origin[i] = self.vp_index[plane.flight_origin]
+        self.dest[i] = self.vp_index[plane.flight_dest]
+
+    def on_occupancy(self, vp, node, uam):
+        k = self.vp_index[vp]
+        self.occupant[k][self.node_index[k][node]] = -1 if uam is None else self.plane_index[uam]
+
+    def _arrays(self):
+        """(위치, 상태코드, air_progress) 배열. vectorized 모드가 아니면 객체에서 모은다"""
+        fleet = self.engine.fleet
+        if fleet is not None:
+            return fleet.pos, fleet.state, fleet.air_progress
+        pos = np.array([p.current_pos for p in self.planes], dtype=float).reshape(-1, 2)
+        state = np.array([STATE_CODES[p.state] for p in self.planes], dtype=np.int8)
+        progress = np.array([p.air_progress for p in self.planes])
+        return pos, state, progress
+
+    def update(self, frame):
+        self.engine.update()
+        pos, state, progress = self._arrays()
+        planes = self.planes
+        origin, dest = self.origin, self.dest
+
+        departing = (state == AT_GATE) | (state == TAKEOFF_GROUND)
+        landing = state == LANDING_GROUND
+        flying = state == IN_AIR
+        # 지상 패널: 출발 준비/이륙 지상이동은 flight_origin, 착륙 지상이동은 flight_dest
+        panel = np.where(landing, dest, origin)
+        on_ground = departing | landing
+
+        for k in range(len(self.vertiports)):
+            mask = on_ground & (panel == k)
+            self.scat_ground[k].set_offsets(pos[mask])
 
             # 점유 노드
-            occX, occY, occColors = [],[],[]
-            for node, occupant in vp.node_occupancy.items():
-                if occupant is not None:
-                    bx = vp.nodes[node][0]+vp.offset[0]
-                    by = vp.nodes[node][1]+vp.offset[1]
-                    occX.append(bx)
-                    occY.append(by)
-                    occColors.append(occupant.color)
-            occ_scats[vp.name].set_offsets(np.column_stack((occX, occY)) if occX else np.empty((0,2)))
-            if occColors:
-                occ_scats[vp.name].set_color(occColors)
-
-        # air scatter
-        if air_depart_positions:
-            scat_air_depart.set_offsets(np.array(air_depart_positions))
-        else:
-            scat_air_depart.set_offsets(np.empty((0,2)))
-
-        if air_arrive_positions:
-            scat_air_arrive.set_offsets(np.array(air_arrive_positions))
-        else:
-            scat_air_arrive.set_offsets(np.empty((0,2)))
-
-        # ground route line
-        for line in ground_lines.values():
-            line.remove()
-        ground_lines.clear()
-
-        for p in planes:
-            if p.name in new_ground_routes:
-                route = new_ground_routes[p.name]
-                # 현재 상태에 따라 subplot 결정
-                if p.state in ["at_gate","takeoff_ground"]:
-                    ax = ground_axes[p.flight_origin.name]
-                elif p.state=="landing_ground":
-                    ax = ground_axes[p.flight_dest.name]
-                else:
-                    continue
-
-                xs = [pt[0] for pt in route]
-                ys = [pt[1] for pt in route]
-                lineObj, = ax.plot(xs, ys, color=p.color, lw=2, zorder=4)
-                ground_lines[p.name] = lineObj
-
-        return list(scat_air_depart.get_offsets()) + list(scat_air_arrive.get_offsets())
-
-    ani = animation.FuncAnimation(fig, update, frames=600, interval=50, blit=False)
+            occ = self.occupant[k]
+            occ_idx = np.flatnonzero(occ >= 0)
+            self.occ_scats[k].set_offsets(self.node_xy[k][occ_idx])
+            if len(occ_idx):
+                self.occ_scats[k].set_color(self.colors[occ[occ_idx]])
+
+            # 지상 경로 (현재 위치 → 남은 노드)
+            segments, owners = [], []
+            for i in np.flatnonzero(mask & (state != AT_GATE)):
+                p = planes[i]
+                remaining = p.ground_route_positions[p.current_ground_index+1:]
+                if remaining:
+                    segments.append([tuple(pos[i])] + remaining)
+                    owners.append(i)
+            self.route_lines[k].set_segments(segments)
+            self.route_lines[k].set_color(self.colors[owners])
+
+        # 공역: 출발지 위치, 비행 중 보간 위치, 도착지 위치
+        o_pos, d_pos = self.vp_pos[origin], self.vp_pos[dest]
+        air_pos = o_pos + (d_pos - o_pos) * progress[:, None]
+        self.scat_air_depart.set_offsets(np.vstack((o_pos[departing], air_pos[flying])))
+        self.scat_air_arrive.set_offsets(d_pos[landing])
+        return self.artists
+
+
+def main(num_frames=600, interval=50):
+    planes, vertiports = create_simulation()
+    engine = SimulationEngine(planes, time_step=0.1, acceleration=3, mode="vectorized")
+    renderer = FleetRenderer(engine, vertiports)
+
+    ani = animation.FuncAnimation(renderer.fig, renderer.update, frames=num_frames,
+                                  interval=interval, blit=True)
     plt.tight_layout()
     plt.show()
+    return ani
 
 if __name__=="__main__":
     main()